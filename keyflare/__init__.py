@@ -1,5 +1,34 @@
 """A class useful for using KeyFlare as an import."""
-from .gui import GUI
-from .image_pipeline import ImagePipeline
-from .system import System
-from .usages import Usages
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .gui import GUI
+    from .image_pipeline import ImagePipeline
+    from .results import HintBoxes
+    from .system import System
+    from .usages import Usages
+
+__all__ = ["GUI", "HintBoxes", "ImagePipeline", "System", "Usages"]
+
+# The module defining each class, imported when the class is first used,
+# so importing keyflare does not load OpenCV, Tk or PyAutoGUI.
+MODULES = {
+    "GUI": "gui",
+    "HintBoxes": "results",
+    "ImagePipeline": "image_pipeline",
+    "System": "system",
+    "Usages": "usages",
+}
+
+
+def __getattr__(name):
+    if name not in MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{MODULES[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
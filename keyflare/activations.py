@@ -0,0 +1,92 @@
+"""Stores the Activations class handing hotkey presses to the thread running them."""
+import threading
+
+
+class Activations:
+    """
+    The `Activations` class hands the activations requested by the keyboard
+    listener's thread to the thread that runs them, which waits without polling.
+    Repeated presses are coalesced, so holding or mashing a hotkey runs one
+    activation instead of a backlog of them.
+
+    Attributes:
+        pending (object): The latest request not yet taken, or None.
+        busy (bool): Whether a taken request is still running.
+        closed (bool): Whether `close` was called, ending `get`.
+        requested (int): The number of requests put.
+        coalesced (int): The number of requests merged into another one.
+
+    Methods:
+        - put(request): Requests an activation, from any thread.
+        - get(timeout): Waits for a request and marks it as running.
+        - done(): Marks the running request as finished.
+        - close(): Wakes the waiting thread up with no request, for shutting down.
+
+    Notes:
+        - A request put while another is pending replaces it, and a request put
+          while one is running is dropped, since the screen it was meant for is
+          covered by the running activation's overlay.
+
+    Example:
+        >>> activations = Activations()
+        >>> listener = keyboard.Listener(on_press=lambda key: activations.put("left"))
+        >>> while (button := activations.get()) is not None:
+        ...     gui.run(clicks=1, button=button)
+        ...     activations.done()
+    """
+
+    def __init__(self):
+        """Starts without requests."""
+        self.condition = threading.Condition()
+        self.pending = None
+        self.busy = False
+        self.closed = False
+        self.requested = 0
+        self.coalesced = 0
+
+    def put(self, request):
+        """
+        Requests an activation, coalescing it with one pending or running.
+
+        Args:
+            request (object): What to activate, such as the mouse button, not None.
+        """
+        with self.condition:
+            self.requested += 1
+            if self.busy or self.pending is not None:
+                self.coalesced += 1
+            if self.busy or self.closed:
+                return
+            self.pending = request
+            self.condition.notify()
+
+    def get(self, timeout=None):
+        """
+        Waits for a request and marks it as running until `done` is called.
+
+        Args:
+            timeout (float, optional): The most seconds to wait, where None waits
+                until a request or `close` (default is None).
+
+        Returns:
+            object: The request, or None when closed or timed out.
+        """
+        with self.condition:
+            self.condition.wait_for(
+                lambda: self.pending is not None or self.closed, timeout
+            )
+            request, self.pending = self.pending, None
+            self.busy = request is not None
+            return request
+
+    def done(self):
+        """Marks the running request as finished, accepting requests again."""
+        with self.condition:
+            self.busy = False
+
+    def close(self):
+        """Wakes the waiting thread up with no request, and drops later requests."""
+        with self.condition:
+            self.closed = True
+            self.pending = None
+            self.condition.notify_all()
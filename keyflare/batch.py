@@ -0,0 +1,268 @@
+"""Stores the functions running the pipeline over archived screenshots and recordings."""
+import os
+import sys
+import json
+import struct
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import cv2
+from PIL import Image
+from .image_pipeline import ImagePipeline
+from .results import HintBoxes
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tif", ".tiff", ".webp")
+MAGIC = b"KFB1"
+RECORD = struct.Struct("<HII")
+WORKER = {}
+
+
+def reading_frames(source, step=1):
+    """
+    Yields the screenshots of a directory, in name order, or the frames of a video.
+
+    Args:
+        source (str): A directory of images, or a video file OpenCV can read.
+        step (int, optional): Keeps one video frame out of step (default is 1).
+
+    Yields:
+        tuple: The (name, item) of each screenshot, item being the path of an
+            image, loaded by the worker, or a decoded RGB video frame.
+
+    Raises:
+        ValueError: If the source is not a directory and cannot be opened as a video.
+    """
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                yield name, os.path.join(source, name)
+        return
+    video = cv2.VideoCapture(source)
+    if not video.isOpened():
+        raise ValueError(f"Cannot read screenshots from {source}")
+    try:
+        index = 0
+        while True:
+            found, frame = video.read()
+            if not found:
+                break
+            if index % step == 0:
+                yield f"{os.path.basename(source)}#{index}", cv2.cvtColor(
+                    frame, cv2.COLOR_BGR2RGB
+                )
+            index += 1
+    finally:
+        video.release()
+
+
+def starting_worker(options):
+    """
+    Creates the pipeline that a worker reuses for every screenshot, so its arrays
+    are allocated once per resolution.
+
+    Args:
+        options (dict): Keyword arguments of `ImagePipeline`, with "slow" being
+            passed to `processing_image` instead.
+    """
+    options = dict(options)
+    WORKER["slow"] = options.pop("slow", False)
+    WORKER["pipeline"] = ImagePipeline(**options)
+
+
+def detecting(name, item):
+    """
+    Finds and labels the clickable places of one screenshot in a worker.
+
+    Args:
+        name (str): The screenshot's name.
+        item (str or np.ndarray): The image's path or the RGB image.
+
+    Returns:
+        tuple: The name, and the HintBoxes of `coordinate_data`.
+    """
+    pipeline = WORKER["pipeline"]
+    if isinstance(item, str):
+        item = np.array(Image.open(item).convert("RGB"))
+    pipeline.coordinate_data = []
+    pipeline.original_image = item
+    pipeline.processing_image(slow=WORKER["slow"])
+    pipeline.processing_data()
+    return name, pipeline.coordinate_data
+
+
+def batch(source, options=None, workers=None, backlog=None, step=1):
+    """
+    Runs the pipeline over every screenshot of a directory or video across a
+    process pool, yielding the results in the source's order.
+
+    Args:
+        source (str or iterable): A directory or video, or (name, item) pairs
+            like those of `reading_frames`.
+        options (dict, optional): Keyword arguments of `ImagePipeline`, with "slow"
+            being passed to `processing_image` (default is None).
+        workers (int, optional): The number of processes, where 0 runs in this
+            process and None lets Python choose (default is None).
+        backlog (int, optional): The most screenshots read ahead of the results
+            consumed, where None allows two per process (default is None).
+        step (int, optional): Keeps one video frame out of step (default is 1).
+
+    Yields:
+        tuple: The name, and the HintBoxes of each screenshot.
+
+    Notes:
+        - Screenshots are only read when fewer than backlog are in flight, so
+          memory stays bounded however large the source or slow the consumer.
+        - Images of a directory are read by the workers, so only their paths
+          are sent between processes.
+
+    Example:
+        >>> for name, coordinate_data in batch("screenshots", {"slow": True}):
+        ...     print(name, len(coordinate_data))
+    """
+    options = options or {}
+    frames = reading_frames(source, step) if isinstance(source, str) else source
+    if workers == 0:
+        starting_worker(options)
+        for name, item in frames:
+            yield detecting(name, item)
+        return
+    if backlog is None:
+        backlog = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(
+        workers, initializer=starting_worker, initargs=(options,)
+    ) as pool:
+        pending = deque()
+        for name, item in frames:
+            if len(pending) >= backlog:
+                yield pending.popleft().result()
+            pending.append(pool.submit(detecting, name, item))
+        while pending:
+            yield pending.popleft().result()
+
+
+def writing_jsonl(results, file):
+    """
+    Writes each screenshot's results as a line of JSON.
+
+    Args:
+        results (iterable): The (name, HintBoxes) pairs of `batch`.
+        file: A text file, each line getting "name", "labels" and "boxes".
+
+    Returns:
+        int: The number of screenshots written.
+    """
+    count = 0
+    for name, coordinate_data in results:
+        hints = HintBoxes.from_pairs(coordinate_data)
+        line = {"name": name, "labels": hints.texts(), "boxes": hints.boxes.tolist()}
+        file.write(json.dumps(line) + "\n")
+        count += 1
+    return count
+
+
+def writing_binary(results, file):
+    """
+    Writes each screenshot's results compactly, as little-endian binary records.
+
+    Args:
+        results (iterable): The (name, HintBoxes) pairs of `batch`.
+        file: A binary file, starting with `MAGIC`, then a record per screenshot.
+
+    Returns:
+        int: The number of screenshots written.
+
+    Notes:
+        - A record is the name's length (uint16), the number of boxes (uint32)
+          and the labels' length (uint32), followed by the UTF-8 name, the
+          (boxes, 4) int32 [x, y, w, h] array and the labels joined by spaces.
+    """
+    file.write(MAGIC)
+    count = 0
+    for name, coordinate_data in results:
+        hints = HintBoxes.from_pairs(coordinate_data)
+        encoded = name.encode("utf8")
+        labels = b" ".join(hints.labels.tolist())
+        boxes = hints.boxes.astype("<i4")
+        file.write(RECORD.pack(len(encoded), len(boxes), len(labels)))
+        file.write(encoded)
+        file.write(boxes.tobytes())
+        file.write(labels)
+        count += 1
+    return count
+
+
+def reading_binary(file):
+    """
+    Reads the records written by `writing_binary`.
+
+    Args:
+        file: A binary file.
+
+    Yields:
+        tuple: The name, and the HintBoxes of each screenshot.
+
+    Raises:
+        ValueError: If the file does not start with `MAGIC`.
+    """
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a file of KeyFlare's batch results")
+    while True:
+        header = file.read(RECORD.size)
+        if not header:
+            return
+        name_length, count, labels_length = RECORD.unpack(header)
+        name = file.read(name_length).decode("utf8")
+        boxes = np.frombuffer(file.read(count * 16), "<i4").reshape(-1, 4)
+        labels = file.read(labels_length).split(b" ") if count else []
+        yield name, HintBoxes(boxes, labels)
+
+
+def main(args=None):
+    """
+    Runs the pipeline over a directory or video from the command line.
+
+    Args:
+        args (list, optional): The command-line arguments after "batch", where None
+            reads them from `sys.argv` (default is None).
+
+    Examples:
+        ```sh
+        keyflare batch screenshots --output boxes.jsonl --workers 4
+        keyflare batch recording.mp4 --step 30 --format binary --output boxes.kfb
+        ```
+    """
+    parser = argparse.ArgumentParser(
+        prog="keyflare batch", description=main.__doc__.splitlines()[1].strip()
+    )
+    parser.add_argument("source", help="A directory of screenshots or a video file.")
+    parser.add_argument("--output", help="The file to write, or standard output.")
+    parser.add_argument("--format", choices=["jsonl", "binary"], default="jsonl")
+    parser.add_argument("--workers", type=int, help="The number of processes.")
+    parser.add_argument("--backlog", type=int, help="The most screenshots in flight.")
+    parser.add_argument("--step", type=int, default=1, help="Keep 1 frame in step.")
+    parser.add_argument("--slow", action="store_true", help="Process more images.")
+    parser.add_argument("--scale", default="1.0", help='A factor or "auto".')
+    parser.add_argument("--extraction", choices=["contours", "components"])
+    args = parser.parse_args(sys.argv[2:] if args is None else args)
+    options = {"slow": args.slow, "scale": args.scale}
+    if args.scale != "auto":
+        options["scale"] = float(args.scale)
+    if args.extraction:
+        options["extraction"] = args.extraction
+    results = batch(args.source, options, args.workers, args.backlog, args.step)
+    binary = args.format == "binary"
+    if args.output:
+        with open(
+            args.output, "wb" if binary else "w", encoding=None if binary else "utf8"
+        ) as file:
+            count = (writing_binary if binary else writing_jsonl)(results, file)
+    elif binary:
+        count = writing_binary(results, sys.stdout.buffer)
+    else:
+        count = writing_jsonl(results, sys.stdout)
+    print(f"[KeyFlare] Processed {count} screenshots.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,88 @@
+"""Stores the ResultCache class keeping the boxes of the latest distinct screens."""
+from collections import OrderedDict
+
+
+class ResultCache:
+    """
+    The `ResultCache` class keeps the labelled boxes found on the latest distinct
+    screens by their fingerprint, forgetting the least recently used screen first,
+    so switching between a few windows does not detect them again.
+
+    Attributes:
+        capacity (int): The number of screens kept.
+        entries (OrderedDict): The boxes by key, the least recently used first.
+        hits (int): The number of lookups that found boxes.
+        misses (int): The number of lookups that did not.
+
+    Methods:
+        - get(key): Returns the boxes of a key, or None.
+        - put(key, boxes): Keeps the boxes of a key, forgetting the oldest if full.
+        - clear(): Forgets every screen and resets the counters.
+
+    Example:
+        >>> cache = ResultCache(capacity=2)
+        >>> cache.put("editor", editor_boxes)
+        >>> cache.get("editor") is editor_boxes
+        True
+        >>> cache.get("browser") is None
+        True
+        >>> cache.hits, cache.misses
+        (1, 1)
+    """
+
+    def __init__(self, capacity=8):
+        """
+        Starts empty.
+
+        Args:
+            capacity (int, optional): The number of screens kept (default is 8).
+
+        Raises:
+            ValueError: If the capacity is not positive.
+        """
+        if capacity < 1:
+            raise ValueError(f"The cache's capacity must be positive, not {capacity}")
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """
+        Returns the boxes of a key, marking them as the most recently used.
+
+        Args:
+            key: The screen's key, such as its fingerprint and the pipeline's settings.
+
+        Returns:
+            HintBoxes: The boxes, or None if the screen is not kept.
+        """
+        boxes = self.entries.get(key)
+        if boxes is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return boxes
+
+    def put(self, key, boxes):
+        """
+        Keeps the boxes of a key, forgetting the least recently used screen if full.
+
+        Args:
+            key: The screen's key.
+            boxes (HintBoxes): The labelled boxes, which must not be changed afterwards.
+        """
+        self.entries[key] = boxes
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """Forgets every screen and resets the counters."""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,344 @@
+"""Contains the screen capture backends used by the System class."""
+import ctypes
+import ctypes.util
+import numpy as np
+import cv2
+from PIL import Image
+from .frames import frame_out
+
+
+class PyAutoGUICapture:
+    """
+    Captures the screen with `pyautogui.screenshot()`, which works on every
+    platform PyAutoGUI supports, at the cost of a PIL image copied into NumPy.
+
+    Methods:
+        - grab(region, out): Take a screenshot of the screen or part of it.
+        - close(): Release the backend's resources.
+
+    Example:
+        >>> capture = PyAutoGUICapture()
+        >>> screenshot = capture.grab(region=(0, 0, 800, 600))
+        >>> print(screenshot.shape)  # Output: (600, 800, 3)
+    """
+
+    def grab(self, region=None, out=None):
+        """
+        Take a screenshot of the screen or part of it.
+
+        Args:
+            region (tuple, optional): The (left, top, width, height) part of the screen
+                to grab, where None grabs the whole screen (default is None).
+            out (np.ndarray, optional): An array of the screenshot's shape to copy
+                it into instead of a new one (default is None).
+
+        Returns:
+            np.ndarray: A writable RGB image of shape (height, width, 3), out if it
+                was used.
+
+        Notes:
+            - PIL hands over the pixels in a read-only buffer, so they are always
+              copied, like the other backends return arrays that can be written to.
+        """
+        import pyautogui  # pylint: disable=import-outside-toplevel
+
+        image = np.asarray(pyautogui.screenshot(region=region))
+        if out is not None and out.shape == image.shape and out.dtype == image.dtype:
+            np.copyto(out, image)
+            return out
+        return image.copy()
+
+    def close(self):
+        """Release the backend's resources, which it has none of."""
+
+
+class XImage(ctypes.Structure):  # pylint: disable=too-few-public-methods
+    """The leading fields of Xlib's XImage structure, up to those this module reads."""
+
+    _fields_ = [
+        ("width", ctypes.c_int),
+        ("height", ctypes.c_int),
+        ("xoffset", ctypes.c_int),
+        ("format", ctypes.c_int),
+        ("data", ctypes.c_void_p),
+        ("byte_order", ctypes.c_int),
+        ("bitmap_unit", ctypes.c_int),
+        ("bitmap_bit_order", ctypes.c_int),
+        ("bitmap_pad", ctypes.c_int),
+        ("depth", ctypes.c_int),
+        ("bytes_per_line", ctypes.c_int),
+        ("bits_per_pixel", ctypes.c_int),
+    ]
+
+
+class XShmSegmentInfo(ctypes.Structure):  # pylint: disable=too-few-public-methods
+    """Xlib's XShmSegmentInfo structure describing a shared memory segment."""
+
+    _fields_ = [
+        ("shmseg", ctypes.c_ulong),
+        ("shmid", ctypes.c_int),
+        ("shmaddr", ctypes.c_void_p),
+        ("readOnly", ctypes.c_int),
+    ]
+
+
+class X11Capture:
+    """
+    Captures the screen on X11 with the MIT-SHM extension, so the X server writes
+    the pixels straight into shared memory that NumPy reads without a copy.
+    A shared memory image is created once per region size and reused.
+
+    Attributes:
+        display: The Xlib display connection.
+        root (int): The root window being captured.
+        images (dict): The shared memory image and segment for each region size.
+
+    Methods:
+        - grab(region, out): Take a screenshot of the screen or part of it.
+        - close(): Release the shared memory images and the display connection.
+
+    Notes:
+        - This backend needs libX11 and libXext, an X server with MIT-SHM,
+          and a 24 or 32 bit deep screen. OSError is raised otherwise.
+
+    Example:
+        >>> capture = X11Capture()
+        >>> screenshot = capture.grab()
+        >>> print(screenshot.shape)  # Output: (screen_height, screen_width, 3)
+        >>> capture.close()
+    """
+
+    def __init__(self):
+        """
+        Opens the display and checks that it supports shared memory images.
+
+        Raises:
+            OSError: If Xlib, the display or the MIT-SHM extension is unavailable.
+        """
+        self.xlib = self.load_library("X11")
+        self.xext = self.load_library("Xext")
+        self.libc = self.load_library("c")
+        self.xlib.XOpenDisplay.restype = ctypes.c_void_p
+        self.xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        self.xlib.XDefaultScreen.argtypes = [ctypes.c_void_p]
+        self.xlib.XRootWindow.restype = ctypes.c_ulong
+        self.xlib.XRootWindow.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        self.xlib.XDefaultVisual.restype = ctypes.c_void_p
+        self.xlib.XDefaultVisual.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        self.xlib.XDefaultDepth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        self.xlib.XDisplayWidth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        self.xlib.XDisplayHeight.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        self.xlib.XSync.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        self.xlib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        self.xext.XShmQueryExtension.argtypes = [ctypes.c_void_p]
+        self.xext.XShmCreateImage.restype = ctypes.POINTER(XImage)
+        self.xext.XShmCreateImage.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_void_p,
+            ctypes.c_uint,
+            ctypes.c_int,
+            ctypes.c_void_p,
+            ctypes.POINTER(XShmSegmentInfo),
+            ctypes.c_uint,
+            ctypes.c_uint,
+        ]
+        self.xext.XShmAttach.argtypes = [
+            ctypes.c_void_p,
+            ctypes.POINTER(XShmSegmentInfo),
+        ]
+        self.xext.XShmDetach.argtypes = [
+            ctypes.c_void_p,
+            ctypes.POINTER(XShmSegmentInfo),
+        ]
+        self.xext.XShmGetImage.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_ulong,
+            ctypes.POINTER(XImage),
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_ulong,
+        ]
+        self.libc.shmget.argtypes = [ctypes.c_int, ctypes.c_size_t, ctypes.c_int]
+        self.libc.shmat.restype = ctypes.c_void_p
+        self.libc.shmat.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_int]
+        self.libc.shmdt.argtypes = [ctypes.c_void_p]
+        self.libc.shmctl.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+        self.display = self.xlib.XOpenDisplay(None)
+        if not self.display:
+            raise OSError("Could not open the X display.")
+        if not self.xext.XShmQueryExtension(self.display):
+            self.xlib.XCloseDisplay(self.display)
+            raise OSError("The X server does not support the MIT-SHM extension.")
+        self.screen = self.xlib.XDefaultScreen(self.display)
+        self.root = self.xlib.XRootWindow(self.display, self.screen)
+        self.images = {}
+
+    @staticmethod
+    def load_library(name):
+        """
+        Loads a shared C library by its short name.
+
+        Args:
+            name (str): The library's name, such as "X11".
+
+        Returns:
+            ctypes.CDLL: The loaded library.
+
+        Raises:
+            OSError: If the library cannot be found.
+        """
+        path = ctypes.util.find_library(name)
+        if path is None:
+            raise OSError(f"Could not find the {name} library.")
+        return ctypes.CDLL(path)
+
+    def shared_image(self, width, height):
+        """
+        Returns the shared memory image for a region size, creating it the first time.
+
+        Args:
+            width (int): The width of the region in pixels.
+            height (int): The height of the region in pixels.
+
+        Returns:
+            tuple: The XImage pointer, its segment info, and a NumPy view of its pixels.
+
+        Raises:
+            OSError: If the screen's depth is unsupported or shared memory is unavailable.
+        """
+        if (width, height) in self.images:
+            return self.images[(width, height)]
+        depth = self.xlib.XDefaultDepth(self.display, self.screen)
+        if depth not in (24, 32):
+            raise OSError(f"Unsupported screen depth: {depth}")
+        info = XShmSegmentInfo(readOnly=0)
+        ximage = self.xext.XShmCreateImage(
+            self.display,
+            self.xlib.XDefaultVisual(self.display, self.screen),
+            depth,
+            2,  # ZPixmap
+            None,
+            ctypes.byref(info),
+            width,
+            height,
+        )
+        if not ximage or ximage.contents.bits_per_pixel != 32:
+            raise OSError("Could not create a 32 bit shared memory image.")
+        size = ximage.contents.bytes_per_line * height
+        shmid = self.libc.shmget(0, size, 0o1600)  # IPC_PRIVATE, IPC_CREAT | 0600
+        if shmid < 0:
+            raise OSError("Could not allocate shared memory.")
+        shmaddr = self.libc.shmat(shmid, None, 0)
+        if shmaddr in (None, ctypes.c_void_p(-1).value):
+            self.libc.shmctl(shmid, 0, None)  # IPC_RMID
+            raise OSError("Could not attach shared memory.")
+        # The image already points to info, so its fields are filled in place.
+        info.shmid = shmid  # pylint: disable=attribute-defined-outside-init
+        info.shmaddr = shmaddr  # pylint: disable=attribute-defined-outside-init
+        ximage.contents.data = shmaddr
+        self.xext.XShmAttach(self.display, ctypes.byref(info))
+        self.xlib.XSync(self.display, 0)
+        # The segment is freed once both this process and the X server detach.
+        self.libc.shmctl(shmid, 0, None)  # IPC_RMID
+        pixels = np.ctypeslib.as_array(
+            (ctypes.c_uint8 * size).from_address(shmaddr)
+        ).reshape(height, ximage.contents.bytes_per_line // 4, 4)[:, :width]
+        self.images[(width, height)] = (ximage, info, pixels)
+        return self.images[(width, height)]
+
+    def grab(self, region=None, out=None):
+        """
+        Take a screenshot of the screen or part of it.
+
+        Args:
+            region (tuple, optional): The (left, top, width, height) part of the screen
+                to grab, where None grabs the whole screen (default is None).
+            out (np.ndarray, optional): An array to convert the pixels into when its
+                shape is (height, width, 3), instead of a new one (default is None).
+
+        Returns:
+            np.ndarray: An RGB image of shape (height, width, 3), out if it was used.
+
+        Raises:
+            OSError: If the X server could not copy the region.
+        """
+        if region is None:
+            region = (
+                0,
+                0,
+                self.xlib.XDisplayWidth(self.display, self.screen),
+                self.xlib.XDisplayHeight(self.display, self.screen),
+            )
+        left, top, width, height = (int(value) for value in region)
+        ximage, _, pixels = self.shared_image(width, height)
+        if not self.xext.XShmGetImage(
+            self.display, self.root, ximage, left, top, ctypes.c_ulong(-1).value
+        ):
+            raise OSError("Could not copy the screen into shared memory.")
+        return cv2.cvtColor(
+            pixels, cv2.COLOR_BGRA2RGB, dst=frame_out(out, (height, width, 3))
+        )
+
+    def close(self):
+        """Release the shared memory images and the display connection."""
+        for ximage, info, _ in self.images.values():
+            self.xext.XShmDetach(self.display, ctypes.byref(info))
+            self.libc.shmdt(info.shmaddr)
+            ximage.contents.data = None
+        self.images = {}
+        if self.display:
+            self.xlib.XCloseDisplay(self.display)
+            self.display = None
+
+
+class ArrayCapture:
+    """
+    Captures a fixed image instead of the screen, for tests and benchmarks.
+
+    Attributes:
+        frame (np.ndarray): The RGB image standing in for the screen.
+
+    Methods:
+        - grab(region, out): Take a "screenshot" of the image or part of it.
+        - close(): Release the backend's resources.
+
+    Example:
+        >>> capture = ArrayCapture("images/tests.jpg")
+        >>> screenshot = capture.grab(region=(0, 0, 800, 600))
+        >>> print(screenshot.shape)  # Output: (600, 800, 3)
+    """
+
+    def __init__(self, frame):
+        """
+        Stores the image standing in for the screen.
+
+        Args:
+            frame (np.ndarray or str): An RGB image, or the path of an image file.
+        """
+        if isinstance(frame, str):
+            frame = np.asarray(Image.open(frame).convert("RGB"))
+        self.frame = frame
+
+    def grab(self, region=None, out=None):
+        """
+        Take a "screenshot" of the image or part of it.
+
+        Args:
+            region (tuple, optional): The (left, top, width, height) part of the image
+                to grab, where None grabs the whole image (default is None).
+            out (np.ndarray, optional): An array to copy the pixels into when its
+                shape matches the region, instead of a new one (default is None).
+
+        Returns:
+            np.ndarray: A copy of the RGB image or its region, out if it was used.
+        """
+        frame = self.frame
+        if region is not None:
+            left, top, width, height = region
+            frame = frame[top : top + height, left : left + width]
+        out = frame_out(out, frame.shape, frame.dtype)
+        np.copyto(out, frame)
+        return out
+
+    def close(self):
+        """Release the backend's resources, which it has none of."""
@@ -0,0 +1,207 @@
+"""Stores the functions measuring how many clickable places each configuration finds."""
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+from PIL import Image
+from .image_pipeline import ImagePipeline
+from .synthetic import RESOLUTIONS, synthetic_screenshot
+
+CONFIGURATIONS = {
+    "fast": {},
+    "slow": {"slow": True},
+    "downscaled": {"scale": 0.5},
+    "rtree": {"suppression": "rtree"},
+    "components": {"extraction": "components"},
+    "tiled": {"tiling": 1024},
+}
+
+
+def synthetic_samples(resolutions=("1080p",), densities=("low", "medium", "high")):
+    """
+    Draws synthetic screenshots, with their elements as the ground truth.
+
+    Args:
+        resolutions (tuple, optional): Names of `RESOLUTIONS` (default is ("1080p",)).
+        densities (tuple, optional): Names of `DENSITIES`
+            (default is ("low", "medium", "high")).
+
+    Returns:
+        list: The (name, image, boxes) samples, boxes being an (N, 4) array of [x, y, w, h].
+    """
+    samples = []
+    for resolution in resolutions:
+        for density in densities:
+            image, elements = synthetic_screenshot(*RESOLUTIONS[resolution], density)
+            boxes = np.array([box for _, box in elements], np.int64).reshape(-1, 4)
+            samples.append((f"{resolution} {density}", image, boxes))
+    return samples
+
+
+def load_samples(path):
+    """
+    Loads annotated screenshots from a JSON lines file.
+
+    Args:
+        path (str): The file, with a line like `{"image": "a.png", "boxes": [[x, y, w, h]]}`
+            per screenshot, the image's path being relative to the file.
+
+    Returns:
+        list: The (name, image, boxes) samples, boxes being an (N, 4) array of [x, y, w, h].
+    """
+    samples = []
+    with open(path, encoding="utf8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            annotation = json.loads(line)
+            image_path = os.path.join(os.path.dirname(path), annotation["image"])
+            image = np.array(Image.open(image_path).convert("RGB"))
+            boxes = np.array(annotation["boxes"], np.int64).reshape(-1, 4)
+            samples.append((annotation["image"], image, boxes))
+    return samples
+
+
+def scoring(found, truth, offset=None):
+    """
+    Compares the boxes found with the ground truth by where they would be clicked.
+
+    Args:
+        found (np.ndarray): The (N, 4) boxes found, as [x, y, w, h].
+        truth (np.ndarray): The (M, 4) ground-truth boxes, as [x, y, w, h].
+        offset (int, optional): How far right and down from a box's corner the
+            click lands, where None clicks the box's centre (default is None).
+
+    Returns:
+        tuple: The recall, the share of ground-truth boxes clicked by some box found,
+            and the precision, the share of boxes found clicking a ground-truth box.
+
+    Notes:
+        - A box counts as found when clicking it would click the element,
+          whatever its overlap, since that is what the hints are used for.
+        - `GUI.selecting_coordinate` clicks 10 pixels from the corner, which can
+          miss elements smaller than that even when detection found them.
+    """
+    found = np.asarray(found, np.int64).reshape(-1, 4)
+    truth = np.asarray(truth, np.int64).reshape(-1, 4)
+    if offset is None:
+        clicks = found[:, :2, None] + found[:, 2:, None] // 2
+    else:
+        clicks = found[:, :2, None] + offset
+    inside = (
+        (clicks[:, 0] >= truth[:, 0])
+        & (clicks[:, 0] < truth[:, 0] + truth[:, 2])
+        & (clicks[:, 1] >= truth[:, 1])
+        & (clicks[:, 1] < truth[:, 1] + truth[:, 3])
+    )
+    recall = float(inside.any(axis=0).mean()) if len(truth) else 1.0
+    precision = float(inside.any(axis=1).mean()) if len(found) else 1.0
+    return recall, precision
+
+
+def evaluate(samples, configurations=None):
+    """
+    Runs each configuration of the pipeline over every sample and scores it.
+
+    Args:
+        samples (list): The (name, image, boxes) samples.
+        configurations (dict, optional): Keyword arguments of `ImagePipeline` by name,
+            "slow" being passed to `processing_image` instead, where None uses
+            `CONFIGURATIONS` (default is None).
+
+    Returns:
+        list: A row per configuration, with its "configuration" name, the mean
+            "recall", "precision", number of "boxes" and "seconds" per sample.
+
+    Example:
+        >>> rows = evaluate(synthetic_samples())
+        >>> print(format_table(rows))
+    """
+    if configurations is None:
+        configurations = CONFIGURATIONS
+    rows = []
+    for name, options in configurations.items():
+        options = dict(options)
+        slow = options.pop("slow", False)
+        scores = []
+        for _, image, truth in samples:
+            y = ImagePipeline(**options)
+            y.original_image = image
+            started = time.perf_counter()
+            y.processing_image(slow=slow)
+            y.processing_data()
+            seconds = time.perf_counter() - started
+            found = y.coordinate_data.boxes
+            scores.append((*scoring(found, truth), len(found), seconds))
+        recall, precision, boxes, seconds = np.mean(scores, axis=0).tolist()
+        rows.append(
+            {
+                "configuration": name,
+                "recall": recall,
+                "precision": precision,
+                "boxes": boxes,
+                "seconds": seconds,
+            }
+        )
+    return rows
+
+
+def format_table(rows):
+    """
+    Lays the rows of `evaluate` out as a text table.
+
+    Args:
+        rows (list): The rows of `evaluate`.
+
+    Returns:
+        str: The table, with a header line and a line per configuration.
+    """
+    lines = [
+        f"{'configuration':<14} {'recall':>7} {'precision':>9} {'boxes':>8} {'seconds':>8}"
+    ]
+    for row in rows:
+        lines.append(
+            f"{row['configuration']:<14} {row['recall']:>7.3f} {row['precision']:>9.3f}"
+            f" {row['boxes']:>8.1f} {row['seconds']:>8.4f}"
+        )
+    return "\n".join(lines)
+
+
+def main(args=None):
+    """
+    Prints the table of every configuration over annotated or synthetic screenshots.
+
+    Args:
+        args (list, optional): The command-line arguments, where None reads them
+            from `sys.argv` (default is None).
+
+    Examples:
+        ```sh
+        python -m keyflare.evaluation --resolutions 1080p 4K
+        python -m keyflare.evaluation --annotations screenshots.jsonl --json
+        ```
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__.splitlines()[1].strip())
+    parser.add_argument(
+        "--annotations", help="A JSON lines file of annotated screenshots."
+    )
+    parser.add_argument(
+        "--resolutions", nargs="+", default=["1080p"], choices=RESOLUTIONS
+    )
+    parser.add_argument("--json", action="store_true", help="Print JSON lines instead.")
+    args = parser.parse_args(sys.argv[1:] if args is None else args)
+    if args.annotations:
+        samples = load_samples(args.annotations)
+    else:
+        samples = synthetic_samples(args.resolutions)
+    rows = evaluate(samples)
+    if args.json:
+        print("\n".join(json.dumps(row) for row in rows))
+    else:
+        print(format_table(rows))
+
+
+if __name__ == "__main__":
+    main()
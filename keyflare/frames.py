@@ -0,0 +1,127 @@
+"""Stores the FrameBuffer class for reusing full-frame arrays across activations."""
+import zlib
+import numpy as np
+
+
+def frame_out(out, shape, dtype=np.uint8):
+    """
+    Returns out when it can hold a frame of the given shape, or a new array otherwise.
+
+    Args:
+        out (np.ndarray or None): The array offered to write the frame into.
+        shape (tuple): The frame's shape.
+        dtype (np.dtype, optional): The frame's type (default is np.uint8).
+
+    Returns:
+        np.ndarray: The array to write the frame into.
+    """
+    if out is None or out.shape != tuple(shape) or out.dtype != dtype:
+        return np.empty(shape, dtype)
+    return out
+
+
+def frame_fingerprint(image):
+    """
+    Returns a fingerprint of a frame, equal for frames of the same pixels.
+
+    Args:
+        image (np.ndarray): The frame.
+
+    Returns:
+        tuple: The frame's shape and the CRC-32 of its pixels.
+
+    Notes:
+        - Every pixel is hashed, in about 3 ms for a 1080p screenshot, since the
+          fingerprint decides whether boxes found earlier can be clicked, and a
+          hash of a downscaled frame would miss a few changed letters.
+
+    Example:
+        >>> frame_fingerprint(np.zeros((2, 2, 3), np.uint8))
+        ((2, 2, 3), 2077607535)
+    """
+    image = np.ascontiguousarray(image)
+    return image.shape, zlib.crc32(image)
+
+
+class FrameBuffer:
+    """
+    The `FrameBuffer` class keeps named arrays that are allocated once per shape
+    and reused by every activation, so screenshots and overlays are written into
+    existing memory instead of new full-frame copies.
+
+    Attributes:
+        reuse (bool): Whether arrays are reused, or allocated every time.
+        arrays (dict): The reusable arrays by name.
+        allocations (int): The number of arrays allocated so far.
+
+    Methods:
+        - get(name, shape, dtype): Returns the named array, allocating it for a new shape.
+        - fill(name, produce): Stores what produce writes into the named array.
+
+    Notes:
+        - An array returned by `get` or `fill` is overwritten by the next activation,
+          so copy it before keeping it around.
+
+    Example:
+        >>> frames = FrameBuffer()
+        >>> overlay = frames.get("overlay", (1080, 1920, 3))
+        >>> overlay is frames.get("overlay", (1080, 1920, 3))
+        True
+        >>> frames.allocations
+        1
+    """
+
+    def __init__(self, reuse=True):
+        """
+        Starts without any arrays.
+
+        Args:
+            reuse (bool, optional): Whether to reuse arrays at all, where False
+                allocates new ones every time, as a baseline (default is True).
+        """
+        self.reuse = reuse
+        self.arrays = {}
+        self.allocations = 0
+
+    def get(self, name, shape, dtype=np.uint8):
+        """
+        Returns the named array, allocating it the first time or when its shape changes.
+
+        Args:
+            name (str): The array's name.
+            shape (tuple): The shape the array needs.
+            dtype (np.dtype, optional): The type the array needs (default is np.uint8).
+
+        Returns:
+            np.ndarray: The array, with undefined contents if it was just allocated.
+        """
+        previous = self.arrays.get(name)
+        array = frame_out(previous, shape, dtype)
+        if array is not previous:
+            self.allocations += 1
+            if self.reuse:
+                self.arrays[name] = array
+        return array
+
+    def fill(self, name, produce):
+        """
+        Lets produce write into the named array when it can, and stores the result.
+
+        Args:
+            name (str): The array's name.
+            produce (callable): Takes the previous array, or None, as the place to
+                write into, and returns that array or a newly allocated one.
+
+        Returns:
+            np.ndarray: The array returned by produce.
+
+        Example:
+            >>> frames.fill("screenshot", lambda out: system.image(out=out))
+        """
+        previous = self.arrays.get(name)
+        array = produce(previous)
+        if array is not previous:
+            self.allocations += 1
+            if self.reuse:
+                self.arrays[name] = array
+        return array
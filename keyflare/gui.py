@@ -1,10 +1,10 @@
 """This file contains the class `GUI`, which is the primary interface for KeyFlare."""
-import tempfile
 import tkinter as tk
 from tkinter import ttk
 import tkinter.colorchooser as cc
-import cv2
+import numpy as np
 from .image_pipeline import ImagePipeline
+from .labels import LabelAtlas
 
 
 class GUI:
@@ -19,17 +19,37 @@ class GUI:
         root (Tk object): The root Tk window for the KeyFlare application.
         input_char (str): The character input by the user.
         y (ImagePipeline object): An instance of the
-            ImagePipeline class used for image processing and coordinate finding.
+            ImagePipeline class used for image processing and coordinate finding,
+            created on first use.
         exit_flag (bool): Flag to indicate whether to
             exit the application or not by the Usages class.
         color (tuple): The selected input method's color represented in (R, G, B) format.
-        label: A tk Label to be shown in the application.
-        temp_name: Name of the temporary file.
+        atlas (LabelAtlas): The renderer drawing the labels from pre-rasterized letters.
+        label: A tk Label to be shown in the application, or the Canvas in "canvas" mode.
+        overlay (str): How labels are shown, either "image" (drawn into the screenshot
+            again on every keystroke) or "canvas" (persistent items over the screenshot).
+        background: The Tk image being shown, the overlay or the screenshot behind the canvas.
+        label_items (list): The rectangle and text items of each remaining
+            label on the canvas, in the order of the pipeline's coordinate_data.
+        resident (bool): Whether the window is kept, withdrawn, between activations
+            instead of being created and destroyed by each of them.
 
     Methods:
-        run(clicks: int): Runs KeyFlare's GUI process for selecting a coordinate.
-        selecting_coordinate(clicks: int): Manages the
+        run(clicks: int, button: str, scroll_distance: int, region: tuple): Runs
+            KeyFlare's GUI process for selecting a coordinate.
+        pointer_region(width: int, height: int): Gives the part of the screen
+            around the mouse pointer.
+        starting(): Creates the withdrawn window and warms the pipeline up, when resident.
+        creating_window(): Creates the fullscreen window.
+        showing_window(): Shows the window, creating it unless resident.
+        closing_window(): Closes the window, or only withdraws it when resident.
+        selecting_coordinate(clicks: int, button: str, scroll_distance: int): Manages the
             process of selecting a coordinate on the keyboard image.
+        composing_overlay(out): Draws the remaining labels over the screenshot.
+        encoding_overlay(labels): Packs the overlay into an uncompressed PPM image for Tk.
+        showing_labels(): Shows the labels left after the latest keystroke.
+        drawing_labels(): Shows the screenshot on a canvas with an item per label.
+        hiding_labels(previous): Hides the canvas items of the labels that stopped matching.
         on_key(event): Filters and updates available key options on a keyboard input.
         exit_app(): Gracefully exits the KeyFlare application.
         select_color(): Opens a color selection dialog and updates the selected color in the GUI.
@@ -39,19 +59,67 @@ class GUI:
 
     root = None
     input_char = ""
-    y = ImagePipeline()
+    _y = None
     exit_flag = False
     color = (248, 93, 94)
+    atlas = None
     label = None
-    temp_name = None
+    overlay = "image"
+    background = None
+    label_items = None
+    resident = False
 
-    def run(self, clicks, button):
+    def __init__(self, overlay="image", resident=False):
+        """
+        Chooses how the labels are shown.
+
+        Args:
+            overlay (str, optional): Either "image", drawing the labels into the
+                screenshot on every keystroke, or "canvas", drawing them once as
+                canvas items that keystrokes hide (default is "image").
+            resident (bool, optional): Whether to keep the window between
+                activations, which `starting` prepares (default is False).
+
+        Raises:
+            ValueError: If the overlay's name is unknown.
+        """
+        if overlay not in ("image", "canvas"):
+            raise ValueError(f"Unknown overlay: {overlay}")
+        self.overlay = overlay
+        self.resident = resident
+        self.atlas = LabelAtlas()
+
+    @property
+    def y(self):
+        """
+        The `ImagePipeline` finding the places to click, created when first used.
+
+        Returns:
+            ImagePipeline: The pipeline, with its default settings unless one was set.
+        """
+        if self._y is None:
+            self._y = ImagePipeline()
+        return self._y
+
+    @y.setter
+    def y(self, pipeline):
+        self._y = pipeline
+
+    def run(self, clicks, button, scroll_distance=None, region=None):
         """
         Runs KeyFlare's graphical user interface process for selecting a coordinate.
 
         Args:
             clicks (int, required): The number of mouse
                 clicks to perform when a place to click has been found.
+            button (str, required): The mouse button clicking it, "left" or "right",
+                where None only moves the pointer there.
+            scroll_distance (int, optional): The distance to scroll there
+                afterwards, where None does not scroll (default is None).
+            region (tuple, optional): The (left, top, width, height) part of the
+                screen to find places in, or the (width, height) of the part
+                around the mouse pointer, where None uses the whole screen
+                (default is None).
 
         Returns:
             None
@@ -63,20 +131,134 @@ class GUI:
             - If no matching key is found, the GUI will display
               color selection options and allow the user to exit the application.
 
+            - When resident, the window of the previous activation is shown again
+              and withdrawn afterwards, so only capture and detection are left
+              between the activation and the labels.
+            - The pipeline's `speculation` is paused until the window is closed,
+              so the overlay is not captured and detected in the background.
+
         Example:
             >>> gui = GUI()
-            >>> gui.run(clicks=2)
+            >>> gui.run(clicks=2, button="left")
+            >>> gui.run(clicks=1, button="left", region=(600, 400))  # Near the pointer
+        """
+        if region is not None and len(region) == 2:
+            region = self.pointer_region(*region)
+        speculation = self.y.speculation
+        if speculation is not None:
+            speculation.pause()
+        try:
+            self.y.run(region=region)
+            self.showing_window()
+            self.label = tk.Label(self.root).pack()
+            self.label_items = None
+            self.selecting_coordinate(clicks, button, scroll_distance)
+            if self.resident and not self.exit_flag:
+                self.closing_window()
+        finally:
+            if speculation is not None:
+                speculation.resume()
+
+    def pointer_region(self, width, height):
         """
+        Gives the part of the screen centred on the mouse pointer.
+
+        Args:
+            width (int): The part's width in pixels.
+            height (int): The part's height in pixels.
+
+        Returns:
+            tuple: The (left, top, width, height) part, which the pipeline
+                clips to the screen.
+        """
+        x, y = self.y.x.pointer()
+        return (x - width // 2, y - height // 2, width, height)
+
+    def starting(self):
+        """
+        Prepares a resident GUI: creates the window and withdraws it, then runs the
+        pipeline once and draws its overlay, so OpenCV, the capture backend and
+        the arrays of the pipeline's `frames` are ready before the first activation.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Notes:
+            - The window must then be used from the thread that called this method.
+            - The warm-up is recorded as an activation by the pipeline's `instruments`.
+
+        Example:
+            >>> gui = GUI(resident=True)
+            >>> gui.starting()
+            >>> gui.run(clicks=1, button="left")  # Shows the window created above
+        """
+        if self.root is None:
+            self.creating_window()
+        self.root.withdraw()
         self.y.run()
+        self.encoding_overlay()
+
+    def creating_window(self):
+        """
+        Creates the fullscreen window that the labels are shown in.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
         self.root = tk.Tk()
         self.root.title("KeyFlare")
         self.root.wm_attributes("-fullscreen", True)
         self.root.attributes("-topmost", 1)
+
+    def showing_window(self):
+        """
+        Shows the window, emptied of the previous activation's labels when resident,
+        or created anew otherwise.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        if self.resident and self.root is not None:
+            for child in self.root.winfo_children():
+                child.destroy()
+            self.root.deiconify()
+        else:
+            self.creating_window()
         self.root.focus_force()
-        self.label = tk.Label().pack()
-        self.selecting_coordinate(clicks, button)
 
-    def selecting_coordinate(self, clicks, button):
+    def closing_window(self):
+        """
+        Closes the window, or when resident only withdraws it and leaves its event
+        loop, keeping it for the next activation.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Notes:
+            - The withdrawn window is unmapped before returning, so a click that
+              follows lands on the screen behind it.
+        """
+        if not self.resident:
+            self.root.destroy()
+            return
+        self.root.grab_release()
+        self.root.withdraw()
+        self.root.update()
+        self.root.quit()
+
+    def selecting_coordinate(self, clicks, button, scroll_distance=None):
         """
         Manages the process of selecting a coordinate on
         the keyboard image, clicking the point at the end
@@ -85,69 +267,40 @@ class GUI:
         Args:
             clicks (int, required): The number of mouse clicks to
                 perform when a place to click has been found.
+            button (str, required): The mouse button clicking it, or None.
+            scroll_distance (int, optional): The distance to scroll there
+                afterwards, where None does not scroll (default is None).
 
         Returns:
             None
 
+        Notes:
+            - Showing the labels is recorded as the "overlay" stage, and each
+              keystroke as the "keystroke" stage, by the pipeline's `instruments`.
+            - Keys are read until one label or none is left, since backspace and
+              keys without a character do not narrow the labels down. A key
+              matching no label, such as Escape, cancels with the preference menu.
+
         Example:
             >>> gui = GUI()
             >>> gui.run(clicks=2) # Notice: please do not run this by itself
         """
-        for _ in range(6):
-            image = self.y.original_image.copy()
-            if self.label:
-                self.label.destroy()
-            if self.root.winfo_exists():
-                for key, loc in self.y.coordinate_data:
-                    image = cv2.rectangle(
-                        image,
-                        (loc[0], loc[1]),
-                        (loc[0] + 13 * len(self.y.coordinate_data[0][0]), loc[1] + 20),
-                        self.color,
-                        -1,
-                    )
-                    text_size, _ = cv2.getTextSize(key, cv2.FONT_HERSHEY_PLAIN, 0.75, 1)
-                    image = cv2.putText(
-                        image,
-                        key,
-                        (
-                            loc[0]
-                            + (10 * len(self.y.coordinate_data[0][0]) - text_size[0])
-                            // 2,
-                            loc[1] + (20 + text_size[1]) // 2,
-                        ),
-                        cv2.FONT_HERSHEY_COMPLEX_SMALL,
-                        0.75,
-                        (0, 0, 0),
-                        1,
-                        cv2.LINE_AA,
-                    )
-                image = cv2.addWeighted(
-                    image, 0.75, self.y.original_image.copy(), 1 - 0.75, 0
-                )
-                image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-                _, buffer = cv2.imencode(".png", image)
-                with tempfile.NamedTemporaryFile(
-                    suffix=".png", delete=False
-                ) as temp_file:
-                    temp_file.write(buffer.tobytes())
-                    self.temp_name = temp_file.name
-                image = tk.PhotoImage(file=self.temp_name)
-                self.label = ttk.Label(self.root, image=image)
-                self.label.pack()
-                self.root.update_idletasks()
-                self.root.lift()
-                self.root.focus_force()
-                self.root.after(1, self.root.focus_force())
-                self.root.attributes("-topmost", True)
-                self.root.after_idle(self.root.attributes, "-topmost", False)
-                self.root.focus_force()
-                self.root.after(50, self.focus_window)
-                self.root.bind("<Key>", self.on_key)
-                self.root.grab_set()
-                self.root.mainloop()
+        while not self.exit_flag and self.root.winfo_exists():
+            with self.y.instruments.stage("overlay"):
+                self.showing_labels()
+            self.root.update_idletasks()
+            self.root.lift()
+            self.root.focus_force()
+            self.root.after(1, self.root.focus_force())
+            self.root.attributes("-topmost", True)
+            self.root.after_idle(self.root.attributes, "-topmost", False)
+            self.root.focus_force()
+            self.root.after(50, self.focus_window)
+            self.root.bind("<Key>", self.on_key)
+            self.root.grab_set()
+            self.root.mainloop()
             if len(self.y.coordinate_data) == 1:
-                self.root.destroy()
+                self.closing_window()
                 self.y.x.mouse(
                     [
                         self.y.coordinate_data[0][1][0] + 10,
@@ -155,6 +308,7 @@ class GUI:
                     ],
                     clicks=clicks,
                     button=button,
+                    scroll_distance=scroll_distance,
                 )
                 break
             if len(self.y.coordinate_data) == 0:
@@ -183,17 +337,177 @@ class GUI:
                 pass_button = ttk.Button(
                     self.root,
                     text="Continue (or Press Any Key)",
-                    command=self.root.destroy,
+                    command=self.closing_window,
                 )
                 pass_button.pack(pady=10)
-                self.root.bind("<Key>", lambda e: self.root.destroy())
+                self.root.bind("<Key>", lambda e: self.closing_window())
                 self.root.mainloop()
                 break
 
+    def composing_overlay(self, out=None):
+        """
+        Draws a label over each remaining box of the screenshot with the glyph
+        atlas and blends the labels in, writing into an array of the pipeline's
+        `frames` that is allocated once per resolution.
+
+        Args:
+            out (np.ndarray, optional): An array of the screenshot's shape to write
+                the overlay into, where None uses one of `frames` (default is None).
+
+        Returns:
+            np.ndarray: The RGB overlay, which the next call overwrites.
+
+        Example:
+            >>> gui = GUI()
+            >>> gui.y.run()
+            >>> overlay = gui.composing_overlay()
+        """
+        original = self.y.original_image
+        if out is None:
+            out = self.y.frames.get("overlay", original.shape)
+        return self.atlas.render(original, self.y.coordinate_data, self.color, out)
+
+    def encoding_overlay(self, labels=True):
+        """
+        Composes the overlay straight into the pixels of a binary PPM image,
+        which Tk reads from memory as is, instead of compressing it to a PNG
+        file and reading that back on every keystroke.
+
+        Args:
+            labels (bool, optional): Whether to draw the labels, or only pack
+                the screenshot (default is True).
+
+        Returns:
+            bytes: The overlay as a binary PPM image.
+
+        Notes:
+            - The PPM image is assembled in an array of the pipeline's `frames`,
+              so the only full-frame copy is the bytes handed to Tk.
+
+        Example:
+            >>> gui = GUI()
+            >>> gui.y.run()
+            >>> image = tk.PhotoImage(data=gui.encoding_overlay(), format="PPM")
+        """
+        height, width = self.y.original_image.shape[:2]
+        header = f"P6 {width} {height} 255\n".encode()
+        ppm = self.y.frames.get("overlay ppm", (len(header) + height * width * 3,))
+        ppm[: len(header)] = np.frombuffer(header, np.uint8)
+        pixels = ppm[len(header) :].reshape(height, width, 3)
+        if labels:
+            self.composing_overlay(out=pixels)
+        else:
+            np.copyto(pixels, self.y.original_image)
+        return ppm.tobytes()
+
+    def showing_labels(self):
+        """
+        Shows the labels left after the latest keystroke, either by replacing
+        the image of the overlay or, in "canvas" mode, by drawing the canvas
+        the first time, since keystrokes update it themselves afterwards.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        if self.overlay == "canvas":
+            if self.label_items is None:
+                self.drawing_labels()
+            return
+        if self.label:
+            self.label.destroy()
+        self.background = tk.PhotoImage(data=self.encoding_overlay(), format="PPM")
+        self.label = ttk.Label(self.root, image=self.background)
+        self.label.pack()
+
+    def drawing_labels(self):
+        """
+        Shows the screenshot once as the background of a canvas, with a rectangle
+        and a text item for each label. Keystrokes then only hide or shorten
+        the items of labels, so the screenshot is never drawn or sent to Tk again.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Notes:
+            - The rectangles are opaque, since Tk's canvas cannot blend items
+              into the screenshot like the "image" overlay does.
+
+        Example:
+            >>> gui = GUI(overlay="canvas")
+            >>> gui.run(clicks=1, button="left")  # Calls drawing_labels once
+        """
+        height, width = self.y.original_image.shape[:2]
+        self.background = tk.PhotoImage(
+            data=self.encoding_overlay(labels=False), format="PPM"
+        )
+        self.label = tk.Canvas(
+            self.root, width=width, height=height, highlightthickness=0, borderwidth=0
+        )
+        self.label.create_image(0, 0, image=self.background, anchor="nw")
+        fill = self.rgb_to_hex(self.color)
+        self.label_items = []
+        for key, loc in self.y.coordinate_data:
+            length = len(key)
+            rectangle = self.label.create_rectangle(
+                loc[0], loc[1], loc[0] + 13 * length, loc[1] + 20, fill=fill, width=0
+            )
+            text = self.label.create_text(
+                loc[0] + 13 * length // 2,
+                loc[1] + 10,
+                text=key,
+                fill="#000000",
+                font=("Courier", 9),
+            )
+            self.label_items.append((rectangle, text))
+        self.label.pack()
+
+    def hiding_labels(self, previous):
+        """
+        Hides the canvas items of the labels that stopped matching, shows those of
+        the labels matching again after a backspace, and sets the text of the others
+        to what is left to type, so the work done scales with the labels that
+        changed rather than the screen's size.
+
+        Args:
+            previous (tuple): The (start, end) range of the hint index that
+                matched before the keystroke.
+
+        Returns:
+            None
+
+        Notes:
+            - The canvas items are in the hint index's order, since the canvas is
+              drawn before any keystroke, so a range of labels is a range of items.
+
+        Example:
+            >>> gui.hiding_labels((0, 676))  # After narrowing down all the labels
+        """
+        start, end = self.y.hints.ranges[-1]
+        for first, last, state in (
+            (previous[0], start, "hidden"),
+            (end, previous[1], "hidden"),
+            (start, previous[0], "normal"),
+            (previous[1], end, "normal"),
+        ):
+            for index in range(first, last):
+                for item in self.label_items[index]:
+                    self.label.itemconfigure(item, state=state)
+        for (_, text), key in zip(
+            self.label_items[start:end], self.y.coordinate_data.texts()
+        ):
+            self.label.itemconfigure(text, text=key)
+
     def on_key(self, event):
         """
         Filters and updates available key options on a keyboard input event.
-        Narrows down the choices to find the spot to click.
+        Narrows down the choices to find the spot to click, through the pipeline's
+        hint index, and backspace brings back the choices of the previous key.
 
         Args:
             event (tkinter.Event): The keyboard event containing information about the pressed key.
@@ -201,17 +515,26 @@ class GUI:
         Returns:
             None
 
+        Notes:
+            - Keys without a character, such as Shift, leave the choices as they are.
+            - In "canvas" mode, the canvas items of the labels that stopped
+              matching are hidden straight away.
+
         Example:
             To use this method, you can define it as an
             event handler for a tkinter window like this:
             >>> self.root.bind("<Key>", self.on_key)
         """
         self.input_char = event.char
-        self.y.coordinate_data = [
-            (key[len(self.input_char) :], p1)
-            for key, p1 in self.y.coordinate_data
-            if key[0].lower() == self.input_char.lower()
-        ]
+        with self.y.instruments.stage("keystroke"):
+            previous = self.y.hints.ranges[-1]
+            if self.input_char == "\b":
+                self.y.hints.back()
+            elif self.input_char:
+                self.y.hints.narrow(self.input_char)
+            self.y.coordinate_data = self.y.hints.matches()
+            if self.label_items is not None:
+                self.hiding_labels(previous)
         self.root.quit()
 
     def exit_app(self):
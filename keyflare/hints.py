@@ -0,0 +1,192 @@
+"""Stores the functions that create hint labels and the HintIndex class for narrowing
+them down as they are typed."""
+import numpy as np
+from .results import HintBoxes
+
+ALPHABET = "etaoinsrhlcdumfpwybgvkxjqz"
+
+
+def label_digits(indices, count, base=len(ALPHABET), mixed=True):
+    """
+    Computes the letters of labels from their indices, without listing the labels
+    that are not needed.
+
+    Args:
+        indices (np.ndarray): The indices of the labels, each below count.
+        count (int): The number of labels in the whole set.
+        base (int, optional): The number of letters to label with (default is 26).
+        mixed (bool, optional): Whether the set mixes labels one letter shorter with
+            the longest labels, where False makes every label as long (default is True).
+
+    Returns:
+        tuple: The (labels, length) array of each label's letters as positions in the
+            alphabet, padded with zeros, and the array of each label's length.
+
+    Notes:
+        - The labels are as long as needed for count of them to exist. As many as
+          possible of the shorter labels are then kept whole, and the others are
+          extended by every letter, so no label is the start of another.
+        - The labels are in order, with the shorter ones first, so a label's letters
+          are the digits of a number computed from its index.
+
+    Example:
+        >>> digits, lengths = label_digits(np.arange(27), 27)
+        >>> lengths[-3:]
+        array([1, 2, 2])
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    length = 1
+    while base**length < count:
+        length += 1
+    short = 0
+    if mixed and length > 1:
+        short = min((base**length - count) // (base - 1), base ** (length - 1))
+    # Shorter labels get a trailing zero digit, the others follow the shorter ones.
+    values = np.where(indices < short, indices * base, short * (base - 1) + indices)
+    powers = base ** np.arange(length - 1, -1, -1, dtype=np.int64)
+    digits = values[:, None] // powers % base
+    lengths = np.where(indices < short, length - 1, length)
+    digits[lengths < length, -1] = 0
+    return digits, lengths
+
+
+def hint_codes(count, alphabet=ALPHABET, mixed=True):
+    """
+    Creates count labels, no label being the start of another, as bytes.
+
+    Args:
+        count (int): The number of labels.
+        alphabet (str, optional): The letters to label with, the easiest to type
+            first (default is ALPHABET, ordered by how common the letters are).
+        mixed (bool, optional): Whether some labels can be a letter shorter
+            (default is True).
+
+    Returns:
+        np.ndarray: The (count,) fixed-width bytes labels, shorter ones padded with zeros.
+
+    Example:
+        >>> hint_codes(3)
+        array([b'e', b't', b'a'], dtype='|S1')
+    """
+    if count == 0:
+        return np.zeros(0, "S1")
+    digits, lengths = label_digits(np.arange(count), count, len(alphabet), mixed)
+    letters = np.frombuffer(alphabet.encode("ascii"), np.uint8)[digits]
+    letters[lengths < digits.shape[1], -1] = 0
+    return letters.view(f"S{digits.shape[1]}").ravel()
+
+
+def hint_labels(count, alphabet=ALPHABET, mixed=True):
+    """
+    Creates count labels, no label being the start of another.
+
+    Args:
+        count (int): The number of labels.
+        alphabet (str, optional): The letters to label with, the easiest to type
+            first (default is ALPHABET, ordered by how common the letters are).
+        mixed (bool, optional): Whether some labels can be a letter shorter
+            (default is True).
+
+    Returns:
+        list: The labels, as strings.
+
+    Example:
+        >>> hint_labels(3)
+        ['e', 't', 'a']
+        >>> len(hint_labels(30)[-1])
+        2
+    """
+    # Trailing zero bytes are dropped when fixed-width bytes become strings.
+    return hint_codes(count, alphabet, mixed).astype(str).tolist()
+
+
+class HintIndex:
+    """
+    The `HintIndex` class keeps the labels sorted, so the labels starting with
+    what has been typed always form one range of positions. Each keystroke finds
+    the smaller range with two binary searches inside the current one, and
+    backspace returns to the previous range without searching again.
+
+    Attributes:
+        keys (np.ndarray): The lowercase labels, sorted, as fixed-width bytes.
+        boxes (np.ndarray): The (N, 4) [x, y, w, h] box of each label, in the same order.
+        scores (np.ndarray): The score of each box, in the same order.
+        typed (str): What has been typed so far.
+        ranges (list): The (start, end) positions of the labels matching each
+            prefix of what has been typed, the current range last.
+
+    Methods:
+        - narrow(char): Keeps the labels continuing with a typed character.
+        - back(): Forgets the last typed character, as with backspace.
+        - matches(): Returns the matching boxes, labelled with what is left to type.
+
+    Example:
+        >>> hints = HintIndex([("ee", [0, 0, 5, 5]), ("et", [9, 9, 5, 5])])
+        >>> hints.narrow("e")
+        >>> hints.narrow("t")
+        >>> hints.matches().pairs()
+        [('', [9, 9, 5, 5])]
+        >>> hints.back()
+        >>> len(hints.matches())
+        2
+    """
+
+    def __init__(self, coordinate_data):
+        """
+        Sorts the labels.
+
+        Args:
+            coordinate_data (HintBoxes or list): The labelled boxes, or their
+                (label, [x, y, w, h]) pairs.
+        """
+        hints = HintBoxes.from_pairs(coordinate_data)
+        keys = np.char.lower(hints.labels)
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.boxes = hints.boxes[order]
+        self.scores = hints.scores[order]
+        self.typed = ""
+        self.ranges = [(0, len(self.keys))]
+
+    def narrow(self, char):
+        """
+        Keeps the labels whose next letter is the typed character.
+
+        Args:
+            char (str): The typed character, matched regardless of case.
+        """
+        start, end = self.ranges[-1]
+        char = char.lower()
+        prefix = self.typed + char
+        # Matching labels lie between the prefix and the prefix with the next character.
+        keys = self.keys[start:end]
+        first, last = np.searchsorted(
+            keys, [prefix.encode(), (self.typed + chr(ord(char) + 1)).encode()]
+        ).tolist()
+        self.typed = prefix
+        self.ranges.append((start + first, start + last))
+
+    def back(self):
+        """Forgets the last typed character, doing nothing when none was typed."""
+        if len(self.ranges) > 1:
+            self.ranges.pop()
+            self.typed = self.typed[:-1]
+
+    def matches(self):
+        """
+        Returns the matching boxes, labelled with what is left to type.
+
+        Returns:
+            HintBoxes: The matching boxes, in sorted order.
+        """
+        start, end = self.ranges[-1]
+        width = self.keys.dtype.itemsize
+        typed = len(self.typed)
+        if typed >= width:
+            rests = np.zeros(end - start, "S1")
+        else:
+            codes = self.keys[start:end].view(np.uint8).reshape(-1, width)
+            rests = np.ascontiguousarray(codes[:, typed:]).view(f"S{width - typed}")
+        return HintBoxes(
+            self.boxes[start:end], rests.reshape(-1), self.scores[start:end]
+        )
@@ -0,0 +1,196 @@
+"""Stores the Hotkeys class looking up the activation of each key the listener sees."""
+import os
+import json
+
+# The keys of each modifier, by the names of the listener's special keys.
+MODIFIERS = {
+    "alt": ("alt", "alt_l", "alt_r"),
+    "ctrl": ("ctrl", "ctrl_l", "ctrl_r"),
+    "shift": ("shift", "shift_l", "shift_r"),
+    "cmd": ("cmd", "cmd_l", "cmd_r"),
+}
+
+# The arguments of `GUI.run` that an action may set, and their default values.
+OPTIONS = {"clicks": 1, "button": "left", "scroll_distance": None, "region": None}
+
+# The default actions, by combination of modifiers and a character.
+BINDINGS = {
+    "alt+a": {"clicks": 1, "button": "left"},
+    "alt+s": {"clicks": 1, "button": "right"},
+    "alt+d": {"clicks": 2, "button": "left"},
+    "alt+w": {"clicks": 0, "button": None, "scroll_distance": 5},
+    "alt+x": {"clicks": 0, "button": None, "scroll_distance": -5},
+    "alt+r": {"clicks": 1, "button": "left", "region": (600, 400)},
+}
+
+
+class Hotkeys:
+    """
+    The `Hotkeys` class turns the keys seen by the system-wide listener into
+    activations, through tables built once from the bindings, so the keys typed
+    outside of KeyFlare are rejected in constant time and without allocating.
+
+    Attributes:
+        keys (type): The enumeration of the listener's special keys, such as
+            `pynput.keyboard.Key`, which the modifiers are members of.
+        bindings (dict): The options of `GUI.run` of each action, by combination,
+            such as "alt+a", with every option filled in.
+        bits (dict): The bit of the modifier of each special key.
+        tables (list): The action of each lowercase and uppercase character,
+            by bit mask of the modifiers held.
+        held (int): The bit mask of the modifiers held.
+
+    Methods:
+        - from_environment(keys, value): Creates the hotkeys that `KEYFLARE_HOTKEYS` asks for.
+        - parsing(combination): Splits a combination into its bit mask and character.
+        - pressing(key): Returns the action of a pressed key, or None.
+        - releasing(key): Forgets a released modifier.
+
+    Notes:
+        - A press is one `isinstance` check, then either a lookup of the special
+          key's bit, or, for characters, a check of `held` and a lookup in the
+          table of the modifiers held. Typing without modifiers stops at the check.
+        - Actions are the bindings' dictionaries themselves, so a press allocates
+          nothing, and repeating a combination hands over the same action.
+        - Holding either of a modifier's keys sets its bit, and releasing either
+          clears it.
+
+    Example:
+        >>> hotkeys = Hotkeys(keyboard.Key, {"ctrl+alt+k": {"clicks": 2}})
+        >>> hotkeys.pressing(keyboard.Key.ctrl_l), hotkeys.pressing(keyboard.Key.alt)
+        (None, None)
+        >>> hotkeys.pressing(keyboard.KeyCode(char="k"))
+        {'clicks': 2, 'button': 'left', 'scroll_distance': None, 'region': None}
+    """
+
+    def __init__(self, keys, bindings=None):
+        """
+        Builds the tables of the bindings.
+
+        Args:
+            keys (type): The enumeration of the listener's special keys.
+            bindings (dict, optional): The options of `GUI.run` of each action,
+                by combination, where None uses `BINDINGS` (default is None).
+
+        Raises:
+            ValueError: If a combination or an option is not understood.
+        """
+        self.keys = keys
+        self.bindings = {}
+        self.bits = {}
+        self.tables = [{} for _ in range(1 << len(MODIFIERS))]
+        self.held = 0
+        for index, names in enumerate(MODIFIERS.values()):
+            for name in names:
+                if hasattr(keys, name):
+                    self.bits[getattr(keys, name)] = 1 << index
+        for combination, options in (
+            BINDINGS if bindings is None else bindings
+        ).items():
+            unknown = set(options) - set(OPTIONS)
+            if unknown:
+                raise ValueError(
+                    f"Unknown options for {combination}: {sorted(unknown)}"
+                )
+            action = {**OPTIONS, **options}
+            if action["region"] is not None:
+                action["region"] = tuple(action["region"])
+            mask, char = self.parsing(combination)
+            self.tables[mask][char] = self.tables[mask][char.upper()] = action
+            self.bindings[combination] = action
+
+    @classmethod
+    def from_environment(cls, keys, value=None):
+        """
+        Creates the hotkeys that the `KEYFLARE_HOTKEYS` environment variable asks for.
+
+        Args:
+            keys (type): The enumeration of the listener's special keys.
+            value (str, optional): The value to read instead of the environment
+                variable's (default is None).
+
+        Returns:
+            Hotkeys: The default bindings for no value or "", otherwise those
+                updated by the JSON file of that path, where a combination bound
+                to null is removed.
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If the file is not JSON, or a binding is not understood.
+
+        Example:
+            ```sh
+            echo '{"alt+a": null, "alt+q": {"clicks": 3}}' > ~/.keyflare.json
+            KEYFLARE_HOTKEYS=~/.keyflare.json keyflare
+            ```
+        """
+        if value is None:
+            value = os.environ.get("KEYFLARE_HOTKEYS", "")
+        bindings = dict(BINDINGS)
+        if value.strip():
+            with open(os.path.expanduser(value.strip()), encoding="utf-8") as file:
+                bindings.update(json.load(file))
+        return cls(
+            keys,
+            {
+                combination: options
+                for combination, options in bindings.items()
+                if options is not None
+            },
+        )
+
+    @staticmethod
+    def parsing(combination):
+        """
+        Splits a combination into the bit mask of its modifiers and its character.
+
+        Args:
+            combination (str): Modifiers and a character joined by "+", such as "alt+a".
+
+        Returns:
+            tuple: The bit mask of the modifiers and the lowercase character.
+
+        Raises:
+            ValueError: If a modifier is unknown, there is none, or the last part
+                is not one character.
+        """
+        *modifiers, char = combination.lower().split("+")
+        if len(char) != 1:
+            raise ValueError(f"{combination} does not end with one character")
+        if not modifiers:
+            raise ValueError(
+                f"{combination} has no modifier, so typing would trigger it"
+            )
+        mask = 0
+        for modifier in modifiers:
+            if modifier not in MODIFIERS:
+                raise ValueError(f"Unknown modifier {modifier} in {combination}")
+            mask |= 1 << list(MODIFIERS).index(modifier)
+        return mask, char
+
+    def pressing(self, key):
+        """
+        Returns the action of a pressed key, remembering the modifiers held.
+
+        Args:
+            key: The key given by the listener, a special key or a character's key.
+
+        Returns:
+            dict: The options of `GUI.run` to activate with, or None.
+        """
+        if isinstance(key, self.keys):
+            self.held |= self.bits.get(key, 0)
+            return None
+        if not self.held:
+            return None
+        return self.tables[self.held].get(getattr(key, "char", None))
+
+    def releasing(self, key):
+        """
+        Forgets a released modifier.
+
+        Args:
+            key: The key given by the listener.
+        """
+        if isinstance(key, self.keys):
+            self.held &= ~self.bits.get(key, 0)
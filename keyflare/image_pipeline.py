@@ -1,15 +1,49 @@
 """Stores the ImagePipeline class for processing the image."""
 import string
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import numpy as np
 import cv2
-from rtree import index
 from .system import System
+from .cache import ResultCache
+from .frames import FrameBuffer, frame_fingerprint
+from .hints import HintIndex, hint_codes
+from .results import HintBoxes
+from .instruments import Instruments
+from .suppression import suppress_overlaps
+from .tiles import (
+    changed_tiles,
+    cut_by_region,
+    grow_region,
+    inside_region,
+    merge_regions,
+    merge_tile_boxes,
+    shrink_region,
+    split_tiles,
+    tile_regions,
+)
+
+
+@lru_cache(maxsize=None)
+def channel_gray_tables():
+    """
+    Builds lookup tables giving each channel's share of `cv2.COLOR_RGB2GRAY`.
+    Applying table i to channel i with `cv2.LUT` equals converting an image
+    holding only that channel to grey, without merging full-frame zeroed images.
 
-try:
-    import pytesseract
-except ImportError:
-    pass
+    Returns:
+        list: Three (256, 1) uint8 lookup tables, one per channel.
+    """
+    ramp = np.arange(256, dtype=np.uint8).reshape(-1, 1)
+    zeros = np.zeros_like(ramp)
+    return [
+        cv2.cvtColor(
+            cv2.merge([ramp if i == channel else zeros for i in range(3)]),
+            cv2.COLOR_RGB2GRAY,
+        )
+        for channel in range(3)
+    ]
 
 
 class ImagePipeline:
@@ -24,14 +58,51 @@ class ImagePipeline:
     Attributes:
         original_image (None):
             A placeholder for the original screenshot image.
-        coordinate_data (list): A list to store coordinate data,
-            including bounding boxes of clickable areas.
-        x (System): An instance of the `System` class used for capturing screenshots.
+        coordinate_data (HintBoxes): The labelled boxes of clickable areas, which
+            processing_image leaves as an (N, 4) int32 array of unlabelled boxes.
+        x (System): An instance of the `System` class used for capturing screenshots,
+            created on first use so that creating a pipeline does not import PyAutoGUI.
+        suppression (str): The engine removing overlapping boxes,
+            either "numpy" (vectorized) or "rtree" (the original R-tree loop).
+        extraction (str): The engine extracting bounding boxes, either "contours"
+            (outer contours) or "components" (connected component statistics).
+        workers (int or None): The number of threads processing the slow mode's images.
+        incremental (bool): Whether to only process the tiles that changed
+            since the previous screenshot, reusing the boxes of the others.
+        tile_size (int): The side in pixels of the tiles compared between screenshots.
+        tile_border (int): The pixels processed around changed tiles.
+        scale (float or str): The factor shrinking the screenshot before detection,
+            or "auto" to shrink screenshots taller than 1080 pixels to about 1080.
+        tiling (int or None): The side in pixels of the tiles that large screenshots
+            are split into and processed in parallel, or None to process them whole.
+        tiling_overlap (int): The pixels each tile overlaps its neighbours by.
+        tile_margin (int): The pixels near the edge of a tile or changed region
+            where boxes are unreliable, before any downscaling.
+        hints (HintIndex): The labels of coordinate_data, sorted for narrowing them
+            down as they are typed.
+        frames (FrameBuffer): The screenshot and the full-frame images derived from it,
+            allocated once per resolution and reused by every activation.
+        instruments (Instruments): The timings of each activation's stages,
+            recorded when enabled.
+        speculation (Speculation): The boxes detected in the background, used
+            by `run` when its screenshot is unchanged, or None.
+        cache (ResultCache): The boxes of the latest distinct screens that `run`
+            detected, by fingerprint and settings, or None.
+        region (tuple): The (left, top, width, height) part of the screenshot that
+            boxes are detected in, or None for the whole screenshot.
 
     Methods:
-        - run(): Executes the image processing pipeline.
+        - run(region): Executes the image processing pipeline.
         - processing_image(): Extracts contours from the
             original image into the coordinate_data.
+        - detecting_image(image, slow): Extracts the bounding boxes of a colour image,
+            in tiles if needed.
+        - detecting_boxes(image, slow): Extracts the bounding boxes of a colour image.
+        - detecting_changes(slow): Extracts the bounding boxes of the tiles that changed.
+        - edge_margin(): Gives the pixels near a tile's edge where boxes are unreliable.
+        - detection_scale(): Chooses how much to shrink the image before detection.
+        - detection_settings(): Gives the settings that the boxes found depend on.
+        - extracting_boxes(image): Extracts the bounding boxes of one grey image.
         - processing_data(): Processes coordinate data to
             remove overlapping boxes and label the remaining boxes, recycling coordinate_data.
 
@@ -48,18 +119,102 @@ class ImagePipeline:
     """
 
     original_image = None
-    coordinate_data = []
-    x = System()
+    coordinate_data = None
+    _x = None
+    suppression = "numpy"
+    extraction = "contours"
+    workers = None
+    incremental = False
+    tile_size = 128
+    tile_border = 16
+    scale = 1.0
+    tiling = None
+    tiling_overlap = 64
+    tile_margin = 8
+    frames = None
+    hints = None
+    instruments = None
+    speculation = None
+    cache = None
+    region = None
+
+    def __init__(
+        self,
+        suppression="numpy",
+        extraction="contours",
+        workers=None,
+        incremental=False,
+        scale=1.0,
+        tiling=None,
+        frames=None,
+        instruments=None,
+        cache=8,
+    ):
+        """
+        Defines some variables to be used later
 
-    def __init__(self):
-        """Defines some variables to be used later"""
+        Args:
+            suppression (str, optional): The engine removing overlapping boxes,
+                either "numpy" or "rtree" (default is "numpy").
+            extraction (str, optional): The engine extracting bounding boxes,
+                either "contours" or "components" (default is "contours").
+            workers (int, optional): The number of threads processing the slow
+                mode's images, where None lets Python choose (default is None).
+            incremental (bool, optional): Whether to only process the tiles that
+                changed since the previous screenshot (default is False).
+            scale (float or str, optional): The factor shrinking the screenshot
+                before detection, or "auto" to choose it from the screenshot's
+                height (default is 1.0).
+            tiling (int, optional): The side in pixels of the tiles that large
+                screenshots are split into for detection, where None does not
+                split them (default is None).
+            frames (FrameBuffer, optional): The arrays to reuse across activations,
+                where None starts a new `FrameBuffer` (default is None).
+            instruments (Instruments, optional): Where the stages are recorded,
+                where None follows the `KEYFLARE_PROFILE` environment variable
+                (default is None).
+            cache (int, optional): The number of distinct screens whose boxes `run`
+                keeps, where 0 keeps none (default is 8).
+        """
+        self.suppression = suppression
+        self.extraction = extraction
+        self.workers = workers
+        self.incremental = incremental
+        self.scale = scale
+        self.tiling = tiling
+        self.frames = FrameBuffer() if frames is None else frames
+        self.instruments = (
+            Instruments.from_environment() if instruments is None else instruments
+        )
+        self.cache = ResultCache(cache) if cache else None
+        self.previous_image = None
+        self.previous_boxes = None
+        self.previous_settings = None
         self.coordinate_data = []
         self.original_image = None
         self.converted_image = None
         self.processed_image = None
         self.collecting_data = None
+        self.hints = None
+        self.region = None
+
+    @property
+    def x(self):
+        """
+        The `System` capturing the screenshots, created when first used.
+
+        Returns:
+            System: The system, with its default capture backend unless one was set.
+        """
+        if self._x is None:
+            self._x = System()
+        return self._x
+
+    @x.setter
+    def x(self, system):
+        self._x = system
 
-    def run(self):
+    def run(self, region=None):
         """
         Executes the image processing pipeline. This method
         starts the image processing pipeline after taking a screenshot.
@@ -67,14 +222,31 @@ class ImagePipeline:
         which is then displayed through the GUI class.
 
         Args:
-            slow
+            region (tuple, optional): The (left, top, width, height) part of the
+                screenshot to detect boxes in, where None detects them in the
+                whole screenshot (default is None).
 
         Returns:
             None
 
         Notes:
             - The method relies on the `System` class for capturing the original image.
+            - The screenshot is written into the previous activation's array when
+              the backend allows it, so `original_image` is overwritten by the next run.
             - The processed results can be accessed using the class's attributes.
+            - The "capture", "detection", "suppression" and "labelling" stages
+              are recorded by `instruments` when enabled.
+            - With a `cache` or a `speculation`, the screenshot's fingerprint is
+              looked up in the cache, then compared with that of the boxes detected
+              in the background, in the "fingerprint" stage. Boxes found either way
+              are used instead of detecting, and kept in the cache, but only if they
+              were found with the same `detection_settings()`.
+            - With a region, the whole screen is still captured and shown, but
+              only the region is detected, so fewer and shorter labels are found
+              sooner. Regions, such as those around the pointer, rarely repeat, so
+              their boxes are neither looked up nor kept in the cache, which
+              keeps the whole screens it exists for. The background detection
+              covers the whole screen, so it is not used for a region either.
 
         Example:
             >>> pipeline = ImagePipeline()
@@ -83,9 +255,36 @@ class ImagePipeline:
             >>> print(len(coordinate_data))  # Output: Number of clickable places found
         """
         self.coordinate_data = []
-        self.original_image = self.x.image()
-        self.processing_image()
+        self.region = None if region is None else tuple(region)
+        self.instruments.begin()
+        with self.instruments.stage("capture"):
+            self.original_image = self.frames.fill(
+                "screenshot", lambda out: self.x.image(out=out)
+            )
+        key = None
+        if self.region is None and (
+            self.cache is not None or self.speculation is not None
+        ):
+            with self.instruments.stage("fingerprint"):
+                found = None
+                fingerprint = frame_fingerprint(self.original_image)
+                settings = self.detection_settings()
+                key = (fingerprint, settings)
+                if self.cache is not None:
+                    found = self.cache.get(key)
+                if found is None and self.speculation is not None:
+                    found = self.speculation.result(fingerprint, settings)
+            if found is not None:
+                self.hints = HintIndex(found)
+                self.coordinate_data = self.hints.matches()
+                if self.cache is not None:
+                    self.cache.put(key, found)
+                return
+        with self.instruments.stage("detection"):
+            self.processing_image()
         self.processing_data()
+        if self.cache is not None and key is not None:
+            self.cache.put(key, self.coordinate_data)
 
     def processing_image(self, slow=False):
         """
@@ -105,8 +304,15 @@ class ImagePipeline:
 
         Notes:
             - This method is a part of the image processing pipeline.
+            - With slow, the grey, red, green, blue and equalized images are
+              derived and processed in a thread pool of `workers` threads,
+              since OpenCV releases the GIL. The boxes are always combined
+              in that order, whatever order the threads finish in.
             - It uses OpenCV (cv2) functions for image manipulation.
-            - The results are stored in the class's `coordinate_data`.
+            - The results are stored in the class's `coordinate_data`
+              as an (N, 4) int32 array, one row per bounding box.
+            - With a `region`, only that part of the screenshot is processed,
+              whole, and its boxes are moved back to the screenshot's coordinates.
 
         Example:
             >>> pipeline = ImagePipeline()
@@ -116,36 +322,323 @@ class ImagePipeline:
             >>> coordinate_data = pipeline.coordinate_data
             >>> print(len(coordinate_data))  # Output: Number of extracted bounding boxes
         """
-        gray = cv2.cvtColor(self.original_image, cv2.COLOR_BGR2GRAY)
-        images = [gray]
-        if slow:
-            bsplit, gsplit, rsplit = cv2.split(self.original_image)
-            red = cv2.merge([bsplit * 0, gsplit * 0, rsplit])
-            green = cv2.merge([bsplit * 0, gsplit, rsplit * 0])
-            blue = cv2.merge([bsplit, gsplit * 0, rsplit * 0])
-            gray_red = cv2.cvtColor(red, cv2.COLOR_RGB2GRAY)
-            gray_green = cv2.cvtColor(green, cv2.COLOR_RGB2GRAY)
-            gray_blue = cv2.cvtColor(blue, cv2.COLOR_RGB2GRAY)
-            equalized = cv2.equalizeHist(gray)
-            images += [gray_red, gray_green, gray_blue, equalized]
-        for image in images:
-            threshold = cv2.adaptiveThreshold(
-                image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, 11, 2
+        if self.region is not None:
+            left, top, width, height = (int(value) for value in self.region)
+            right, bottom = left + width, top + height
+            left, top = max(left, 0), max(top, 0)
+            boxes = self.detecting_image(
+                self.original_image[top:bottom, left:right], slow
             )
-            original_contours, _ = cv2.findContours(
-                threshold, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
+            boxes[:, :2] += (left, top)
+        elif self.incremental:
+            boxes = self.detecting_changes(slow)
+        else:
+            boxes = self.detecting_image(self.original_image, slow, self.frames)
+        self.coordinate_data = np.concatenate(
+            [np.asarray(self.coordinate_data, dtype=np.int32).reshape(-1, 4), boxes]
+        )
+
+    def detecting_image(self, image, slow=False, frames=None):
+        """
+        Extracts the bounding boxes of a colour image, splitting it into overlapping
+        tiles processed by a pool of `workers` threads when `tiling` is set.
+
+        Args:
+            image (np.ndarray): A colour image, the screenshot or part of it.
+            slow (bool): Increases the number and variety of images to process
+            frames (FrameBuffer, optional): The arrays to derive images into when the
+                image is processed whole, where None allocates them (default is None).
+
+        Returns:
+            np.ndarray: An (N, 4) int32 array of [x, y, w, h] bounding boxes.
+
+        Notes:
+            - Each tile is a view of the image and only the tiles being processed
+              hold derived images, so the memory used does not grow with the image.
+            - Boxes cut by a tile's edge are joined with those of neighbouring tiles,
+              and boxes found in several overlapping tiles are kept once.
+
+        Example:
+            >>> pipeline = ImagePipeline(tiling=1024)
+            >>> boxes = pipeline.detecting_image(pipeline.x.image())
+        """
+        height, width = image.shape[:2]
+        if not self.tiling or (height <= self.tiling and width <= self.tiling):
+            return self.detecting_boxes(image, slow, frames)
+        extents = split_tiles(image.shape, self.tiling, self.tiling_overlap)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            tile_boxes = list(
+                pool.map(
+                    lambda extent: self.detecting_boxes(
+                        image[extent[1] : extent[3], extent[0] : extent[2]], slow
+                    ),
+                    extents,
+                )
             )
-            kernel = np.ones((1, 2), np.uint8)
-            dilated = cv2.dilate(threshold, kernel, iterations=1)
-            processed_contours, _ = cv2.findContours(
-                dilated, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
+        return merge_tile_boxes(tile_boxes, extents, image.shape, self.edge_margin())
+
+    def detecting_boxes(self, image, slow=False, frames=None):
+        """
+        Extracts the bounding boxes of a colour image, deriving the grey images
+        to process from it.
+
+        Args:
+            image (np.ndarray): A colour image, the screenshot or part of it.
+            slow (bool): Increases the number and variety of images to process
+            frames (FrameBuffer, optional): The arrays to derive images into,
+                where None allocates them (default is None).
+
+        Returns:
+            np.ndarray: An (N, 4) int32 array of [x, y, w, h] bounding boxes.
+
+        Notes:
+            - When `detection_scale()` is below 1, the image is shrunk before
+              processing and the boxes are mapped back to the image's coordinates.
+            - Every derived image is written into its own array of `frames`,
+              so the threads of the slow mode never share an output.
+        """
+        frames = FrameBuffer(reuse=False) if frames is None else frames
+        height, width = image.shape[:2]
+        scale = self.detection_scale()
+        if scale < 1:
+            image = cv2.resize(
+                image,
+                None,
+                fx=scale,
+                fy=scale,
+                interpolation=cv2.INTER_AREA,
+                dst=frames.get(
+                    "scaled",
+                    (round(height * scale), round(width * scale)) + image.shape[2:],
+                ),
             )
-            for cnt in processed_contours:
-                x, y, w, h = cv2.boundingRect(cnt)
-                self.coordinate_data.append([x, y, w, h])
-            for cnt in original_contours:
-                x, y, w, h = cv2.boundingRect(cnt)
-                self.coordinate_data.append([x, y, w, h])
+        gray = cv2.cvtColor(
+            image, cv2.COLOR_BGR2GRAY, dst=frames.get("gray", image.shape[:2])
+        )
+        derivations = [("gray", lambda: gray)]
+        if slow:
+            tables = channel_gray_tables()
+
+            def channel_gray(channel):
+                extracted = cv2.extractChannel(
+                    image, channel, dst=frames.get(f"channel{channel}", gray.shape)
+                )
+                return cv2.LUT(extracted, tables[channel], dst=extracted)
+
+            derivations += [
+                ("channel2", lambda: channel_gray(2)),
+                ("channel1", lambda: channel_gray(1)),
+                ("channel0", lambda: channel_gray(0)),
+                (
+                    "equalized",
+                    lambda: cv2.equalizeHist(
+                        gray, dst=frames.get("equalized", gray.shape)
+                    ),
+                ),
+            ]
+        if len(derivations) > 1 and self.workers != 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                boxes = list(
+                    pool.map(
+                        lambda derivation: self.extracting_boxes(
+                            derivation[1](), frames, derivation[0]
+                        ),
+                        derivations,
+                    )
+                )
+        else:
+            boxes = [
+                self.extracting_boxes(derive(), frames, name)
+                for name, derive in derivations
+            ]
+        boxes = np.concatenate(boxes)
+        if scale < 1:
+            corners = boxes.astype(np.float64) / scale
+            left = np.floor(corners[:, 0]).clip(0, width)
+            top = np.floor(corners[:, 1]).clip(0, height)
+            right = np.ceil(corners[:, 0] + corners[:, 2]).clip(0, width)
+            bottom = np.ceil(corners[:, 1] + corners[:, 3]).clip(0, height)
+            boxes = np.column_stack([left, top, right - left, bottom - top])
+            boxes = boxes.astype(np.int32)
+        return boxes
+
+    def edge_margin(self):
+        """
+        Gives the pixels near the edge of a tile or region where boxes are unreliable,
+        because the adaptive threshold's block and the dilation reach past the edge.
+
+        Args:
+            None
+
+        Returns:
+            int: The margin in the screenshot's pixels, at least 1.
+        """
+        return int(np.ceil(self.tile_margin / self.detection_scale()))
+
+    def detection_scale(self):
+        """
+        Chooses how much to shrink the original image before detection.
+        The adaptive threshold's 11 pixel block suits 1080p screenshots, so
+        with a `scale` of "auto", taller screenshots are shrunk to about 1080 pixels.
+
+        Args:
+            None
+
+        Returns:
+            float: The factor applied to the image's sides, at most 1.
+
+        Example:
+            >>> pipeline = ImagePipeline(scale="auto")
+            >>> pipeline.original_image = np.zeros((2160, 3840, 3), np.uint8)
+            >>> pipeline.detection_scale()
+            0.5
+        """
+        if self.scale == "auto":
+            return min(1.0, 1080 / self.original_image.shape[0])
+        return min(1.0, float(self.scale))
+
+    def detection_settings(self):
+        """
+        Gives the settings that the boxes found on a screenshot depend on.
+
+        Args:
+            None
+
+        Returns:
+            tuple: The suppression and extraction engines, the scale and the tiling.
+        """
+        return (self.suppression, self.extraction, self.scale, self.tiling)
+
+    def detecting_changes(self, slow=False):
+        """
+        Extracts the bounding boxes of the original image, only processing the tiles
+        that changed since the previous call and reusing the boxes of the others.
+
+        Args:
+            slow (bool): Increases the number and variety of images to process
+
+        Returns:
+            np.ndarray: An (N, 4) int32 array of [x, y, w, h] bounding boxes.
+
+        Notes:
+            - Neighbouring changed tiles are grouped, and each group is processed
+              with a border of `tile_border` pixels, widened further to hold any
+              previous box up to four tiles wide and tall that it touches,
+              so boxes crossing its edge are found whole.
+            - Previous boxes inside a processed region are replaced by its new boxes,
+              except near the region's edge, where new boxes may have been cut.
+            - The whole image is processed again when there is no previous image,
+              its size or the settings changed, or over half of the tiles changed.
+            - In slow mode, a region's equalized image uses that region's histogram.
+
+        Example:
+            >>> pipeline = ImagePipeline(incremental=True)
+            >>> pipeline.run()  # Processes the whole screenshot
+            >>> pipeline.run()  # Only processes the tiles that changed
+        """
+        image = self.original_image
+        settings = (image.shape, slow, self.extraction, self.scale, self.tiling)
+        if self.previous_image is None or self.previous_settings != settings:
+            boxes = self.detecting_image(image, slow, self.frames)
+            self.previous_image = image.copy()
+        else:
+            dirty = changed_tiles(image, self.previous_image, self.tile_size)
+            if dirty.mean() > 0.5:
+                boxes = self.detecting_image(image, slow, self.frames)
+            else:
+                boxes = self.previous_boxes
+                regions = merge_regions(
+                    [
+                        grow_region(
+                            region,
+                            self.tile_border,
+                            boxes,
+                            image.shape,
+                            4 * self.tile_size,
+                        )
+                        for region in tile_regions(dirty, self.tile_size, image.shape)
+                    ]
+                )
+                for region in regions:
+                    left, top, right, bottom = region
+                    found = self.detecting_image(image[top:bottom, left:right], slow)
+                    margin = self.edge_margin()
+                    found = found[~cut_by_region(found, region, image.shape, margin)]
+                    found[:, :2] += (left, top)
+                    inner = shrink_region(region, margin, image.shape)
+                    boxes = np.concatenate([boxes[~inside_region(boxes, inner)], found])
+            np.copyto(self.previous_image, image)
+        self.previous_settings = settings
+        self.previous_boxes = boxes
+        return boxes
+
+    def extracting_boxes(self, image, frames=None, name="gray"):
+        """
+        Extracts the bounding boxes of one grey image after adaptive thresholding,
+        both with and without dilation, using the engine chosen by the `extraction` attribute.
+
+        Args:
+            image (np.ndarray): A single channel image.
+            frames (FrameBuffer, optional): The arrays to threshold and dilate into,
+                where None allocates them (default is None).
+            name (str, optional): The name of the grey image, which names the arrays
+                used for it in frames (default is "gray").
+
+        Returns:
+            np.ndarray: An (N, 4) int32 array of [x, y, w, h] bounding boxes,
+                the dilated image's boxes followed by the thresholded image's boxes.
+
+        Raises:
+            ValueError: If the `extraction` attribute names an unknown engine.
+
+        Notes:
+            - The "contours" engine takes the bounding rectangle of every outer contour.
+            - The "components" engine reads the boxes straight from the statistics
+              of `cv2.connectedComponentsWithStats`, without a Python-level loop.
+              Unlike outer contours, it also finds shapes enclosed by other shapes.
+            - Both passes share the thresholded image.
+
+        Example:
+            >>> pipeline = ImagePipeline(extraction="components")
+            >>> gray = cv2.cvtColor(pipeline.x.image(), cv2.COLOR_BGR2GRAY)
+            >>> boxes = pipeline.extracting_boxes(gray)
+        """
+        frames = FrameBuffer(reuse=False) if frames is None else frames
+        threshold = cv2.adaptiveThreshold(
+            image,
+            255,
+            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+            cv2.THRESH_BINARY_INV,
+            11,
+            2,
+            dst=frames.get(f"{name} threshold", image.shape),
+        )
+        kernel = np.ones((1, 2), np.uint8)
+        dilated = cv2.dilate(
+            threshold,
+            kernel,
+            dst=frames.get(f"{name} dilated", image.shape),
+            iterations=1,
+        )
+        if self.extraction == "components":
+            passes = [
+                cv2.connectedComponentsWithStats(mask, connectivity=8)[2][1:, :4]
+                for mask in (dilated, threshold)
+            ]
+        elif self.extraction == "contours":
+            passes = []
+            for mask in (dilated, threshold):
+                contours, _ = cv2.findContours(
+                    mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
+                )
+                passes.append(
+                    np.array(
+                        [cv2.boundingRect(cnt) for cnt in contours], dtype=np.int32
+                    ).reshape(-1, 4)
+                )
+        else:
+            raise ValueError(f"Unknown extraction engine: {self.extraction}")
+        return np.concatenate(passes).astype(np.int32, copy=False)
 
     def processing_data(self):
         """
@@ -153,11 +646,12 @@ class ImagePipeline:
 
         This method processes the coordinate data extracted
         from the image processing step. It includes the following steps:
-        1. Index the coordinate_data, which technically
-           holds bounding boxes before this step,
-           into the R-tree spatial indexing algorithm.
-        2. Remove overlapping bounding boxes.
-        3. Labeling the remaining bounding boxes alphabetically.
+        1. Remove overlapping bounding boxes from the coordinate_data,
+           which technically holds bounding boxes before this step,
+           with the engine chosen by the `suppression` attribute.
+        2. Labeling the remaining bounding boxes, with labels that are
+           computed from each box's index and no label being the start of another.
+        3. Indexing the labels in `hints`, with coordinate_data in its sorted order.
 
         Args:
             None
@@ -165,8 +659,12 @@ class ImagePipeline:
         Returns:
             None
 
+        Raises:
+            ValueError: If the `suppression` attribute names an unknown engine.
+
         Notes:
-            - It uses the R-tree spatial index for efficient data manipulation.
+            - The "numpy" engine batches the work that the "rtree" engine
+              does with one R-tree query per box.
             - This method is a part of the image processing pipeline.
             - The results are stored in the class's `coordinate_data` attribute.
 
@@ -182,6 +680,43 @@ class ImagePipeline:
               by 10 pixels on any side of the box, it is added to a list to be removed.
               An adaptive method designed to get a specific number of boxes would work better.
         """
+        with self.instruments.stage("suppression"):
+            boxes = np.asarray(self.coordinate_data, dtype=np.int32).reshape(-1, 4)
+            if self.suppression == "rtree":
+                kept = self.rtree_suppression()
+            elif self.suppression == "numpy":
+                kept = suppress_overlaps(boxes)
+            else:
+                raise ValueError(f"Unknown suppression engine: {self.suppression}")
+            boxes = boxes[kept]
+        with self.instruments.stage("labelling"):
+            self.hints = HintIndex(HintBoxes(boxes, hint_codes(len(boxes))))
+        self.coordinate_data = self.hints.matches()
+
+    def rtree_suppression(self):
+        """
+        Removes overlapping bounding boxes from the coordinate data with an R-tree.
+        Each box, swept in index order while it has not been removed itself,
+        removes every box within 10 pixels of it whose area is larger by 5 or more.
+
+        Args:
+            None
+
+        Returns:
+            list: The indices of the boxes in coordinate_data that were kept.
+
+        Notes:
+            - Boxes with an area of 15 or less are ignored.
+            - `suppress_overlaps` from the suppression module gives the same boxes.
+
+        Example:
+            >>> pipeline = ImagePipeline(suppression="rtree")
+            >>> pipeline.original_image = pipeline.x.image()
+            >>> pipeline.processing_image()
+            >>> kept = pipeline.rtree_suppression()
+        """
+        from rtree import index  # pylint: disable=import-outside-toplevel
+
         properties = index.Property()
         properties.dimension = 2
         properties.dat_extension = "data"
@@ -192,9 +727,12 @@ class ImagePipeline:
         properties.leaf_capacity = 100
         properties.fill_factor = 0.1
         rt = index.Index(properties=properties)
+        data = np.asarray(self.coordinate_data, dtype=np.int32).reshape(-1, 4).tolist()
         boxes_to_remove = set()
-        for i, data_point in enumerate(self.coordinate_data):
+        inserted = []
+        for i, data_point in enumerate(data):
             if data_point[2] * data_point[3] > 15:
+                inserted.append(i)
                 rt.insert(
                     i,
                     (
@@ -204,78 +742,36 @@ class ImagePipeline:
                         data_point[1] + data_point[3],
                     ),
                 )
-        for i in rt.intersection(
-            (float("-inf"), float("-inf"), float("inf"), float("inf"))
-        ):
+        for i in inserted:
             if i not in boxes_to_remove:
                 intersectingindices = list(
                     rt.intersection(
                         (
-                            self.coordinate_data[i][0] - 10,
-                            self.coordinate_data[i][1] - 10,
-                            self.coordinate_data[i][0]
-                            + self.coordinate_data[i][2]
-                            + 10,
-                            self.coordinate_data[i][1]
-                            + self.coordinate_data[i][3]
-                            + 10,
+                            data[i][0] - 10,
+                            data[i][1] - 10,
+                            data[i][0] + data[i][2] + 10,
+                            data[i][1] + data[i][3] + 10,
                         )
                     )
                 )
                 if len(intersectingindices) > 1:
                     for j in intersectingindices:
                         if i != j:
-                            if (
-                                self.coordinate_data[i][2] * self.coordinate_data[i][3]
-                            ) <= self.coordinate_data[j][2] * self.coordinate_data[j][
-                                3
-                            ] - 5:
+                            if (data[i][2] * data[i][3]) <= data[j][2] * data[j][3] - 5:
                                 boxes_to_remove.add(j)
         for i in boxes_to_remove:
             rt.delete(
                 i,
                 (
-                    self.coordinate_data[i][0],
-                    self.coordinate_data[i][1],
-                    self.coordinate_data[i][0] + self.coordinate_data[i][2],
-                    self.coordinate_data[i][1] + self.coordinate_data[i][3],
+                    data[i][0],
+                    data[i][1],
+                    data[i][0] + data[i][2],
+                    data[i][1] + data[i][3],
                 ),
             )
-        allitems = []
-        for item in rt.intersection(
-            (float("-inf"), float("-inf"), float("inf"), float("inf"))
-        ):
-            allitems.append(self.coordinate_data[item])
-        self.coordinate_data = allitems
-
-        def generate_alphabet_strings(
-            length, current_string="", alphabet="etaoinsrhlcdumfpwybgvkxjqz"
-        ):
-            if length == 1:
-                for letter in alphabet:
-                    yield current_string + letter
-            else:
-                for letter in alphabet:
-                    yield from generate_alphabet_strings(
-                        length - 1, current_string + letter, alphabet
-                    )
-
-        def list_aphabet_strings(items):
-            num_items = len(items)
-            alphabet_length = 26
-            string_length = 1
-
-            while alphabet_length**string_length <= num_items:
-                string_length += 1
-
-            alphabet_strings = list(generate_alphabet_strings(string_length))[
-                :num_items
-            ]
-
-            return list(zip(alphabet_strings, items))
-
-        tomap = [[item[0], item[1], item[2], item[3]] for item in self.coordinate_data]
-        self.coordinate_data = list_aphabet_strings(tomap)
+        return list(
+            rt.intersection((float("-inf"), float("-inf"), float("inf"), float("inf")))
+        )
 
     def old_run(self):
         """
@@ -291,6 +787,8 @@ class ImagePipeline:
             Initializes the `Identifier` class and its methods.
             This initializer automatically performs the usage pipeline.
         """
+        import pytesseract  # pylint: disable=import-outside-toplevel
+
         pytesseract.pytesseract.tesseract_cmd = (
             r"C:\\\Program Files\\\Tesseract-OCR\\\tesseract.exe"
         )
@@ -347,6 +845,8 @@ class ImagePipeline:
                 5 'word_num', 6 'left', 7 'top', 8 'width',
                 9 'height', 10 'conf', 11 'text']
         """
+        import pytesseract  # pylint: disable=import-outside-toplevel
+
         unprocesseddata = pytesseract.image_to_data(self.processed_image, lang="eng")
         data = []
         for thing in re.split("\n", unprocesseddata):
@@ -396,6 +896,8 @@ class ImagePipeline:
         """
         items = []
 
+        from rtree import index  # pylint: disable=import-outside-toplevel
+
         def remove_intersecting_boxes(data_points):
             rt = index.Index()
             for i, data_point in enumerate(data_points):
@@ -0,0 +1,163 @@
+"""Stores the Instruments class for timing the stages of an activation."""
+import os
+import json
+import time
+import tracemalloc
+from collections import deque
+from contextlib import nullcontext
+
+UNTIMED = nullcontext()
+
+
+class Instruments:
+    """
+    The `Instruments` class records how long each stage of an activation takes,
+    and optionally how much memory it allocates, into a ring buffer that keeps
+    the latest records. When disabled, a stage costs one attribute check.
+
+    Attributes:
+        enabled (bool): Whether stages are recorded.
+        memory (bool): Whether the memory allocated by stages is traced as well.
+        records (deque): The latest records, as dictionaries, the oldest dropped first.
+        activations (int): The number of activations started so far.
+
+    Methods:
+        - from_environment(value): Creates the instruments that an environment value asks for.
+        - begin(): Starts counting the stages of a new activation.
+        - stage(name): Returns a context manager recording a stage.
+        - lines(): Returns the records as JSON lines.
+        - export(path): Writes the records to a file as JSON lines.
+
+    Notes:
+        - The `KEYFLARE_PROFILE` environment variable enables the instruments
+          with "1", and traces memory as well with "memory".
+        - Stages are not meant to be nested, since each stage with memory traced
+          resets the peak that an enclosing stage would report.
+
+    Example:
+        >>> instruments = Instruments(enabled=True)
+        >>> with instruments.stage("capture"):
+        ...     screenshot = system.image()
+        >>> instruments.records[-1]["stage"]
+        'capture'
+    """
+
+    def __init__(self, enabled=False, memory=False, capacity=1024):
+        """
+        Starts without any records.
+
+        Args:
+            enabled (bool, optional): Whether to record stages (default is False).
+            memory (bool, optional): Whether to trace the memory allocated by stages
+                with `tracemalloc`, which slows them down (default is False).
+            capacity (int, optional): The number of records kept (default is 1024).
+        """
+        self.enabled = enabled or memory
+        self.memory = memory
+        self.records = deque(maxlen=capacity)
+        self.activations = 0
+
+    @classmethod
+    def from_environment(cls, value=None):
+        """
+        Creates the instruments that the `KEYFLARE_PROFILE` environment variable asks for.
+
+        Args:
+            value (str, optional): The value to read instead of the environment
+                variable's (default is None).
+
+        Returns:
+            Instruments: Disabled for no value, "" or "0", tracing memory for "memory",
+                and timing stages for anything else.
+        """
+        if value is None:
+            value = os.environ.get("KEYFLARE_PROFILE", "")
+        value = value.strip().lower()
+        return cls(enabled=value not in ("", "0"), memory=value == "memory")
+
+    def begin(self):
+        """Starts counting the stages of a new activation."""
+        self.activations += 1
+
+    def stage(self, name):
+        """
+        Returns a context manager recording how long the stage inside it takes.
+
+        Args:
+            name (str): The stage's name.
+
+        Returns:
+            A context manager, shared and doing nothing when disabled.
+        """
+        if not self.enabled:
+            return UNTIMED
+        return Stage(self, name)
+
+    def lines(self):
+        """
+        Returns the records as JSON lines.
+
+        Returns:
+            list: A JSON object per record, oldest first.
+        """
+        return [json.dumps(record) for record in self.records]
+
+    def export(self, path):
+        """
+        Writes the records to a file as JSON lines, replacing its contents.
+
+        Args:
+            path (str): The file's path.
+        """
+        with open(path, "w", encoding="utf8") as file:
+            for line in self.lines():
+                file.write(line + "\n")
+
+
+class Stage:
+    """
+    The `Stage` class times one stage for `Instruments`, and adds its record when
+    the stage ends.
+
+    Attributes:
+        instruments (Instruments): The instruments receiving the record.
+        name (str): The stage's name.
+        started (int): When the stage started, from `time.perf_counter_ns`.
+        traced (int): The bytes traced by `tracemalloc` when the stage started.
+    """
+
+    def __init__(self, instruments, name):
+        """
+        Prepares the stage without starting it.
+
+        Args:
+            instruments (Instruments): The instruments receiving the record.
+            name (str): The stage's name.
+        """
+        self.instruments = instruments
+        self.name = name
+        self.started = 0
+        self.traced = 0
+
+    def __enter__(self):
+        if self.instruments.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self.traced = tracemalloc.get_traced_memory()[0]
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        ended = time.perf_counter_ns()
+        record = {
+            "activation": self.instruments.activations,
+            "stage": self.name,
+            "seconds": (ended - self.started) / 1e9,
+        }
+        if self.instruments.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            record["allocated"] = current - self.traced
+            record["peak"] = peak - self.traced
+        self.instruments.records.append(record)
+        return False
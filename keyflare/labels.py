@@ -0,0 +1,167 @@
+"""Stores the LabelAtlas class for drawing thousands of hint labels at once."""
+import string
+import numpy as np
+import cv2
+from .results import HintBoxes
+
+
+class LabelAtlas:
+    """
+    The `LabelAtlas` class draws the hint labels over a screenshot. Each letter
+    is rasterized once per colour into a cell of the label's background, and all
+    the labels are then copied from those cells and blended in with NumPy,
+    instead of measuring and drawing every label's text again with OpenCV.
+
+    Attributes:
+        alphabet (str): The letters that have cells, where other characters
+            are drawn as blank cells.
+        font (int): The OpenCV font the letters are drawn with.
+        font_scale (float): The size of the font.
+        cell_size (tuple): The (height, width) in pixels of a letter's cell.
+        alpha (float): How opaque the labels are over the screenshot.
+        atlases (dict): The cells of the alphabet for each colour drawn so far.
+
+    Methods:
+        - cells(color): Returns the cells of every letter on a background colour.
+        - render(image, labels, color, out): Draws the labels over the image.
+        - drawing(out, codes, corners, color): Copies the cells of labels into out.
+
+    Notes:
+        - Every letter takes a cell of the same size, so a label of n letters
+          is n cells wide, like the rectangles drawn behind labels before.
+        - Labels drawn later cover those drawn earlier where they overlap.
+
+    Example:
+        >>> atlas = LabelAtlas()
+        >>> overlay = atlas.render(screenshot, [("et", [10, 20, 30, 40])], (248, 93, 94))
+    """
+
+    alphabet = string.ascii_lowercase
+    font = cv2.FONT_HERSHEY_COMPLEX_SMALL
+    font_scale = 0.75
+    cell_size = (20, 13)
+    alpha = 0.75
+
+    def __init__(self, alphabet=string.ascii_lowercase):
+        """
+        Prepares the lookup from characters to cells.
+
+        Args:
+            alphabet (str, optional): The letters to rasterize
+                (default is string.ascii_lowercase).
+        """
+        self.alphabet = alphabet
+        self.atlases = {}
+        # Characters outside the alphabet map to the blank cell after the letters.
+        self.lookup = np.full(256, len(alphabet), dtype=np.intp)
+        for position, letter in enumerate(alphabet):
+            self.lookup[ord(letter.lower())] = position
+            self.lookup[ord(letter.upper())] = position
+
+    def cells(self, color):
+        """
+        Returns the cells of every letter on a background colour, rasterizing them
+        the first time the colour is used.
+
+        Args:
+            color (tuple): The background colour, in the image's channel order.
+
+        Returns:
+            np.ndarray: A (len(alphabet) + 1, height, width * 3) uint8 array of cells,
+                each row holding a row of pixels, the last cell blank.
+        """
+        color = tuple(int(channel) for channel in color)
+        if color not in self.atlases:
+            height, width = self.cell_size
+            rasters = np.empty((len(self.alphabet) + 1, height, width, 3), np.uint8)
+            rasters[:] = color
+            for cell, letter in zip(rasters, self.alphabet):
+                (text_width, text_height), _ = cv2.getTextSize(
+                    letter, self.font, self.font_scale, 1
+                )
+                cv2.putText(
+                    cell,
+                    letter,
+                    ((width - text_width) // 2, (height + text_height) // 2),
+                    self.font,
+                    self.font_scale,
+                    (0, 0, 0),
+                    1,
+                    cv2.LINE_AA,
+                )
+            self.atlases[color] = rasters.reshape((len(rasters), height, width * 3))
+        return self.atlases[color]
+
+    def render(self, image, labels, color, out=None):
+        """
+        Draws the labels over the image, blending them in by `alpha`.
+
+        Args:
+            image (np.ndarray): The (height, width, 3) uint8 screenshot.
+            labels (HintBoxes or list): The labelled boxes, or their (label, [x, y, w, h])
+                pairs, each label being drawn from the top-left corner of its box.
+            color (tuple): The labels' background colour, in the image's channel order.
+            out (np.ndarray, optional): A C-contiguous array of the image's shape to
+                draw into, where None allocates one (default is None).
+
+        Returns:
+            np.ndarray: The image with the labels drawn over it.
+
+        Raises:
+            ValueError: If out is not C-contiguous.
+
+        Notes:
+            - Labels are grouped by length. Each row of a letter's cell is a
+              contiguous run of bytes in the image, so all of a group's rows are
+              copied from the cells with a single scatter.
+            - The labels are blended in afterwards with one `cv2.addWeighted`
+              over the whole image, which leaves the pixels without labels unchanged.
+            - Cells reaching past the right edge are clipped one at a time.
+        """
+        if out is None:
+            out = np.empty_like(image)
+        if not out.flags.c_contiguous:
+            raise ValueError("The labels can only be drawn into a C-contiguous array.")
+        np.copyto(out, image)
+        labels = HintBoxes.from_pairs(labels)
+        if len(labels):
+            codes = labels.codes()
+            lengths = np.count_nonzero(codes, axis=1)
+            corners = labels.boxes[:, :2].astype(np.intp)
+            for length in np.unique(lengths[lengths > 0]).tolist():
+                group = lengths == length
+                self.drawing(out, codes[group, :length], corners[group], color)
+        return cv2.addWeighted(out, self.alpha, image, 1 - self.alpha, 0, dst=out)
+
+    def drawing(self, out, codes, corners, color):
+        """
+        Copies the cells of labels of the same length into out, without blending.
+
+        Args:
+            out (np.ndarray): The C-contiguous (height, width, 3) array to draw into.
+            codes (np.ndarray): The (labels, letters) uint8 array of the labels' bytes.
+            corners (np.ndarray): The (labels, 2) top-left corner of each label.
+            color (tuple): The labels' background colour.
+        """
+        height, width = self.cell_size
+        atlas = self.cells(color)
+        run = np.dtype((np.void, atlas.shape[2]))
+        cells = self.lookup[codes]
+        lefts = corners[:, 0, None] + np.arange(cells.shape[1]) * width
+        rows = corners[:, 1, None] + np.arange(height)
+        fits = lefts + width <= out.shape[1]
+        # One run of bytes per row of every letter's cell, as (labels, letters, rows).
+        shown = fits[:, :, None] & (rows[:, None, :] < out.shape[0])
+        starts = (rows[:, None, :] * out.shape[1] + lefts[:, :, None]) * 3
+        runs = atlas.view(run).reshape(atlas.shape[:2])[cells]
+        if not shown.all():
+            starts, runs = starts[shown], runs[shown]
+        target = np.ndarray(
+            (out.size - run.itemsize + 1,), run, buffer=out, strides=(1,)
+        )
+        target[starts.reshape(-1)] = runs.reshape(-1)
+        for label, letter in zip(*np.nonzero(~fits & (lefts < out.shape[1]))):
+            left, top = lefts[label, letter], corners[label, 1]
+            bottom = min(top + height, out.shape[0])
+            cell = atlas[cells[label, letter], : bottom - top].reshape(-1, width, 3)
+            out[top:bottom, left:] = cell[:, : out.shape[1] - left]
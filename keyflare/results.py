@@ -0,0 +1,127 @@
+"""Stores the HintBoxes class holding the labelled boxes that the pipeline finds."""
+import numpy as np
+
+
+class HintBoxes:
+    """
+    The `HintBoxes` class holds the pipeline's result as three parallel arrays,
+    the boxes, their labels and their scores, instead of a list of Python pairs,
+    so a box costs about 25 bytes and the GUI, batch tools and tests can work on
+    all of them at once.
+
+    Attributes:
+        boxes (np.ndarray): The (N, 4) int32 [x, y, w, h] boxes.
+        labels (np.ndarray): The (N,) fixed-width bytes labels, what is left to type.
+        scores (np.ndarray): The (N,) float32 confidence of each box, which is 1
+            for every box the pipeline finds, since its detection does not rank them.
+
+    Methods:
+        - from_pairs(pairs): Creates the boxes from (label, [x, y, w, h]) pairs.
+        - texts(): Returns the labels as strings.
+        - codes(): Returns the labels' bytes as an (N, width) uint8 array.
+        - pairs(): Returns the (label, [x, y, w, h]) pairs.
+
+    Notes:
+        - Indexing with an integer gives a (label, [x, y, w, h]) pair and iterating
+          gives every pair, like the list of pairs that `coordinate_data` used to be.
+        - Indexing with a slice, indices or a mask gives the HintBoxes of those boxes.
+
+    Example:
+        >>> hints = HintBoxes([[10, 20, 30, 40], [50, 60, 70, 80]], ["e", "t"])
+        >>> hints[1]
+        ('t', [50, 60, 70, 80])
+        >>> hints.boxes[:, 0] + hints.boxes[:, 2] // 2
+        array([25, 85], dtype=int32)
+    """
+
+    __slots__ = ("boxes", "labels", "scores")
+
+    def __init__(self, boxes, labels=None, scores=None):
+        """
+        Stores the arrays, converting them if needed.
+
+        Args:
+            boxes (array-like): The [x, y, w, h] boxes.
+            labels (array-like, optional): The labels, as strings or bytes, where
+                None leaves them empty (default is None).
+            scores (array-like, optional): The scores, where None gives every box
+                a score of 1 (default is None).
+        """
+        self.boxes = np.asarray(boxes, np.int32).reshape(-1, 4)
+        if labels is None:
+            labels = np.zeros(len(self.boxes), "S1")
+        self.labels = np.asarray(labels, "S")
+        if scores is None:
+            scores = np.ones(len(self.boxes), np.float32)
+        self.scores = np.asarray(scores, np.float32)
+
+    @classmethod
+    def from_pairs(cls, pairs):
+        """
+        Creates the boxes from (label, [x, y, w, h]) pairs.
+
+        Args:
+            pairs (iterable): The (label, [x, y, w, h]) pairs, or a HintBoxes.
+
+        Returns:
+            HintBoxes: The labelled boxes, or the HintBoxes given.
+        """
+        if isinstance(pairs, cls):
+            return pairs
+        pairs = list(pairs)
+        return cls(
+            [box for _, box in pairs], np.array([label for label, _ in pairs], "S")
+        )
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return self.labels[index].decode("ascii"), self.boxes[index].tolist()
+        return HintBoxes(self.boxes[index], self.labels[index], self.scores[index])
+
+    def __iter__(self):
+        return iter(self.pairs())
+
+    def __eq__(self, other):
+        if not isinstance(other, HintBoxes):
+            return NotImplemented
+        return (
+            np.array_equal(self.boxes, other.boxes)
+            and np.array_equal(self.labels, other.labels)
+            and np.array_equal(self.scores, other.scores)
+        )
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"HintBoxes({self.pairs()!r})"
+
+    def texts(self):
+        """
+        Returns the labels as strings.
+
+        Returns:
+            list: The labels.
+        """
+        return self.labels.astype(str).tolist()
+
+    def codes(self):
+        """
+        Returns the labels' bytes, padded with zeros to the longest label.
+
+        Returns:
+            np.ndarray: An (N, width) uint8 array, a row per label.
+        """
+        labels = np.ascontiguousarray(self.labels)
+        return labels.view(np.uint8).reshape(len(labels), labels.dtype.itemsize)
+
+    def pairs(self):
+        """
+        Returns the (label, [x, y, w, h]) pairs.
+
+        Returns:
+            list: A pair per box, in order.
+        """
+        return list(zip(self.texts(), self.boxes.tolist()))
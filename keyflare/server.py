@@ -0,0 +1,392 @@
+"""Stores the Server class and the client controlling a running KeyFlare over a socket."""
+import os
+import sys
+import json
+import socket
+import getpass
+import argparse
+import tempfile
+import socketserver
+
+# The seconds a client waits for a server to answer "ping".
+PING_TIMEOUT = 1.0
+
+# The seconds a client waits for "activate", which lasts until a label is typed.
+ACTIVATION_TIMEOUT = 300.0
+
+
+def click_fields(request):
+    """
+    Reads the number of clicks and the button of a request.
+
+    Args:
+        request (dict): The request, with an optional "clicks" (default 1) and
+            "button" (default "left").
+
+    Returns:
+        tuple: The number of clicks and the button.
+
+    Raises:
+        ValueError: If the clicks are not a whole number from 0, or the button
+            is not "left" or "right".
+    """
+    clicks, button = request.get("clicks", 1), request.get("button", "left")
+    if isinstance(clicks, bool) or not isinstance(clicks, int) or clicks < 0:
+        raise ValueError(f"clicks must be a whole number from 0, not {clicks!r}")
+    if button not in ("left", "right"):
+        raise ValueError(f'button must be "left" or "right", not {button!r}')
+    return clicks, button
+
+
+def socket_path():
+    """
+    Returns where the server listens by default, private to the user.
+
+    Returns:
+        str: The `KEYFLARE_SOCKET` environment variable, or a file named after the
+            user in `XDG_RUNTIME_DIR` or the temporary directory.
+    """
+    if os.environ.get("KEYFLARE_SOCKET"):
+        return os.environ["KEYFLARE_SOCKET"]
+    directory = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(directory, f"keyflare-{getpass.getuser()}.sock")
+
+
+class Handler(socketserver.StreamRequestHandler):
+    """
+    Answers each line of JSON sent over a connection with a line of JSON.
+
+    Attributes:
+        timeout (float): The seconds a connection may stay idle before it is
+            closed, so an idle client does not hold up the others.
+    """
+
+    timeout = 2.0
+
+    def handle(self):
+        """
+        Reads requests until the client closes the connection, stays idle for
+        `timeout` seconds, or the server stops.
+        """
+        try:
+            self.answering()
+        except socket.timeout:  # TimeoutError since Python 3.10
+            pass
+
+    def answering(self):
+        """Answers the requests read from the connection."""
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as error:
+                response = {"ok": False, "error": f"Not a JSON request: {error}"}
+            else:
+                response = self.server.keyflare.handling(request)
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+            if self.server.keyflare.stopped:
+                break
+
+
+class Server:
+    """
+    The `Server` class keeps one GUI, with its pipeline warm, answering the
+    commands of other processes on a Unix socket, so each programmatic activation
+    costs a connection instead of starting Python and importing OpenCV and Tk.
+
+    Attributes:
+        gui (GUI): The GUI activated by the commands, used from the serving thread.
+        path (str): The Unix socket's path.
+        commands (dict): The method answering each command, by name.
+        stopped (bool): Whether the "stop" command was received.
+        detected (tuple): The fingerprint of the screen of the last "detect" and
+            the `HintBoxes` it answered, or None before the first.
+
+    Methods:
+        - serve(): Answers commands until stopped.
+        - handling(request): Answers one command.
+        - activating(request): Shows the labels and clicks the one typed.
+        - detecting(request): Returns the labels and boxes of the screen.
+        - clicking(request): Clicks the box of a label that "detect" returned.
+        - stopping(request): Stops serving.
+        - pinging(request): Answers, to check that the server is listening.
+
+    Notes:
+        - Each request is a line of JSON with a "command" and its arguments, and is
+          answered by a line of JSON with "ok" and, if not ok, an "error".
+        - Commands are answered one at a time, by the thread that calls `serve`,
+          which must be the one that owns the GUI's window. A connection left
+          idle is closed after `Handler.timeout` seconds.
+        - "click" uses the boxes of the last "detect" rather than detecting
+          again, since a few changed pixels, such as a clock's, would label the
+          boxes anew and give its label to another element. Once the screen's
+          fingerprint differs from that of "detect", "click" fails instead.
+        - NumPy is only imported by "detect" and "click", so that the clients
+          importing this module start quickly.
+
+    Example:
+        >>> gui = GUI(resident=True)
+        >>> gui.starting()
+        >>> Server(gui).serve()
+    """
+
+    def __init__(self, gui, path=None):
+        """
+        Prepares the commands without listening yet.
+
+        Args:
+            gui (GUI): The GUI to activate.
+            path (str, optional): The Unix socket's path, where None uses
+                `socket_path()` (default is None).
+        """
+        self.gui = gui
+        self.path = socket_path() if path is None else path
+        self.stopped = False
+        self.detected = None
+        self.commands = {
+            "activate": self.activating,
+            "detect": self.detecting,
+            "click": self.clicking,
+            "stop": self.stopping,
+            "ping": self.pinging,
+        }
+
+    def serve(self, ready=None):
+        """
+        Listens on the socket and answers commands until "stop", or until the
+        GUI is exited, then removes the socket.
+
+        Args:
+            ready (threading.Event, optional): Set once listening (default is None).
+
+        Raises:
+            RuntimeError: If another server is listening on the socket.
+        """
+        if os.path.exists(self.path):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                try:
+                    probe.connect(self.path)
+                except ConnectionRefusedError:
+                    os.unlink(self.path)
+                else:
+                    raise RuntimeError(
+                        f"A KeyFlare server is already listening on {self.path}"
+                    )
+        previous = os.umask(0o177)
+        try:
+            server = socketserver.UnixStreamServer(self.path, Handler)
+        finally:
+            os.umask(previous)
+        server.keyflare = self
+        server.timeout = 0.5
+        print(f"[KeyFlare] Listening on {self.path}.")
+        if ready is not None:
+            ready.set()
+        try:
+            with server:
+                while not self.stopped and not self.gui.exit_flag:
+                    server.handle_request()
+        finally:
+            os.unlink(self.path)
+
+    def handling(self, request):
+        """
+        Answers one command.
+
+        Args:
+            request (dict): The "command" and its arguments.
+
+        Returns:
+            dict: The answer, with "ok" and, if not ok, an "error".
+        """
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "A request must be a JSON object"}
+        command = self.commands.get(request.get("command"))
+        if command is None:
+            return {"ok": False, "error": f"Unknown command: {request.get('command')}"}
+        try:
+            return {"ok": True, **command(request)}
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            return {"ok": False, "error": f"{type(error).__name__}: {error}"}
+
+    def activating(self, request):
+        """
+        Shows the labels and clicks the one typed, like `keyflare <clicks> <button>`.
+
+        Args:
+            request (dict): The number of "clicks" (default 1) and the "button"
+                (default "left").
+
+        Returns:
+            dict: Nothing more.
+
+        Raises:
+            ValueError: If the clicks or the button are not understood.
+        """
+        clicks, button = click_fields(request)
+        self.gui.run(clicks=clicks, button=button)
+        return {}
+
+    def detecting(self, request):  # pylint: disable=unused-argument
+        """
+        Captures the screen and returns its labels and boxes, without showing them,
+        keeping them for "click".
+
+        Args:
+            request (dict): No arguments.
+
+        Returns:
+            dict: The "labels" and the [x, y, w, h] "boxes", in the same order.
+        """
+        from .frames import frame_fingerprint  # pylint: disable=import-outside-toplevel
+
+        pipeline = self.gui.y
+        pipeline.run()
+        hints = pipeline.coordinate_data
+        self.detected = (frame_fingerprint(pipeline.original_image), hints)
+        return {"labels": hints.texts(), "boxes": hints.boxes.tolist()}
+
+    def clicking(self, request):
+        """
+        Clicks the box of a label that the last "detect" returned, where the GUI
+        would, if the screen has not changed since.
+
+        Args:
+            request (dict): The "label", the number of "clicks" (default 1) and
+                the "button" (default "left").
+
+        Returns:
+            dict: The [x, y, w, h] "box" clicked.
+
+        Raises:
+            KeyError: If the label was not returned by "detect".
+            RuntimeError: If "detect" was not sent, or the screen changed since.
+            ValueError: If the label, the clicks or the button are not understood.
+        """
+        clicks, button = click_fields(request)
+        if not isinstance(request.get("label"), str):
+            raise ValueError(f"label must be a string, not {request.get('label')!r}")
+        from .frames import frame_fingerprint  # pylint: disable=import-outside-toplevel
+
+        if self.detected is None:
+            raise RuntimeError('No labels to click, send "detect" first')
+        fingerprint, hints = self.detected
+        system = self.gui.y.x
+        if frame_fingerprint(system.image()) != fingerprint:
+            raise RuntimeError('The screen changed since "detect", send it again')
+        found = (hints.labels == request["label"].encode()).nonzero()[0]
+        if found.size == 0:
+            raise KeyError(f"No label {request['label']} was detected")
+        box = hints.boxes[found[0]].tolist()
+        system.mouse([box[0] + 10, box[1] + 10], clicks=clicks, button=button)
+        return {"box": box}
+
+    def stopping(self, request):  # pylint: disable=unused-argument
+        """
+        Stops serving once the answer is sent.
+
+        Args:
+            request (dict): No arguments.
+
+        Returns:
+            dict: Nothing more.
+        """
+        self.stopped = True
+        return {}
+
+    def pinging(self, request):  # pylint: disable=unused-argument
+        """
+        Answers without doing anything, to check that the server is listening.
+
+        Args:
+            request (dict): No arguments.
+
+        Returns:
+            dict: Nothing more.
+        """
+        return {}
+
+
+def sending(message, path=None, timeout=None):
+    """
+    Sends a command to the server and waits for its answer.
+
+    Args:
+        message (dict): The "command" and its arguments.
+        path (str, optional): The Unix socket's path, where None uses
+            `socket_path()` (default is None).
+        timeout (float, optional): The seconds to wait, where None waits until the
+            command is done, such as the user typing a label (default is None).
+
+    Returns:
+        dict: The answer, with "ok" and, if not ok, an "error".
+
+    Raises:
+        OSError: If no server is listening, or the platform has no Unix sockets.
+
+    Example:
+        >>> sending({"command": "detect"})["labels"][:3]
+        ['e', 't', 'a']
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("Unix sockets are not available on this platform")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.settimeout(timeout)
+        connection.connect(socket_path() if path is None else path)
+        connection.sendall(json.dumps(message).encode() + b"\n")
+        with connection.makefile("rb") as answers:
+            answer = answers.readline()
+    if not answer:
+        raise ConnectionError("The server closed the connection without answering")
+    return json.loads(answer)
+
+
+def main(args=None):
+    """
+    Sends a command to a running `keyflare serve` and prints its answer as JSON.
+
+    Args:
+        args (list, optional): The command-line arguments after "send", where None
+            reads them from `sys.argv` (default is None).
+
+    Returns:
+        int: 0 if the command succeeded, 1 otherwise.
+
+    Examples:
+        ```sh
+        keyflare serve &
+        keyflare send activate 2 left
+        keyflare send detect
+        keyflare send click et --clicks 2
+        keyflare send stop
+        ```
+    """
+    parser = argparse.ArgumentParser(
+        prog="keyflare send", description=main.__doc__.splitlines()[1].strip()
+    )
+    parser.add_argument("--socket", help="The server's Unix socket.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    activate = commands.add_parser("activate", help="Show the labels and click one.")
+    activate.add_argument("clicks", nargs="?", type=int, default=1)
+    activate.add_argument("button", nargs="?", default="left")
+    commands.add_parser("detect", help="Print the labels and boxes of the screen.")
+    click = commands.add_parser("click", help="Click the box of a label.")
+    click.add_argument("label")
+    click.add_argument("--clicks", type=int, default=1)
+    click.add_argument("--button", default="left")
+    commands.add_parser("stop", help="Stop the server.")
+    args = parser.parse_args(sys.argv[2:] if args is None else args)
+    message = {key: value for key, value in vars(args).items() if key != "socket"}
+    try:
+        answer = sending(message, args.socket)
+    except OSError as error:
+        print(f"[KeyFlare] No server is listening: {error}", file=sys.stderr)
+        return 1
+    print(json.dumps(answer))
+    return 0 if answer["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,163 @@
+"""Stores the Speculation class detecting the screen's boxes before an activation asks."""
+import threading
+from .frames import frame_fingerprint
+from .image_pipeline import ImagePipeline
+from .instruments import Instruments
+
+
+class Speculation:
+    """
+    The `Speculation` class captures the screen and detects its boxes in a
+    background thread, keeping the latest result with the fingerprint of its
+    screenshot, so an activation on an unchanged screen only needs a capture.
+
+    Attributes:
+        pipeline (ImagePipeline): The pipeline of the background thread, with
+            its own capture backend and arrays.
+        interval (float): The seconds between two background captures.
+        settle (bool): Whether to only detect once a screenshot is the same as
+            the one before, so the boxes of a screen still changing are not found.
+        latest (tuple): The fingerprint, the pipeline's detection settings and the
+            labelled HintBoxes of the latest screen detected, or None.
+        previous (tuple): The fingerprint of the latest screenshot, detected or not.
+        detections (int): The number of screens detected in the background.
+        hits (int): The number of activations given the latest result.
+        misses (int): The number of activations whose screen had changed since.
+        thread (threading.Thread): The background thread, while running.
+
+    Methods:
+        - start(): Starts capturing in the background.
+        - stop(): Stops capturing and waits for the thread to finish.
+        - pause(): Stops capturing until `resume`, such as while the overlay is shown.
+        - resume(): Captures again after `pause`.
+        - step(): Captures the screen once, and detects its boxes if it changed.
+        - result(fingerprint, settings): Returns the latest boxes if they were found
+          on that screen with those settings.
+
+    Notes:
+        - The background thread only uses its own pipeline, since capture backends
+          and the arrays of a `FrameBuffer` are not shared between threads.
+        - OpenCV releases the GIL while detecting, so the background detection
+          mostly runs on another core.
+
+    Example:
+        >>> pipeline = ImagePipeline()
+        >>> pipeline.speculation = Speculation(interval=0.5, settle=True)
+        >>> pipeline.speculation.start()
+        >>> pipeline.run()  # Only captures when the screen is unchanged
+        >>> pipeline.speculation.stop()
+    """
+
+    def __init__(self, pipeline=None, interval=1.0, settle=False):
+        """
+        Prepares the background pipeline without starting it.
+
+        Args:
+            pipeline (ImagePipeline, optional): The pipeline to detect with, which
+                must not be used by another thread, where None creates one with the
+                default settings and without instruments (default is None).
+            interval (float, optional): The seconds between two background
+                captures (default is 1.0).
+            settle (bool, optional): Whether to wait for the screen to stay the
+                same for one interval before detecting (default is False).
+        """
+        if pipeline is None:
+            pipeline = ImagePipeline(instruments=Instruments())
+        self.pipeline = pipeline
+        self.interval = interval
+        self.settle = settle
+        self.latest = None
+        self.previous = None
+        self.detections = 0
+        self.hits = 0
+        self.misses = 0
+        self.thread = None
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.active = threading.Event()
+        self.active.set()
+
+    def start(self):
+        """Starts capturing in the background, unless it already is."""
+        if self.thread is not None:
+            return
+        self.stopping.clear()
+        self.thread = threading.Thread(
+            target=self.speculating, name="KeyFlare speculation", daemon=True
+        )
+        self.thread.start()
+
+    def stop(self):
+        """Stops capturing and waits for the current capture to finish."""
+        if self.thread is None:
+            return
+        self.stopping.set()
+        self.active.set()
+        self.thread.join()
+        self.thread = None
+
+    def pause(self):
+        """Stops capturing after the current capture, until `resume` is called."""
+        self.active.clear()
+
+    def resume(self):
+        """Captures again after `pause`."""
+        self.active.set()
+
+    def speculating(self):
+        """Captures every interval until stopped, the body of the background thread."""
+        while not self.stopping.wait(self.interval):
+            self.active.wait()
+            if not self.stopping.is_set():
+                self.step()
+
+    def step(self):
+        """
+        Captures the screen once, and detects its boxes if it changed since the
+        latest detection and, when settling, is the same as the previous capture.
+
+        Returns:
+            bool: Whether the boxes were detected.
+        """
+        pipeline = self.pipeline
+        pipeline.original_image = pipeline.frames.fill(
+            "screenshot", lambda out: pipeline.x.image(out=out)
+        )
+        fingerprint = frame_fingerprint(pipeline.original_image)
+        previous, self.previous = self.previous, fingerprint
+        settings = pipeline.detection_settings()
+        if self.latest is not None and self.latest[:2] == (fingerprint, settings):
+            return False
+        if self.settle and previous != fingerprint:
+            return False
+        pipeline.coordinate_data = []
+        pipeline.processing_image()
+        pipeline.processing_data()
+        with self.lock:
+            self.latest = (
+                fingerprint,
+                pipeline.detection_settings(),
+                pipeline.coordinate_data,
+            )
+            self.detections += 1
+        return True
+
+    def result(self, fingerprint, settings):
+        """
+        Returns the latest boxes if they were found on the screen of the fingerprint,
+        with the same detection settings as the activation's pipeline.
+
+        Args:
+            fingerprint (tuple): The fingerprint of the activation's screenshot.
+            settings (tuple): The `detection_settings()` of the activation's pipeline.
+
+        Returns:
+            HintBoxes: The labelled boxes, or None if the screen changed since or
+                the boxes were found with other settings.
+        """
+        with self.lock:
+            if self.latest is not None and self.latest[:2] == (fingerprint, settings):
+                self.hits += 1
+                return self.latest[2]
+            self.misses += 1
+            return None
@@ -0,0 +1,145 @@
+"""Stores the vectorized NumPy engine for removing overlapping bounding boxes."""
+import numpy as np
+
+
+def suppress_overlaps(boxes, margin=10, area_margin=5, min_area=15, cell_size=64):
+    """
+    Removes overlapping bounding boxes in batch with NumPy, keeping the smaller boxes.
+    This reproduces the R-tree suppression in `ImagePipeline.processing_data`:
+    boxes with an area of `min_area` or less are dropped, and every remaining box,
+    swept in index order while it has not been removed itself, removes each box
+    that touches it within `margin` pixels and has an area larger by `area_margin`.
+
+    Args:
+        boxes (array-like): An (N, 4) array of [x, y, w, h] bounding boxes.
+        margin (int, optional): Pixels added on every side of a box when looking
+            for neighbours (default is 10).
+        area_margin (int, optional): How much larger a neighbour's area must be
+            for it to be removed (default is 5).
+        min_area (int, optional): Boxes with an area of this or less are ignored
+            (default is 15).
+        cell_size (int, optional): The side in pixels of the grid cells used
+            to bucket boxes into candidate pairs (default is 64).
+
+    Returns:
+        np.ndarray: The ascending indices of the boxes that were kept.
+
+    Notes:
+        - Candidate pairs come from a uniform grid, so only boxes sharing a grid cell
+          are compared instead of every pair of boxes.
+        - Only boxes that both remove and are removed by others need a Python-level
+          step, since whether they are still present depends on the sweep order.
+
+    Example:
+        >>> boxes = np.array([[0, 0, 10, 10], [5, 5, 40, 40]], dtype=np.int32)
+        >>> suppress_overlaps(boxes)
+        array([0])
+    """
+    boxes = np.asarray(boxes, dtype=np.int32).reshape(-1, 4)
+    areas = boxes[:, 2].astype(np.int64) * boxes[:, 3]
+    candidates = np.flatnonzero(areas > min_area)
+    if candidates.size < 2:
+        return candidates
+    x0 = boxes[candidates, 0].astype(np.int64)
+    y0 = boxes[candidates, 1].astype(np.int64)
+    x1 = x0 + boxes[candidates, 2]
+    y1 = y0 + boxes[candidates, 3]
+    areas = areas[candidates]
+    first, second = candidate_pairs(
+        x0 - margin, y0 - margin, x1 + margin, y1 + margin, cell_size
+    )
+    touching = (
+        (x0[first] - margin <= x1[second])
+        & (x0[second] <= x1[first] + margin)
+        & (y0[first] - margin <= y1[second])
+        & (y0[second] <= y1[first] + margin)
+    )
+    first, second = first[touching], second[touching]
+    forward = areas[first] <= areas[second] - area_margin
+    backward = areas[second] <= areas[first] - area_margin
+    sources = np.concatenate([first[forward], second[backward]])
+    targets = np.concatenate([second[forward], first[backward]])
+    active = _active_sources(sources, targets, candidates.size)
+    removed = np.zeros(candidates.size, dtype=bool)
+    removed[targets[active[sources]]] = True
+    return candidates[~removed]
+
+
+def candidate_pairs(x0, y0, x1, y1, cell_size):
+    """
+    Buckets boxes into grid cells and returns each pair of boxes sharing a cell once.
+
+    Args:
+        x0, y0, x1, y1 (np.ndarray): The box corners, including any margin.
+        cell_size (int): The side in pixels of the grid cells.
+
+    Returns:
+        tuple: Two arrays (first, second) of paired box indices.
+
+    Notes:
+        - A pair sharing several cells is only kept in the cell holding the top-left
+          corner of the two boxes' overlap, which avoids sorting pairs to deduplicate them.
+    """
+    x0, y0 = np.maximum(x0, 0), np.maximum(y0, 0)
+    left, top = x0 // cell_size, y0 // cell_size
+    columns = np.maximum(x1, 0) // cell_size - left + 1
+    rows = np.maximum(y1, 0) // cell_size - top + 1
+    counts = columns * rows
+    owners = np.repeat(np.arange(counts.size), counts)
+    offsets = np.arange(owners.size) - np.repeat(np.cumsum(counts) - counts, counts)
+    width = int((left + columns).max()) + 1
+    cells = (top[owners] + offsets // columns[owners]) * width + (
+        left[owners] + offsets % columns[owners]
+    )
+    order = np.argsort(cells, kind="stable")
+    cells, owners = cells[order], owners[order]
+    starts = np.flatnonzero(np.diff(cells, prepend=-1))
+    sizes = np.diff(starts, append=cells.size)
+    busy = sizes > 1
+    starts, sizes = starts[busy], sizes[busy]
+    # Every member of a cell is paired with each member that follows it.
+    members = np.repeat(starts, sizes) + (
+        np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    )
+    followers = np.repeat(starts + sizes, sizes) - members - 1
+    left_side = np.repeat(members, followers)
+    right_side = (
+        left_side
+        + 1
+        + (
+            np.arange(left_side.size)
+            - np.repeat(np.cumsum(followers) - followers, followers)
+        )
+    )
+    first, second = owners[left_side], owners[right_side]
+    corner = (np.maximum(y0[first], y0[second]) // cell_size) * width + (
+        np.maximum(x0[first], x0[second]) // cell_size
+    )
+    unique = corner == cells[left_side]
+    return first[unique], second[unique]
+
+
+def _active_sources(sources, targets, count):
+    """
+    Finds which boxes are still present when the sweep reaches them.
+
+    Args:
+        sources (np.ndarray): Indices of the boxes doing the removing.
+        targets (np.ndarray): Indices of the boxes being removed, paired with sources.
+        count (int): The number of boxes.
+
+    Returns:
+        np.ndarray: A boolean array, True for boxes that are present when swept.
+    """
+    active = np.ones(count, dtype=bool)
+    order = np.argsort(targets, kind="stable")
+    by_target, suppressors = targets[order], sources[order]
+    contested = np.intersect1d(sources, targets)
+    starts = np.searchsorted(by_target, contested, side="left")
+    ends = np.searchsorted(by_target, contested, side="right")
+    for box, start, end in zip(contested.tolist(), starts.tolist(), ends.tolist()):
+        earlier = suppressors[start:end]
+        earlier = earlier[earlier < box]
+        if earlier.size and active[earlier].any():
+            active[box] = False
+    return active
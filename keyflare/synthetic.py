@@ -0,0 +1,178 @@
+"""Stores the functions drawing synthetic screenshots for benchmarking the pipeline."""
+import numpy as np
+import cv2
+
+RESOLUTIONS = {
+    "1080p": (1920, 1080),
+    "1440p": (2560, 1440),
+    "4K": (3840, 2160),
+    "8K": (7680, 4320),
+}
+DENSITIES = {"low": 30, "medium": 90, "high": 250}
+WORDS = (
+    "file edit view open save close search settings help home back next cancel".split()
+)
+
+
+def synthetic_screenshot(width, height, density="medium", seed=0):
+    """
+    Draws a screenshot of a made-up interface, with the same pixels for the same
+    arguments, and lists where its elements are.
+
+    Args:
+        width (int): The screenshot's width in pixels.
+        height (int): The screenshot's height in pixels.
+        density (str or int, optional): How many elements a 1080p-sized screen holds,
+            either a name of `DENSITIES` or a number (default is "medium").
+        seed (int, optional): The seed choosing the elements (default is 0).
+
+    Returns:
+        tuple: The (height, width, 3) uint8 RGB screenshot, and the list of
+            (kind, [x, y, w, h]) elements drawn, where kind is "button", "text",
+            "cell" (of a table) or "icon".
+
+    Notes:
+        - Elements are drawn larger on screens taller than 1080 pixels, as with
+          display scaling, and their number grows with the screen's area.
+        - Elements never overlap, and those that could not be placed are skipped.
+
+    Example:
+        >>> image, elements = synthetic_screenshot(1920, 1080, "high")
+        >>> elements[0]
+        ('text', [960, 348, 32, 16])
+    """
+    rng = np.random.default_rng(seed)
+    count = DENSITIES.get(density, density)
+    scale = max(1, round(height / 1080))
+    count = round(count * width * height / (1920 * 1080 * scale**2))
+    image = np.full((height, width, 3), 236, np.uint8)
+    taken = np.zeros((height, width), bool)
+    elements = []
+    kinds = ["button", "text", "table", "icon"]
+    for kind in rng.choice(kinds, count, p=[0.3, 0.4, 0.1, 0.2]).tolist():
+        size, text = element_size(kind, rng, scale)
+        if size[0] + 8 > width or size[1] + 8 > height:
+            continue
+        # A few tries at a free place, keeping a margin between elements.
+        for _ in range(10):
+            x = int(rng.integers(4, width - size[0] - 3))
+            y = int(rng.integers(4, height - size[1] - 3))
+            if not taken[y - 4 : y + size[1] + 4, x - 4 : x + size[0] + 4].any():
+                break
+        else:
+            continue
+        taken[y - 4 : y + size[1] + 4, x - 4 : x + size[0] + 4] = True
+        elements.extend(
+            drawing_element(image, kind, [x, y, size[0], size[1]], text, rng, scale)
+        )
+    return image, elements
+
+
+def element_size(kind, rng, scale):
+    """
+    Chooses the size of an element, and the text of a line of text.
+
+    Args:
+        kind (str): The element's kind, "button", "text", "table" or "icon".
+        rng (np.random.Generator): The generator choosing the element.
+        scale (int): The display scaling of the screenshot.
+
+    Returns:
+        tuple: The (w, h) size in pixels, and the text, or the (rows, columns, cell
+            width) of a table, or None.
+    """
+    if kind == "table":
+        rows, columns = int(rng.integers(2, 7)), int(rng.integers(2, 5))
+        cell_width = int(rng.integers(60, 121)) * scale
+        return (columns * cell_width, rows * 24 * scale), (rows, columns, cell_width)
+    if kind == "button":
+        return (
+            int(rng.integers(70, 181)) * scale,
+            int(rng.integers(26, 41)) * scale,
+        ), None
+    if kind == "text":
+        words = " ".join(rng.choice(WORDS, rng.integers(1, 7)).tolist())
+        (text_width, _), _ = cv2.getTextSize(
+            words, cv2.FONT_HERSHEY_SIMPLEX, 0.5 * scale, scale
+        )
+        return (text_width, 16 * scale), words
+    side = int(rng.integers(16, 33)) * scale
+    return (side, side), None
+
+
+def drawing_element(image, kind, box, text, rng, scale):
+    """
+    Draws an element in its box.
+
+    Args:
+        image (np.ndarray): The screenshot to draw on.
+        kind (str): The element's kind, "button", "text", "table" or "icon".
+        box (list): The [x, y, w, h] box of the element.
+        text: What `element_size` returned with the element's size.
+        rng (np.random.Generator): The generator choosing the element.
+        scale (int): The display scaling of the screenshot.
+
+    Returns:
+        list: The (kind, [x, y, w, h]) elements drawn, one per cell for a table.
+    """
+    x, y, width, height = box
+    color = tuple(int(channel) for channel in rng.integers(60, 220, 3))
+    if kind == "table":
+        rows, columns, cell_width = text
+        cells = []
+        for row in range(rows):
+            for column in range(columns):
+                cell = [
+                    x + column * cell_width,
+                    y + row * 24 * scale,
+                    cell_width,
+                    24 * scale,
+                ]
+                cv2.rectangle(
+                    image,
+                    (cell[0], cell[1]),
+                    (cell[0] + cell[2] - 1, cell[1] + cell[3] - 1),
+                    (120, 120, 120),
+                    scale,
+                )
+                drawing_text(image, rng.choice(WORDS), cell, scale)
+                cells.append(("cell", cell))
+        return cells
+    corner = (x + width - 1, y + height - 1)
+    if kind == "button":
+        cv2.rectangle(image, (x, y), corner, color, -1)
+        cv2.rectangle(image, (x, y), corner, (40, 40, 40), scale)
+        drawing_text(image, rng.choice(WORDS), box, scale)
+    elif kind == "text":
+        drawing_text(image, text, box, scale)
+    elif rng.integers(2):
+        radius = width // 2
+        cv2.circle(image, (x + radius, y + radius), radius, color, -1, cv2.LINE_AA)
+    else:
+        cv2.rectangle(image, (x, y), corner, color, -1)
+    return [(kind, box)]
+
+
+def drawing_text(image, text, box, scale):
+    """
+    Writes dark text centred in a box, shrinking nothing, so long text may spill over.
+
+    Args:
+        image (np.ndarray): The screenshot to draw on.
+        text (str): The text.
+        box (list): The [x, y, w, h] box to centre the text in.
+        scale (int): The display scaling of the screenshot.
+    """
+    (text_width, text_height), _ = cv2.getTextSize(
+        text, cv2.FONT_HERSHEY_SIMPLEX, 0.5 * scale, scale
+    )
+    cv2.putText(
+        image,
+        text,
+        (box[0] + (box[2] - text_width) // 2, box[1] + (box[3] + text_height) // 2),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        0.5 * scale,
+        (20, 20, 20),
+        scale,
+        cv2.LINE_AA,
+    )
@@ -1,6 +1,5 @@
 """Contains tools for interacting with PyAutoGUI"""
-import pyautogui
-import numpy as np
+from .capture import PyAutoGUICapture, X11Capture
 
 
 class System:
@@ -8,15 +7,19 @@ class System:
     This class provides methods for capturing screenshots and simulating mouse actions.
 
     Attributes:
-        None
+        backends (dict): The capture backend classes by name.
+        capture: The capture backend taking the screenshots.
 
     Methods:
-        - image(): Take a screenshot.
+        - image(region, out): Take a screenshot of the screen or part of it.
         - mouse(dataPoint, clicks): Move the mouse pointer to specified
           screen coordinates and perform the given number of mouse clicks.
+        - pointer(): Return the mouse pointer's screen coordinates.
 
     Notes:
-        This class only uses the PyAutoGUI library for system interactions.
+        This class uses the PyAutoGUI library for mouse actions, and by default
+        for screenshots. The "x11" backend grabs screenshots through X11 shared memory.
+        PyAutoGUI is only imported when first used, since importing it is slow.
         Please refer to the README for KeyFlare the latest installation instructions.
 
     Example:
@@ -25,18 +28,48 @@ class System:
         >>> print(screenshot.shape)  # Output: (screen_height, screen_width, 3)
         >>> dataPoint = (500, 300)  # Example screen coordinates
         >>> system.mouse(dataPoint)  # Performs a single left-click at (500, 300)
+        >>> fake = System(backend=ArrayCapture("images/tests.jpg"))
     """
 
-    def image(self):
+    backends = {
+        "pyautogui": PyAutoGUICapture,
+        "x11": X11Capture,
+    }
+
+    def __init__(self, backend="pyautogui"):
+        """
+        Chooses the capture backend.
+
+        Args:
+            backend (str or object, optional): The name of a backend in `backends`,
+                or a backend object with a `grab(region, out)` method,
+                such as an `ArrayCapture` for tests (default is "pyautogui").
+
+        Raises:
+            ValueError: If the backend's name is unknown.
+        """
+        if isinstance(backend, str):
+            if backend not in self.backends:
+                raise ValueError(f"Unknown capture backend: {backend}")
+            backend = self.backends[backend]()
+        self.capture = backend
+
+    def image(self, region=None, out=None):
         """
         Take a screenshot without your mouse in the image.
 
+        Args:
+            region (tuple, optional): The (left, top, width, height) part of the screen
+                to grab, where None grabs the whole screen (default is None).
+            out (np.ndarray, optional): An array of the screenshot's shape to write
+                it into instead of a new one, when the backend can (default is None).
+
         Returns:
-            np.ndarray: A NumPy array representing the screenshot image.
+            np.ndarray: A NumPy array representing the screenshot image, out if it was used.
 
         Notes:
-            This method uses the `pyautogui.screenshot()` function
-            to capture a screenshot of the entire current screen.
+            This method uses the capture backend, by default the
+            `pyautogui.screenshot()` function, to capture the current screen.
             PyAutoGUI has a number of system requirements that differ depending on the OS.
             Please check the README for the latest installation instructions for KeyFlare.
 
@@ -44,9 +77,10 @@ class System:
             >>> system = System()
             >>> screenshot = system.image()
             >>> print(screenshot.shape)  # Output: (screen_height, screen_width, 3)
+            >>> corner = system.image(region=(0, 0, 800, 600))
+            >>> screenshot = system.image(out=screenshot)  # Reuses the array
         """
-        screenshot = pyautogui.screenshot()
-        return np.array(screenshot)
+        return self.capture.grab(region, out)
 
     def mouse(self, datapoint, clicks=1, button="left", scroll_distance=None):
         """
@@ -57,7 +91,8 @@ class System:
             dataPoint (tuple or list, required):
                 A tuple or list representing the target screen coordinates (x, y).
             clicks (int, optional): The number of mouse clicks to perform (default is 1).
-            button (str, optional): The mouse button to use ('left' or 'right', default is 'left').
+            button (str, optional): The mouse button to use ('left' or 'right', default is 'left'),
+                where None only moves the pointer, such as before scrolling.
             scroll_distance (int or float, optional):
                 The distance to scroll the mouse wheel. Positive values scroll up, negatives down.
 
@@ -76,11 +111,28 @@ class System:
             >>> system.mouse(dataPoint, button='right')  # Performs a right-click at (500, 300)
             >>> system.mouse(dataPoint, scroll_distance=3)  # Scrolls up by 3 units
         """
+        import pyautogui  # pylint: disable=import-outside-toplevel
+
         pyautogui.moveTo(datapoint[0], datapoint[1])
         if button == "left":
             pyautogui.click(clicks=clicks)
         elif button == "right":
             pyautogui.click(clicks=clicks, button=pyautogui.RIGHT)
-        # Scroll is not used yet, but is implemented
         if scroll_distance is not None:
             pyautogui.scroll(scroll_distance)
+
+    def pointer(self):
+        """
+        Returns where the mouse pointer is.
+
+        Returns:
+            tuple: The (x, y) screen coordinates of the pointer.
+
+        Example:
+            >>> system = System()
+            >>> system.pointer()  # Output: (500, 300)
+        """
+        import pyautogui  # pylint: disable=import-outside-toplevel
+
+        x, y = pyautogui.position()
+        return x, y
@@ -0,0 +1,21 @@
+"""Fixtures shared by the test modules."""
+import os
+import numpy as np
+import pytest
+from PIL import Image
+
+
+@pytest.fixture
+def test_image():
+    """
+    Fixture that loads a test image from a file for consistent testing.
+
+    Returns:
+        np.ndarray: The test image as a NumPy array.
+    """
+    test_image_path = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        "images",
+        "tests.jpg",
+    )
+    return np.array(Image.open(test_image_path))
@@ -0,0 +1,82 @@
+"""Tests handing hotkey presses to the thread running the activations."""
+import time
+import threading
+from ..activations import Activations
+
+
+def test_coalescing():
+    """
+    Test coalescing repeated requests.
+
+    Assertions:
+        - Ensures that a pending request is replaced by a later one.
+        - Ensures that requests made while one is running are dropped.
+        - Ensures that requests are accepted again once it is done.
+        - Ensures that waiting gives up after the timeout.
+    """
+    activations = Activations()
+    activations.put("left")
+    activations.put("right")
+    assert activations.get() == "right"
+    activations.put("left")
+    assert activations.get(timeout=0) is None
+    activations.done()
+    activations.put("left")
+    assert activations.get(timeout=0) == "left"
+    assert (activations.requested, activations.coalesced) == (4, 2)
+
+
+def test_closing():
+    """
+    Test waking up a waiting thread to shut down.
+
+    Assertions:
+        - Ensures that closing ends a wait at once, with no request.
+        - Ensures that requests after closing are dropped.
+    """
+    activations = Activations()
+    taken = []
+    waiting = threading.Thread(target=lambda: taken.append(activations.get()))
+    waiting.start()
+    time.sleep(0.05)
+    started = time.perf_counter()
+    activations.close()
+    waiting.join()
+    assert time.perf_counter() - started < 0.1
+    assert taken == [None]
+    activations.put("left")
+    assert activations.get(timeout=0) is None
+
+
+def test_handoff_benchmark(benchmark):
+    """
+    Benchmark test for the time from the listener's thread requesting an
+    activation to the waiting thread taking it.
+
+    Assertions:
+        - Ensures that every request was taken.
+    """
+    activations = Activations()
+    requested = threading.Event()
+    taken = []
+
+    def listening():
+        while requested.wait() and not activations.closed:
+            requested.clear()
+            activations.put(time.perf_counter())
+
+    listener = threading.Thread(target=listening)
+    listener.start()
+
+    def handing():
+        requested.set()
+        started = activations.get()
+        taken.append(time.perf_counter() - started)
+        activations.done()
+
+    benchmark(handing)
+    activations.close()
+    requested.set()
+    listener.join()
+    benchmark.extra_info["median_wakeup_us"] = sorted(taken)[len(taken) // 2] * 1e6
+    assert taken
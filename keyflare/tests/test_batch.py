@@ -0,0 +1,141 @@
+# pylint: disable=redefined-outer-name
+"""Tests running the pipeline over archived screenshots and recordings."""
+import io
+import os
+import json
+import tempfile
+import cv2
+import pytest
+from PIL import Image
+from ..batch import (
+    batch,
+    main,
+    reading_binary,
+    reading_frames,
+    writing_binary,
+    writing_jsonl,
+)
+from ..image_pipeline import ImagePipeline
+from ..results import HintBoxes
+from ..synthetic import synthetic_screenshot
+
+
+@pytest.fixture
+def screenshots():
+    """
+    Fixture that saves synthetic screenshots into a temporary directory.
+
+    Returns:
+        tuple: The directory's path, and the screenshots by file name.
+    """
+    images = {
+        f"{seed}.png": synthetic_screenshot(640, 360, "high", seed)[0]
+        for seed in range(4)
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for name, image in images.items():
+            Image.fromarray(image).save(os.path.join(directory, name))
+        with open(os.path.join(directory, "notes.txt"), "w", encoding="utf8") as file:
+            file.write("Not a screenshot.")
+        yield directory, images
+
+
+def expected_results(images):
+    """
+    Runs the pipeline over each screenshot directly.
+
+    Args:
+        images (dict): The screenshots by name.
+
+    Returns:
+        list: The (name, coordinate_data) pairs.
+    """
+    results = []
+    for name, image in images.items():
+        y = ImagePipeline()
+        y.original_image = image
+        y.processing_image()
+        y.processing_data()
+        results.append((name, y.coordinate_data))
+    return results
+
+
+def test_batch_directory(screenshots):
+    """
+    Test processing a directory in this process and across a process pool.
+
+    Assertions:
+        - Ensures that only the images are processed, in name order.
+        - Ensures that both give what the pipeline gives for each screenshot.
+    """
+    directory, images = screenshots
+    expected = expected_results(images)
+    assert [name for name, _ in reading_frames(directory)] == list(images)
+    assert list(batch(directory, workers=0)) == expected
+    assert list(batch(directory, workers=2)) == expected
+
+
+def test_batch_backpressure(screenshots):
+    """
+    Test that screenshots are only read as the results are consumed.
+
+    Assertions:
+        - Ensures that no more than the backlog is read ahead of the first result.
+        - Ensures that every screenshot is processed in the end.
+    """
+    directory, images = screenshots
+    read = []
+
+    def frames():
+        for name, path in reading_frames(directory):
+            read.append(name)
+            yield name, path
+
+    results = batch(frames(), workers=1, backlog=2)
+    next(results)
+    assert len(read) <= 3
+    assert len(list(results)) == len(images) - 1
+
+
+def test_batch_video(screenshots):
+    """
+    Test processing the frames of a video.
+
+    Assertions:
+        - Ensures that every step-th frame is processed, named by its index.
+    """
+    directory, images = screenshots
+    path = os.path.join(directory, "recording.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 5, (640, 360))
+    for image in images.values():
+        writer.write(cv2.cvtColor(image, cv2.COLOR_RGB2BGR))
+    writer.release()
+    results = list(batch(path, workers=0, step=2))
+    assert [name for name, _ in results] == ["recording.avi#0", "recording.avi#2"]
+    assert all(coordinate_data for _, coordinate_data in results)
+
+
+def test_writing_results(screenshots, capsys):
+    """
+    Test writing results as JSON lines and as binary records.
+
+    Assertions:
+        - Ensures that a JSON line holds each screenshot's labels and boxes.
+        - Ensures that the binary records read back as the results.
+        - Ensures that the command line writes the same JSON lines.
+    """
+    directory, images = screenshots
+    results = expected_results(images)
+    text = io.StringIO()
+    assert writing_jsonl(results, text) == len(images)
+    lines = [json.loads(line) for line in text.getvalue().splitlines()]
+    assert [
+        (line["name"], HintBoxes(line["boxes"], line["labels"])) for line in lines
+    ] == results
+    binary = io.BytesIO()
+    results.append(("empty", HintBoxes([])))
+    assert writing_binary(results, binary) == len(images) + 1
+    binary.seek(0)
+    assert list(reading_binary(binary)) == results
+    main([directory, "--workers", "0"])
+    assert capsys.readouterr().out == text.getvalue()
@@ -0,0 +1,93 @@
+"""Tests keeping the boxes of the latest distinct screens."""
+import itertools
+import pytest
+from ..cache import ResultCache
+from ..capture import ArrayCapture
+from ..image_pipeline import ImagePipeline
+from ..synthetic import synthetic_screenshot
+from ..system import System
+
+
+def test_result_cache():
+    """
+    Test keeping entries and forgetting the least recently used one.
+
+    Assertions:
+        - Ensures that a lookup marks its entry as the most recently used.
+        - Ensures that the least recently used entry is forgotten when full.
+        - Ensures that hits and misses are counted, and cleared with the entries.
+        - Ensures that the capacity must be positive.
+    """
+    cache = ResultCache(capacity=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert list(cache.entries) == ["a", "c"]
+    assert cache.get("b") is None
+    assert (len(cache), cache.hits, cache.misses) == (2, 1, 1)
+    cache.clear()
+    assert (len(cache), cache.hits, cache.misses) == (0, 0, 0)
+    with pytest.raises(ValueError):
+        ResultCache(capacity=0)
+
+
+def test_cached_run():
+    """
+    Test activations switching between screens.
+
+    Assertions:
+        - Ensures that a screen seen before is given its cached boxes, which are
+          those of a detection.
+        - Ensures that changing the pipeline's settings detects the screen again.
+        - Ensures that cycling through more screens than the capacity never hits.
+    """
+    screens = [synthetic_screenshot(640, 360, "medium", seed)[0] for seed in range(3)]
+    pipeline = ImagePipeline()
+    pipeline.x = System(backend=ArrayCapture(screens[0]))
+    found = []
+    for screen in screens * 2:
+        pipeline.x.capture.frame = screen
+        pipeline.run()
+        found.append(pipeline.coordinate_data)
+    assert (pipeline.cache.hits, pipeline.cache.misses) == (3, 3)
+    assert found[:3] == found[3:]
+    fresh = ImagePipeline(cache=0)
+    fresh.x = System(backend=ArrayCapture(screens[2]))
+    fresh.run()
+    assert found[-1] == fresh.coordinate_data
+    pipeline.scale = 0.5
+    pipeline.run()
+    assert pipeline.cache.misses == 4
+    small = ImagePipeline(cache=2)
+    small.x = System(backend=ArrayCapture(screens[0]))
+    for screen in screens * 2:
+        small.x.capture.frame = screen
+        small.run()
+    assert (small.cache.hits, small.cache.misses) == (0, 6)
+
+
+@pytest.mark.parametrize("cache", [8, 0])
+def test_cache_benchmark(cache, benchmark):
+    """
+    Benchmark test for activations switching between three 1080p screens,
+    with and without the cache.
+
+    Assertions:
+        - Ensures that only the first activation of each screen misses the cache.
+    """
+    screens = itertools.cycle(
+        [synthetic_screenshot(1920, 1080, "high", seed)[0] for seed in range(3)]
+    )
+    pipeline = ImagePipeline(cache=cache)
+    pipeline.x = System(backend=ArrayCapture(next(screens)))
+    activations = []
+
+    def switching():
+        activations.append(None)
+        pipeline.x.capture.frame = next(screens)
+        pipeline.run()
+
+    benchmark(switching)
+    if cache:
+        assert pipeline.cache.misses == min(3, len(activations))
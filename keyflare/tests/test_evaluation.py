@@ -0,0 +1,79 @@
+"""Tests scoring the pipeline's configurations against ground-truth boxes."""
+import os
+import json
+import tempfile
+import numpy as np
+from PIL import Image
+from ..evaluation import (
+    CONFIGURATIONS,
+    evaluate,
+    format_table,
+    load_samples,
+    main,
+    scoring,
+    synthetic_samples,
+)
+
+
+def test_scoring():
+    """
+    Test scoring boxes by where they would be clicked.
+
+    Assertions:
+        - Ensures that recall counts the ground-truth boxes clicked by a box found.
+        - Ensures that precision counts the boxes found clicking a ground-truth box.
+        - Ensures that a fixed offset from the corner can miss a small element.
+    """
+    truth = [[0, 0, 20, 20], [100, 100, 8, 8]]
+    found = [[2, 2, 10, 10], [5, 5, 4, 4], [100, 100, 6, 6], [50, 50, 10, 10]]
+    assert scoring(found, truth) == (1.0, 0.75)
+    assert scoring(found, truth, offset=10) == (0.5, 0.5)
+    assert scoring([], truth) == (0.0, 1.0)
+
+
+def test_load_samples():
+    """
+    Test loading annotated screenshots from a JSON lines file.
+
+    Assertions:
+        - Ensures that the image is loaded relative to the file, as RGB.
+        - Ensures that the boxes are loaded as an (N, 4) array.
+    """
+    image = np.zeros((40, 60, 3), np.uint8)
+    image[10:20, 5:25] = (255, 0, 0)
+    with tempfile.TemporaryDirectory() as directory:
+        Image.fromarray(image).save(os.path.join(directory, "screen.png"))
+        path = os.path.join(directory, "annotations.jsonl")
+        with open(path, "w", encoding="utf8") as file:
+            file.write(json.dumps({"image": "screen.png", "boxes": [[5, 10, 20, 10]]}))
+            file.write("\n\n")
+        samples = load_samples(path)
+    assert len(samples) == 1
+    name, loaded, boxes = samples[0]
+    assert name == "screen.png"
+    assert np.array_equal(loaded, image)
+    assert boxes.tolist() == [[5, 10, 20, 10]]
+
+
+def test_evaluate(capsys):
+    """
+    Test evaluating configurations on synthetic screenshots.
+
+    Assertions:
+        - Ensures that there is a row per configuration, in order.
+        - Ensures that the scores are shares and that boxes were found.
+        - Ensures that the components engine finds at least what the contours engine finds.
+        - Ensures that the table and the command line report every configuration.
+    """
+    samples = synthetic_samples(densities=("low",))
+    rows = evaluate(samples, {"fast": {}, "components": {"extraction": "components"}})
+    assert [row["configuration"] for row in rows] == ["fast", "components"]
+    for row in rows:
+        assert 0 < row["recall"] <= 1 and 0 < row["precision"] <= 1
+        assert row["boxes"] > 0 and row["seconds"] > 0
+    assert rows[1]["recall"] >= rows[0]["recall"]
+    table = format_table(rows).splitlines()
+    assert len(table) == 3 and table[2].startswith("components")
+    main(["--json"])
+    printed = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [row["configuration"] for row in printed] == list(CONFIGURATIONS)
@@ -0,0 +1,141 @@
+"""Tests reusing full-frame arrays across activations, and the memory it saves."""
+import resource
+import tracemalloc
+import numpy as np
+import pytest
+from ..capture import ArrayCapture
+from ..frames import FrameBuffer, frame_fingerprint
+from ..gui import GUI
+from ..image_pipeline import ImagePipeline
+from ..system import System
+
+
+def activating(gui):
+    """
+    Runs one activation, from taking the screenshot to composing the overlay.
+
+    Args:
+        gui (GUI): The GUI whose pipeline takes the screenshot.
+
+    Returns:
+        np.ndarray: The overlay.
+    """
+    gui.y.run()
+    return gui.composing_overlay()
+
+
+def activation_peak(gui):
+    """
+    Measures the most memory allocated at once by Python and NumPy during an activation.
+
+    Args:
+        gui (GUI): The GUI whose pipeline takes the screenshot.
+
+    Returns:
+        int: The peak in bytes, above what was allocated before the activation.
+    """
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        activating(gui)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - start
+
+
+def test_frame_buffer_reuse():
+    """
+    Test reusing the arrays of a FrameBuffer.
+
+    Assertions:
+        - Ensures that an array is reused for the same shape and replaced for another.
+        - Ensures that fill stores and reuses the array produce writes into.
+        - Ensures that nothing is reused when reuse is False.
+    """
+    frames = FrameBuffer()
+    overlay = frames.get("overlay", (4, 6, 3))
+    assert frames.get("overlay", (4, 6, 3)) is overlay
+    assert frames.get("overlay", (6, 4, 3)) is not overlay
+    capture = ArrayCapture(np.ones((4, 6, 3), np.uint8))
+    screenshot = frames.fill("screenshot", lambda out: capture.grab(out=out))
+    assert frames.fill("screenshot", lambda out: capture.grab(out=out)) is screenshot
+    assert frames.allocations == 3
+    baseline = FrameBuffer(reuse=False)
+    assert baseline.get("overlay", (4, 6, 3)) is not baseline.get("overlay", (4, 6, 3))
+    assert baseline.fill("screenshot", lambda out: out) is None
+
+
+def test_frame_fingerprint(test_image):
+    """
+    Test fingerprinting frames.
+
+    Assertions:
+        - Ensures that frames of the same pixels have the same fingerprint,
+          whether or not they are contiguous.
+        - Ensures that changing one pixel, or the shape, changes the fingerprint.
+    """
+    fingerprint = frame_fingerprint(test_image)
+    assert frame_fingerprint(test_image.copy()) == fingerprint
+    padded = np.zeros((test_image.shape[0], test_image.shape[1] + 1, 3), np.uint8)
+    padded[:, :-1] = test_image
+    assert frame_fingerprint(padded[:, :-1]) == fingerprint
+    changed = test_image.copy()
+    changed[-1, -1, 0] ^= 1
+    assert frame_fingerprint(changed) != fingerprint
+    assert frame_fingerprint(test_image[:-1]) != fingerprint
+
+
+def test_activation_memory(test_image):
+    """
+    Test that repeated activations reuse their full-frame arrays.
+
+    Assertions:
+        - Ensures that no array is allocated after the first activation.
+        - Ensures that the overlays are the same as without reusing arrays.
+        - Ensures that an activation's peak allocation is at least halved.
+    """
+    reused, baseline = GUI(), GUI()
+    reused.y = ImagePipeline(cache=0)
+    baseline.y = ImagePipeline(frames=FrameBuffer(reuse=False), cache=0)
+    for gui in (reused, baseline):
+        gui.y.x = System(backend=ArrayCapture(test_image))
+        activating(gui)
+    allocations = reused.y.frames.allocations
+    assert np.array_equal(activating(reused), activating(baseline))
+    assert reused.y.frames.allocations == allocations
+    assert activation_peak(reused) * 2 < activation_peak(baseline)
+
+
+@pytest.mark.parametrize("reuse", [True, False])
+@pytest.mark.benchmark(min_rounds=10)
+def test_activation_memory_benchmark(test_image, reuse, benchmark):
+    """
+    Benchmark test for an activation, from the screenshot to the overlay,
+    with and without reusing full-frame arrays. The peak allocation of one activation,
+    the arrays allocated per activation and the process's peak resident memory
+    are stored in the benchmark's extra info.
+
+    Assertions:
+        - Ensures that the overlay has the screenshot's shape.
+    """
+    gui = GUI()
+    gui.y = ImagePipeline(frames=FrameBuffer(reuse=reuse), cache=0)
+    gui.y.x = System(backend=ArrayCapture(test_image))
+    activating(gui)
+    allocations = gui.y.frames.allocations
+    activations = []
+
+    def counting():
+        activations.append(None)
+        return activating(gui)
+
+    overlay = benchmark(counting)
+    benchmark.extra_info["allocations_per_activation"] = (
+        gui.y.frames.allocations - allocations
+    ) / len(activations)
+    benchmark.extra_info["peak_allocated_bytes"] = activation_peak(gui)
+    benchmark.extra_info["peak_rss_kib"] = resource.getrusage(
+        resource.RUSAGE_SELF
+    ).ru_maxrss
+    assert overlay.shape == test_image.shape
@@ -1 +1,309 @@
-# Testing a GUI requires automated testing, which is still in development.
+# pylint: disable=redefined-outer-name
+"""
+Tests the parts of the GUI that run without a window.
+Testing the window itself requires automated testing, which is still in development.
+"""
+import tempfile
+import tkinter as tk
+from types import SimpleNamespace
+import cv2
+import numpy as np
+import pytest
+from ..capture import ArrayCapture
+from ..gui import GUI
+from ..image_pipeline import ImagePipeline
+from ..system import System
+
+
+def started_gui(image):
+    """
+    Creates a GUI whose pipeline has processed an image, without opening a window.
+
+    Args:
+        image (np.ndarray): The image standing in for the screen.
+
+    Returns:
+        GUI: The GUI, with a stand-in for the window that `on_key` quits.
+    """
+    gui = GUI()
+    gui.y = ImagePipeline()
+    gui.y.x = System(backend=ArrayCapture(image))
+    gui.y.run()
+    gui.root = SimpleNamespace(quit=lambda: None)
+    return gui
+
+
+def test_encoding_overlay(test_image):
+    """
+    Test packing the overlay into a PPM image.
+
+    Assertions:
+        - Ensures that the header gives the screenshot's size.
+        - Ensures that the pixels are those of the overlay.
+        - Ensures that without labels, the pixels are the screenshot's, in RGB order.
+    """
+    gui = started_gui(test_image)
+    height, width = test_image.shape[:2]
+    header = f"P6 {width} {height} 255\n".encode()
+    ppm = gui.encoding_overlay()
+    assert ppm.startswith(header)
+    pixels = np.frombuffer(ppm[len(header) :], np.uint8).reshape(height, width, 3)
+    assert np.array_equal(pixels, gui.composing_overlay())
+    gui.y.coordinate_data = []
+    ppm = gui.encoding_overlay()
+    pixels = np.frombuffer(ppm[len(header) :], np.uint8).reshape(height, width, 3)
+    assert np.array_equal(pixels, test_image)
+
+
+@pytest.mark.parametrize("resolution", [(1920, 1080), (3840, 2160)])
+@pytest.mark.parametrize("encoding", ["ppm", "png"])
+@pytest.mark.benchmark(min_rounds=5)
+def test_redraw_benchmark(test_image, resolution, encoding, benchmark):
+    """
+    Benchmark test for the time from a keystroke to the image handed to Tk,
+    with the in-memory PPM image or the PNG file the GUI used to write and read.
+
+    Assertions:
+        - Ensures that the keystroke narrowed the labels down.
+        - Ensures that an image was produced.
+    """
+    image = cv2.resize(test_image, resolution, interpolation=cv2.INTER_CUBIC)
+    gui = started_gui(image)
+    labels = gui.y.coordinate_data
+    key = SimpleNamespace(char=labels[0][0][0])
+
+    def redrawing():
+        gui.y.hints.back()
+        gui.on_key(key)
+        if encoding == "ppm":
+            return gui.encoding_overlay()
+        overlay = cv2.cvtColor(gui.composing_overlay(), cv2.COLOR_RGB2BGR)
+        _, buffer = cv2.imencode(".png", overlay)
+        with tempfile.NamedTemporaryFile(suffix=".png") as temp_file:
+            temp_file.write(buffer.tobytes())
+            temp_file.flush()
+            with open(temp_file.name, "rb") as reading:
+                return reading.read()
+
+    assert benchmark(redrawing)
+    assert 0 < len(gui.y.coordinate_data) < len(labels)
+
+
+class RecordingCanvas:
+    """Stands in for a Tk canvas, recording how its items are configured."""
+
+    def __init__(self):
+        """Starts without any calls."""
+        self.calls = []
+
+    def itemconfigure(self, item, **options):
+        """Records the options given to an item."""
+        self.calls.append((item, options))
+
+
+def test_hiding_labels(test_image):
+    """
+    Test that keystrokes in "canvas" mode only touch the items of the labels.
+
+    Assertions:
+        - Ensures that both items of every label that stopped matching are hidden.
+        - Ensures that every remaining label's text is shortened to what is left to type.
+        - Ensures that nothing else is configured.
+        - Ensures that backspace shows the hidden items again, with their whole text.
+    """
+    gui = started_gui(test_image)
+    gui.overlay = "canvas"
+    gui.label = RecordingCanvas()
+    labels = gui.y.coordinate_data
+    gui.label_items = [(2 * index, 2 * index + 1) for index in range(len(labels))]
+    key = labels[0][0][0]
+    gui.on_key(SimpleNamespace(char=key))
+    kept = [index for index, (label, _) in enumerate(labels) if label[0] == key]
+    hidden = {
+        item for item, options in gui.label.calls if options == {"state": "hidden"}
+    }
+    texts = {
+        item: options["text"] for item, options in gui.label.calls if "text" in options
+    }
+    assert hidden == {
+        item
+        for index in set(range(len(labels))).difference(kept)
+        for item in (2 * index, 2 * index + 1)
+    }
+    assert texts == {2 * index + 1: labels[index][0][1:] for index in kept}
+    assert len(gui.label.calls) == len(hidden) + len(texts)
+    gui.label.calls.clear()
+    gui.on_key(SimpleNamespace(char="\b"))
+    shown = {
+        item for item, options in gui.label.calls if options == {"state": "normal"}
+    }
+    texts = {
+        item: options["text"] for item, options in gui.label.calls if "text" in options
+    }
+    assert shown == hidden
+    assert texts == {2 * index + 1: label for index, (label, _) in enumerate(labels)}
+    assert gui.y.coordinate_data == labels
+
+
+@pytest.fixture
+def tk_root():
+    """
+    Fixture that creates a Tk window, skipping the test without a display.
+
+    Returns:
+        tk.Tk: The window, destroyed after the test.
+    """
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("Tk needs a display")
+    yield root
+    root.destroy()
+
+
+@pytest.mark.parametrize("overlay", ["image", "canvas"])
+def test_overlay_redraw_benchmark(test_image, tk_root, overlay, benchmark):
+    """
+    Benchmark test for the time from a keystroke to Tk having redrawn the labels,
+    replacing the overlay's image or hiding the canvas items of the labels.
+
+    Assertions:
+        - Ensures that the keystroke narrowed the labels down.
+    """
+    gui = started_gui(test_image)
+    gui.overlay = overlay
+    gui.root = tk_root
+    labels = gui.y.coordinate_data
+    key = SimpleNamespace(char=labels[0][0][0])
+
+    def showing_all():
+        if gui.label:
+            gui.label.destroy()
+            gui.label = None
+        gui.y.hints.back()
+        gui.y.coordinate_data = labels
+        gui.label_items = None
+        gui.showing_labels()
+        tk_root.update()
+
+    def redrawing():
+        gui.on_key(key)
+        gui.showing_labels()
+        tk_root.update()
+
+    benchmark.pedantic(redrawing, setup=showing_all, rounds=10)
+    assert 0 < len(gui.y.coordinate_data) < len(labels)
+
+
+class RecordingWindow:
+    """Stands in for a Tk window, recording the names of the methods called."""
+
+    def __init__(self, children=()):
+        """Starts without any calls, holding the given children."""
+        self.calls = []
+        self.children = list(children)
+
+    def __getattr__(self, name):
+        """Returns a method recording its name."""
+        return lambda *args, **options: self.calls.append(name)
+
+    def winfo_children(self):
+        """Returns the children."""
+        return self.children
+
+
+def test_resident_window():
+    """
+    Test that a resident GUI keeps its window between activations.
+
+    Assertions:
+        - Ensures that showing the window empties and shows the existing one.
+        - Ensures that closing it only withdraws it, after releasing the grab,
+          and leaves its event loop.
+        - Ensures that a GUI that is not resident destroys its window.
+    """
+    child = RecordingWindow()
+    window = RecordingWindow([child])
+    gui = GUI(resident=True)
+    gui.root = window
+    gui.showing_window()
+    assert gui.root is window
+    assert child.calls == ["destroy"]
+    assert window.calls == ["deiconify", "focus_force"]
+    window.calls.clear()
+    gui.closing_window()
+    assert window.calls == ["grab_release", "withdraw", "update", "quit"]
+    gui = GUI()
+    gui.root = window
+    window.calls.clear()
+    gui.closing_window()
+    assert window.calls == ["destroy"]
+
+
+class TypingWindow(RecordingWindow):
+    """Stands in for a Tk window whose event loop types the given keys, one per loop."""
+
+    def __init__(self, gui, keys):
+        """Starts with the keys to type into the GUI."""
+        super().__init__()
+        self.gui = gui
+        self.keys = list(keys)
+
+    def winfo_exists(self):
+        """Returns whether the window was not destroyed."""
+        return "destroy" not in self.calls
+
+    def mainloop(self):
+        """Types the next key, like a keystroke ending Tk's event loop."""
+        self.calls.append("mainloop")
+        self.gui.on_key(SimpleNamespace(char=self.keys.pop(0)))
+
+
+def test_selecting_after_ignored_keys(test_image):
+    """
+    Test that backspace and keys without a character do not use up the keys
+    available for typing a label.
+
+    Assertions:
+        - Ensures that the label typed after them is clicked.
+        - Ensures that every key was read and the window was then closed.
+    """
+    gui = started_gui(test_image)
+    gui.showing_labels = lambda: None
+    clicked = []
+    gui.y.x.mouse = lambda point, **options: clicked.append(point)
+    label, box = max(gui.y.coordinate_data, key=lambda pair: len(pair[0]))
+    keys = ["\b", "", "", "\b", "", "", "\b"] + list(label)
+    gui.root = TypingWindow(gui, keys)
+    gui.selecting_coordinate(1, "left")
+    assert clicked == [[box[0] + 10, box[1] + 10]]
+    assert gui.root.keys == [] and gui.root.calls[-1] == "destroy"
+
+
+@pytest.mark.parametrize("resident", [True, False])
+def test_window_benchmark(test_image, tk_root, resident, benchmark):
+    """
+    Benchmark test for the time from an activation's screenshot to the labels
+    being drawn, in a resident window or in a window created for the activation.
+
+    Assertions:
+        - Ensures that the resident window is withdrawn after starting and kept.
+    """
+    gui = started_gui(test_image)
+    gui.resident = resident
+    if resident:
+        gui.root = tk_root
+        gui.starting()
+        assert tk_root.state() == "withdrawn"
+
+    def showing():
+        gui.showing_window()
+        gui.label = None
+        gui.label_items = None
+        gui.showing_labels()
+        gui.root.update()
+        gui.closing_window()
+
+    benchmark.pedantic(showing, rounds=5)
+    if resident:
+        assert gui.root is tk_root
@@ -0,0 +1,149 @@
+"""Tests narrowing down hint labels as they are typed, and how fast it is."""
+import itertools
+import string
+import pytest
+import numpy as np
+from ..hints import ALPHABET, HintIndex, hint_labels, label_digits
+
+
+def many_hints(count):
+    """
+    Creates labels of one and two letters, as many as requested, each with a box.
+
+    Args:
+        count (int): The number of labels.
+
+    Returns:
+        list: The (label, [x, y, w, h]) pairs, in no particular order.
+    """
+    keys = [
+        "".join(pair) for pair in itertools.product(string.ascii_lowercase, repeat=2)
+    ]
+    keys = (keys * (count // len(keys) + 1))[:count]
+    return [(key, [index, index, 5, 5]) for index, key in enumerate(reversed(keys))]
+
+
+def generated_labels(count):
+    """
+    Lists every label of the needed length and keeps the first ones, the way the
+    pipeline labelled boxes before.
+
+    Args:
+        count (int): The number of labels.
+
+    Returns:
+        list: The labels, as strings.
+    """
+
+    def generating(length, current=""):
+        for letter in ALPHABET:
+            if length == 1:
+                yield current + letter
+            else:
+                yield from generating(length - 1, current + letter)
+
+    length = 1
+    while len(ALPHABET) ** length <= count:
+        length += 1
+    return list(generating(length))[:count]
+
+
+@pytest.mark.parametrize("count", [1, 26, 27, 400, 676, 677, 20000])
+def test_hint_labels(count):
+    """
+    Test creating labels from their indices.
+
+    Assertions:
+        - Ensures that there are as many labels as requested, all different.
+        - Ensures that no label is the start of another.
+        - Ensures that labels are at most a letter shorter than the longest.
+        - Ensures that the letters of any indices are those of the whole set.
+        - Ensures that without mixing, the labels are those listed before.
+    """
+    labels = hint_labels(count)
+    assert len(labels) == len(set(labels)) == count
+    kept = set(labels)
+    assert not any(
+        label[:end] in kept for label in labels for end in range(1, len(label))
+    )
+    lengths = {len(label) for label in labels}
+    assert max(lengths) - min(lengths) <= 1
+    indices = np.arange(count)[::7]
+    digits, lengths = label_digits(indices, count)
+    assert [
+        "".join(ALPHABET[digit] for digit in row[:length])
+        for row, length in zip(digits.tolist(), lengths.tolist())
+    ] == [labels[index] for index in indices]
+    if count % len(ALPHABET):
+        assert hint_labels(count, mixed=False) == generated_labels(count)
+
+
+def test_narrowing_hints():
+    """
+    Test narrowing down and backing up against filtering the labels directly.
+
+    Assertions:
+        - Ensures that each typed character keeps the labels continuing with it.
+        - Ensures that characters are matched regardless of case.
+        - Ensures that backspace returns the previous matches, even with nothing typed.
+    """
+    labels = many_hints(2000)
+    hints = HintIndex(labels)
+    everything = hints.matches()
+    assert sorted(everything) == sorted(labels)
+    for typed in ["q", "qE", "qez"]:
+        hints.narrow(typed[-1])
+        expected = [
+            (key[len(typed) :], box)
+            for key, box in labels
+            if key.startswith(typed.lower())
+        ]
+        assert sorted(hints.matches()) == sorted(expected)
+    assert len(hints.matches()) == 0
+    hints.back()
+    hints.back()
+    assert sorted(hints.matches()) == sorted(
+        (key[1:], box) for key, box in labels if key.startswith("q")
+    )
+    hints.back()
+    hints.back()
+    assert hints.matches() == everything
+
+
+@pytest.mark.parametrize("count", [700, 5000, 20000])
+@pytest.mark.parametrize("method", ["arithmetic", "generator"])
+@pytest.mark.benchmark(min_rounds=10)
+def test_hint_labels_benchmark(count, method, benchmark):
+    """
+    Benchmark test for labelling boxes, computing the labels from their indices
+    or listing every label of the needed length like before.
+
+    Assertions:
+        - Ensures that every box gets a label.
+    """
+    labelling = hint_labels if method == "arithmetic" else generated_labels
+    assert len(benchmark(labelling, count)) == count
+
+
+@pytest.mark.parametrize("method", ["index", "filter"])
+@pytest.mark.benchmark(min_rounds=100)
+def test_keystroke_benchmark(method, benchmark):
+    """
+    Benchmark test for a keystroke over 5,000 labels, through the hint index or by
+    filtering every label like before.
+
+    Assertions:
+        - Ensures that the keystroke keeps only the labels starting with the key.
+    """
+    labels = many_hints(5000)
+    hints = HintIndex(labels)
+
+    def typing():
+        if method == "index":
+            hints.back()
+            hints.narrow("m")
+            return hints.matches()
+        return [(key[1:], box) for key, box in labels if key[0] == "m"]
+
+    matches = benchmark(typing)
+    assert len(matches) == sum(key[0] == "m" for key, _ in labels)
@@ -0,0 +1,188 @@
+"""Tests looking up the activation of each key seen by the keyboard listener."""
+import sys
+import json
+import enum
+import pytest
+from ..hotkeys import BINDINGS, Hotkeys
+
+
+class KeyCode:
+    """A stand-in for `pynput.keyboard.KeyCode`, compared and hashed the same way."""
+
+    def __init__(self, char=None):
+        self.char = char
+
+    def __repr__(self):
+        return f"'{self.char}'"
+
+    def __eq__(self, other):
+        return isinstance(other, KeyCode) and self.char == other.char
+
+    def __hash__(self):
+        return hash(repr(self))
+
+
+class Key(enum.Enum):
+    """A stand-in for `pynput.keyboard.Key`, whose members wrap a `KeyCode`."""
+
+    # pylint: disable=invalid-name
+
+    alt = KeyCode("alt")
+    alt_l = KeyCode("alt_l")
+    alt_r = KeyCode("alt_r")
+    ctrl_l = KeyCode("ctrl_l")
+    shift = KeyCode("shift")
+    enter = KeyCode("enter")
+
+
+TYPING = [KeyCode(char) for char in "the quick brown fox jumps over the lazy dog "]
+TYPING += [Key.shift, KeyCode("T"), Key.enter]
+
+
+def legacy(activations):
+    """
+    Returns the listener's former handlers, which test every combination's set.
+
+    Args:
+        activations (list): Where the requested buttons are appended.
+
+    Returns:
+        tuple: The on_press and on_release handlers.
+    """
+    # pylint: disable=use-a-generator
+    start_combination = [
+        {Key.alt, KeyCode(char="a")},
+        {Key.alt_l, KeyCode(char="a")},
+        {Key.alt, KeyCode(char="s")},
+        {Key.alt_l, KeyCode(char="s")},
+    ]
+    current = set()
+
+    def on_press(key):
+        if any([key in COMBO for COMBO in start_combination]):
+            current.add(key)
+            if len(current) == 2:
+                activations.append("right" if KeyCode(char="s") in current else "left")
+                current.clear()
+
+    def on_release(key):
+        if any([key in COMBO for COMBO in start_combination]):
+            current.discard(key)
+
+    return on_press, on_release
+
+
+def test_dispatching():
+    """
+    Test looking up the action of each key.
+
+    Assertions:
+        - Ensures that characters typed without a modifier have no action.
+        - Ensures that either alt key with a bound character gives its action.
+        - Ensures that a bound character typed in uppercase gives the same action.
+        - Ensures that releasing the modifier stops the character's action.
+        - Ensures that repeating a combination gives the same action object.
+    """
+    hotkeys = Hotkeys(Key)
+    assert all(hotkeys.pressing(key) is None for key in TYPING)
+    hotkeys.releasing(Key.shift)
+    assert hotkeys.pressing(Key.alt_r) is None
+    left = hotkeys.pressing(KeyCode("a"))
+    assert left == {
+        "clicks": 1,
+        "button": "left",
+        "scroll_distance": None,
+        "region": None,
+    }
+    assert hotkeys.pressing(KeyCode("A")) is left
+    assert hotkeys.pressing(KeyCode("q")) is None
+    assert hotkeys.pressing(KeyCode()) is None
+    assert hotkeys.pressing(KeyCode("w"))["scroll_distance"] == 5
+    assert hotkeys.pressing(KeyCode("r"))["region"] == (600, 400)
+    hotkeys.releasing(Key.alt_r)
+    assert hotkeys.pressing(KeyCode("a")) is None
+    hotkeys.pressing(Key.alt_l)
+    assert hotkeys.pressing(KeyCode("a")) is left
+    assert hotkeys.pressing(KeyCode("s"))["button"] == "right"
+
+
+def test_configuration(tmp_path):
+    """
+    Test binding actions from a JSON file and rejecting what is not understood.
+
+    Assertions:
+        - Ensures that the file's bindings are added to the defaults.
+        - Ensures that a combination bound to null is removed.
+        - Ensures that combinations of several modifiers need all of them held.
+        - Ensures that combinations without a modifier, unknown modifiers and
+          unknown options raise a ValueError.
+    """
+    path = tmp_path / "hotkeys.json"
+    path.write_text(json.dumps({"alt+a": None, "ctrl+alt+k": {"region": [0, 0, 9, 9]}}))
+    hotkeys = Hotkeys.from_environment(Key, str(path))
+    assert set(hotkeys.bindings) == set(BINDINGS) - {"alt+a"} | {"ctrl+alt+k"}
+    hotkeys.pressing(Key.alt)
+    assert hotkeys.pressing(KeyCode("a")) is None
+    assert hotkeys.pressing(KeyCode("k")) is None
+    hotkeys.pressing(Key.ctrl_l)
+    assert hotkeys.pressing(KeyCode("k"))["region"] == (0, 0, 9, 9)
+    assert set(Hotkeys.from_environment(Key, "").bindings) == set(BINDINGS)
+    for bindings in ({"a": {}}, {"hyper+a": {}}, {"alt+ab": {}}, {"alt+a": {"x": 1}}):
+        with pytest.raises(ValueError):
+            Hotkeys(Key, bindings)
+
+
+def test_rejecting_without_allocating():
+    """
+    Test that the keys of typing are rejected without allocating memory.
+
+    Assertions:
+        - Ensures that looking up thousands of keys leaves the number of
+          allocated blocks as it was.
+    """
+    hotkeys = Hotkeys(Key)
+    keys = TYPING * 200
+    for key in keys:
+        hotkeys.pressing(key)
+        hotkeys.releasing(key)
+    blocks = sys.getallocatedblocks()
+    for key in keys:
+        hotkeys.pressing(key)
+        hotkeys.releasing(key)
+    assert sys.getallocatedblocks() - blocks < 10
+
+
+@pytest.mark.parametrize("handlers", ["table", "legacy"])
+def test_keystroke_benchmark(benchmark, handlers):
+    """
+    Benchmark test for the listener's work on typing a sentence and then alt+a,
+    with the dispatch table and with the former handlers testing each set.
+
+    Assertions:
+        - Ensures that only alt+a requests an activation.
+    """
+    activations = []
+    if handlers == "table":
+        hotkeys = Hotkeys(Key)
+
+        def on_press(key):
+            action = hotkeys.pressing(key)
+            if action is not None:
+                activations.append(action["button"])
+
+        on_release = hotkeys.releasing
+    else:
+        on_press, on_release = legacy(activations)
+    alt, char = Key.alt_l, KeyCode("a")
+
+    def typing():
+        for key in TYPING:
+            on_press(key)
+            on_release(key)
+        on_press(alt)
+        on_press(char)
+        on_release(char)
+        on_release(alt)
+
+    benchmark(typing)
+    assert activations and set(activations) == {"left"}
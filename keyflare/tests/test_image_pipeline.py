@@ -1,28 +1,14 @@
-# pylint: disable=redefined-outer-name
 """
 Tests the image pipeline, the old and the new version, for improvements.
 """
-import os
+import cv2
 import numpy as np
 import pytest
-from PIL import Image
-from ..image_pipeline import ImagePipeline
-
-
-@pytest.fixture
-def test_image():
-    """
-    Fixture that loads a test image from a file for consistent testing.
-
-    Returns:
-        np.ndarray: The test image as a NumPy array.
-    """
-    test_image_path = os.path.join(
-        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-        "images",
-        "tests.jpg",
-    )
-    return np.array(Image.open(test_image_path))
+from ..capture import ArrayCapture
+from ..image_pipeline import ImagePipeline, channel_gray_tables
+from ..results import HintBoxes
+from ..system import System
+from ..tiles import split_tiles
 
 
 @pytest.mark.benchmark(min_rounds=10)
@@ -32,15 +18,15 @@ def test_image_pipeline(test_image, benchmark):
     - It measures the time take to process the image and extract coordinates of clickable locations.
 
     Assertions:
-        - Ensures that coordinate_data is a list.
+        - Ensures that coordinate_data is a HintBoxes.
         - Ensures that coordinate_data contains data.
         - Ensures that each item in coordinate_data is a pair of (key, coordinates).
     """
-    y = ImagePipeline()
-    y.x.image = lambda: test_image
+    y = ImagePipeline(cache=0)
+    y.x = System(backend=ArrayCapture(test_image))
     benchmark(y.run)
     coordinate_data = y.coordinate_data
-    assert isinstance(coordinate_data, list)
+    assert isinstance(coordinate_data, HintBoxes)
     assert len(coordinate_data) > 0
     assert len(coordinate_data[0]) == 2
 
@@ -56,9 +42,306 @@ def test_old_image_pipeline(test_image, benchmark):
         - Ensures that each item in coordinate_data is a pair of (key, coordinates).
     """
     y = ImagePipeline()
-    y.x.image = lambda: test_image
+    y.x = System(backend=ArrayCapture(test_image))
     benchmark(y.old_run)
     coordinate_data = y.coordinate_data
     assert isinstance(coordinate_data, dict), "I used a dictionary in my old process"
     assert len(coordinate_data) > 0, "More than 1 item is necessary"
     assert len(coordinate_data["aa"]) == 2, "Each item does not have two items"
+
+
+def test_suppression_engines_agree(test_image):
+    """
+    Compares the NumPy suppression engine against the original R-tree engine.
+
+    Assertions:
+        - Ensures that both engines keep exactly the same bounding boxes.
+    """
+    results = {}
+    for suppression in ("rtree", "numpy"):
+        y = ImagePipeline(suppression=suppression)
+        y.original_image = test_image
+        y.processing_image(slow=True)
+        y.processing_data()
+        results[suppression] = sorted(box for _, box in y.coordinate_data)
+    assert len(results["numpy"]) > 0
+    assert results["numpy"] == results["rtree"]
+
+
+@pytest.mark.parametrize("suppression", ["rtree", "numpy"])
+@pytest.mark.benchmark(min_rounds=10)
+def test_suppression_benchmark(test_image, benchmark, suppression):
+    """
+    Benchmark test for each suppression engine in ImagePipeline's processing_data method.
+
+    Assertions:
+        - Ensures that the suppression keeps some of the bounding boxes.
+    """
+    y = ImagePipeline(suppression=suppression)
+    y.original_image = test_image
+    y.processing_image(slow=True)
+    boxes = y.coordinate_data
+
+    def suppress():
+        y.coordinate_data = list(boxes)
+        y.processing_data()
+
+    benchmark(suppress)
+    assert 0 < len(y.coordinate_data) < len(boxes)
+
+
+def test_components_extraction(test_image):
+    """
+    Compares the connected components extraction against the contours extraction.
+
+    Assertions:
+        - Ensures that both engines return (N, 4) int32 arrays.
+        - Ensures that every outer contour's box is also found by the components engine.
+        - Ensures that the full pipeline still finds clickable places.
+    """
+    results = {}
+    for extraction in ("contours", "components"):
+        y = ImagePipeline(extraction=extraction)
+        y.original_image = test_image
+        y.processing_image()
+        assert y.coordinate_data.dtype == np.int32
+        assert y.coordinate_data.shape[1] == 4
+        results[extraction] = set(map(tuple, y.coordinate_data.tolist()))
+        y.processing_data()
+        assert len(y.coordinate_data) > 0
+    assert results["contours"] <= results["components"]
+
+
+@pytest.mark.parametrize("extraction", ["contours", "components"])
+@pytest.mark.benchmark(min_rounds=10)
+def test_extraction_benchmark(test_image, benchmark, extraction):
+    """
+    Benchmark test for each extraction engine in ImagePipeline's processing_image method.
+
+    Assertions:
+        - Ensures that the extraction finds bounding boxes.
+    """
+    y = ImagePipeline(extraction=extraction)
+    y.original_image = test_image
+
+    def extract():
+        y.coordinate_data = []
+        y.processing_image()
+
+    benchmark(extract)
+    assert len(y.coordinate_data) > 0
+
+
+def test_slow_mode_workers(test_image):
+    """
+    Compares slow mode's thread pool against a single thread and the original
+    full-frame merges used to derive the channel images.
+
+    Assertions:
+        - Ensures that the parallel passes return the same boxes in the same order.
+        - Ensures that the derived channel images match the merged ones.
+    """
+    results = []
+    for workers in (1, 4):
+        y = ImagePipeline(workers=workers)
+        y.original_image = test_image
+        y.processing_image(slow=True)
+        results.append(y.coordinate_data)
+    assert np.array_equal(results[0], results[1])
+    bsplit, gsplit, rsplit = cv2.split(test_image)
+    merged = [
+        cv2.merge([bsplit, gsplit * 0, rsplit * 0]),
+        cv2.merge([bsplit * 0, gsplit, rsplit * 0]),
+        cv2.merge([bsplit * 0, gsplit * 0, rsplit]),
+    ]
+    for channel, table in enumerate(channel_gray_tables()):
+        expected = cv2.cvtColor(merged[channel], cv2.COLOR_RGB2GRAY)
+        assert np.array_equal(cv2.LUT(cv2.split(test_image)[channel], table), expected)
+
+
+@pytest.mark.benchmark(min_rounds=10)
+def test_slow_image_pipeline(test_image, benchmark):
+    """
+    Benchmark test for ImagePipeline's processing_image method in slow mode.
+
+    Assertions:
+        - Ensures that slow mode finds bounding boxes.
+    """
+    y = ImagePipeline()
+    y.original_image = test_image
+
+    def extract():
+        y.coordinate_data = []
+        y.processing_image(slow=True)
+
+    benchmark(extract)
+    assert len(y.coordinate_data) > 0
+
+
+def test_incremental_detection(test_image):
+    """
+    Compares incremental detection, which only processes changed tiles,
+    against processing the whole screenshot.
+
+    Assertions:
+        - Ensures that an unchanged screenshot reuses the previous boxes.
+        - Ensures that a partly changed screenshot finds nearly the same boxes
+          as processing the whole screenshot.
+    """
+    changed = test_image.copy()
+    cv2.putText(
+        changed, "KeyFlare", (600, 500), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2
+    )
+    cv2.rectangle(changed, (100, 100), (180, 140), (0, 0, 255), 2)
+    y = ImagePipeline(incremental=True)
+    full = ImagePipeline()
+    for image in (test_image, test_image, changed):
+        for pipeline in (y, full):
+            pipeline.coordinate_data = []
+            pipeline.original_image = image
+            pipeline.processing_image()
+        if image is test_image:
+            assert np.array_equal(y.coordinate_data, full.coordinate_data)
+    y.processing_data()
+    full.processing_data()
+    found = {tuple(box) for _, box in y.coordinate_data}
+    expected = {tuple(box) for _, box in full.coordinate_data}
+    assert len(found ^ expected) <= 0.05 * len(expected)
+
+
+@pytest.mark.benchmark(min_rounds=10)
+def test_incremental_image_pipeline(test_image, benchmark):
+    """
+    Benchmark test for incremental detection on a screenshot with one small change.
+
+    Assertions:
+        - Ensures that incremental detection finds bounding boxes.
+    """
+    changed = test_image.copy()
+    cv2.rectangle(changed, (100, 100), (180, 140), (0, 0, 255), 2)
+    y = ImagePipeline(incremental=True)
+    frames = [test_image, changed]
+
+    def extract():
+        frames.reverse()
+        y.coordinate_data = []
+        y.original_image = frames[0]
+        y.processing_image()
+
+    extract()
+    benchmark(extract)
+    assert len(y.coordinate_data) > 0
+
+
+def test_detection_scale(test_image):
+    """
+    Tests downscaled detection and the automatic choice of its scale.
+
+    Assertions:
+        - Ensures that "auto" shrinks 1440p and 4K screenshots to about 1080 pixels tall.
+        - Ensures that the boxes found on a shrunk image lie within the screenshot.
+    """
+    y = ImagePipeline(scale="auto")
+    for height, scale in ((1080, 1.0), (1440, 0.75), (2160, 0.5)):
+        y.original_image = np.zeros((height, height * 16 // 9, 3), np.uint8)
+        assert y.detection_scale() == scale
+    y = ImagePipeline(scale=0.5)
+    y.original_image = test_image
+    y.processing_image()
+    boxes = y.coordinate_data
+    assert len(boxes) > 0
+    assert (boxes[:, :2] >= 0).all()
+    assert (boxes[:, 0] + boxes[:, 2] <= test_image.shape[1]).all()
+    assert (boxes[:, 1] + boxes[:, 3] <= test_image.shape[0]).all()
+
+
+@pytest.mark.parametrize("scale", [1.0, "auto"])
+@pytest.mark.parametrize("resolution", [(1920, 1080), (2560, 1440), (3840, 2160)])
+@pytest.mark.benchmark(min_rounds=5)
+def test_resolution_benchmark(test_image, benchmark, resolution, scale):
+    """
+    Benchmark test for ImagePipeline's run method at 1080p, 1440p and 4K,
+    with and without downscaled detection.
+
+    Assertions:
+        - Ensures that coordinate_data contains data.
+    """
+    image = cv2.resize(test_image, resolution, interpolation=cv2.INTER_CUBIC)
+    y = ImagePipeline(scale=scale)
+    y.x = System(backend=ArrayCapture(image))
+    benchmark(y.run)
+    assert len(y.coordinate_data) > 0
+
+
+def test_tiled_detection(test_image):
+    """
+    Compares tiled detection against processing a wide screenshot whole.
+
+    Assertions:
+        - Ensures that the tiles cover the screenshot and overlap their neighbours.
+        - Ensures that tiled detection finds nearly the same labelled boxes.
+    """
+    wide = np.concatenate([test_image, test_image], axis=1)
+    extents = split_tiles(wide.shape, 1024, 64)
+    assert len(extents) == 8
+    assert extents[1] == (960, 0, 2112, 1080)
+    results = []
+    for tiling in (None, 1024):
+        y = ImagePipeline(tiling=tiling, workers=4)
+        y.original_image = wide
+        y.processing_image()
+        y.processing_data()
+        results.append({tuple(box) for _, box in y.coordinate_data})
+    assert len(results[0] & results[1]) >= 0.9 * len(results[0])
+
+
+@pytest.mark.parametrize("tiling", [None, 1024])
+@pytest.mark.benchmark(min_rounds=5)
+def test_tiled_benchmark(test_image, benchmark, tiling):
+    """
+    Benchmark test for ImagePipeline's processing_image method on a 7680x2160
+    virtual desktop, whole and split into tiles.
+
+    Assertions:
+        - Ensures that the detection finds bounding boxes.
+    """
+    desktop = np.tile(test_image, (2, 4, 1))
+    y = ImagePipeline(tiling=tiling)
+    y.original_image = desktop
+
+    def extract():
+        y.coordinate_data = []
+        y.processing_image()
+
+    benchmark(extract)
+    assert len(y.coordinate_data) > 0
+
+
+def test_region_detection(test_image):
+    """
+    Compares detecting the boxes of a region against those of the whole screenshot.
+
+    Assertions:
+        - Ensures that the region's boxes are inside it, in the screenshot's coordinates.
+        - Ensures that fewer boxes are found in the region.
+        - Ensures that a region reaching past the screen is clipped to it.
+        - Ensures that the region's boxes are not kept in the cache, whose
+          screen is still found.
+    """
+    y = ImagePipeline()
+    y.x = System(backend=ArrayCapture(test_image))
+    y.run()
+    whole = len(y.coordinate_data)
+    y.run(region=[600, 300, 800, 500])
+    boxes = y.coordinate_data.boxes
+    assert 0 < len(boxes) < whole
+    assert boxes[:, 0].min() >= 600 and boxes[:, 1].min() >= 300
+    assert (boxes[:, 0] + boxes[:, 2]).max() <= 1400
+    assert (boxes[:, 1] + boxes[:, 3]).max() <= 800
+    y.run(region=(-100, -100, 400, 400))
+    boxes = y.coordinate_data.boxes
+    assert len(boxes) > 0 and boxes.min() >= 0
+    assert (boxes[:, :2] + boxes[:, 2:]).max() <= 300
+    y.run()
+    assert len(y.coordinate_data) == whole and len(y.cache) == 1
+    assert (y.cache.hits, y.cache.misses) == (1, 1)
@@ -0,0 +1,121 @@
+"""Tests recording the stages of activations, and what it costs when disabled."""
+import os
+import json
+import tempfile
+import tracemalloc
+import numpy as np
+import pytest
+from PIL import Image
+from ..capture import ArrayCapture
+from ..image_pipeline import ImagePipeline
+from ..instruments import Instruments
+from ..system import System
+
+
+def test_environment_toggle():
+    """
+    Test enabling the instruments with the `KEYFLARE_PROFILE` values.
+
+    Assertions:
+        - Ensures that no value, "" and "0" leave the instruments disabled.
+        - Ensures that "memory" traces memory as well as timing stages.
+        - Ensures that other values only time stages.
+    """
+    for value, enabled, memory in [
+        ("", False, False),
+        ("0", False, False),
+        ("1", True, False),
+        ("Memory", True, True),
+    ]:
+        instruments = Instruments.from_environment(value)
+        assert (instruments.enabled, instruments.memory) == (enabled, memory)
+
+
+def test_stage_records():
+    """
+    Test recording stages into the ring buffer and exporting them.
+
+    Assertions:
+        - Ensures that a disabled stage records nothing.
+        - Ensures that each record names its stage and activation, with its duration.
+        - Ensures that the memory allocated within a stage is reported.
+        - Ensures that only the latest records are kept.
+        - Ensures that the records are exported as JSON lines.
+    """
+    instruments = Instruments()
+    with instruments.stage("capture"):
+        pass
+    assert not instruments.records
+    instruments = Instruments(memory=True, capacity=3)
+    instruments.begin()
+    with instruments.stage("capture"):
+        kept = np.ones(1_000_000, np.uint8)
+    record = instruments.records[-1]
+    assert record["activation"] == 1 and record["stage"] == "capture"
+    assert record["seconds"] >= 0
+    assert record["allocated"] >= kept.nbytes and record["peak"] >= kept.nbytes
+    for name in ["detection", "suppression", "labelling"]:
+        with instruments.stage(name):
+            pass
+    assert [record["stage"] for record in instruments.records] == [
+        "detection",
+        "suppression",
+        "labelling",
+    ]
+    tracemalloc.stop()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "profile.jsonl")
+        instruments.export(path)
+        with open(path, encoding="utf8") as file:
+            assert [json.loads(line) for line in file] == list(instruments.records)
+
+
+def test_pipeline_stages():
+    """
+    Test that an activation of the pipeline records each of its stages.
+
+    Assertions:
+        - Ensures that capture, fingerprint, detection, suppression and labelling
+          are recorded in that order.
+        - Ensures that an activation on the same screen only records capture and
+          fingerprint, its boxes being cached.
+    """
+    test_image_path = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        "images",
+        "tests.jpg",
+    )
+    y = ImagePipeline(instruments=Instruments(enabled=True))
+    y.x = System(backend=ArrayCapture(np.array(Image.open(test_image_path))))
+    y.run()
+    y.run()
+    assert [
+        (record["activation"], record["stage"]) for record in y.instruments.records
+    ] == [
+        (1, "capture"),
+        (1, "fingerprint"),
+        (1, "detection"),
+        (1, "suppression"),
+        (1, "labelling"),
+        (2, "capture"),
+        (2, "fingerprint"),
+    ]
+
+
+@pytest.mark.parametrize("enabled", [False, True])
+@pytest.mark.benchmark(min_rounds=1000)
+def test_stage_overhead_benchmark(enabled, benchmark):
+    """
+    Benchmark test for the cost of an empty stage, disabled or timed.
+
+    Assertions:
+        - Ensures that only the timed stages are recorded.
+    """
+    instruments = Instruments(enabled=enabled, capacity=10)
+
+    def staging():
+        with instruments.stage("capture"):
+            pass
+
+    benchmark(staging)
+    assert bool(instruments.records) == enabled
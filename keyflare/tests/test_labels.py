@@ -0,0 +1,118 @@
+"""Tests drawing hint labels from the glyph atlas, and how fast it is."""
+import cv2
+import numpy as np
+import pytest
+from ..labels import LabelAtlas
+
+
+def many_labels(image, count, length=2, seed=0):
+    """
+    Places random labels over an image.
+
+    Args:
+        image (np.ndarray): The image the labels are placed over.
+        count (int): The number of labels.
+        length (int, optional): The number of letters in a label (default is 2).
+        seed (int, optional): The seed of the random placement (default is 0).
+
+    Returns:
+        list: The (label, [x, y, w, h]) pairs.
+    """
+    rng = np.random.default_rng(seed)
+    letters = rng.choice(list("etaoinsrhl"), (count, length))
+    xs = rng.integers(0, image.shape[1], count).tolist()
+    ys = rng.integers(0, image.shape[0], count).tolist()
+    return [("".join(label), [x, y, 10, 10]) for label, x, y in zip(letters, xs, ys)]
+
+
+def test_atlas_cells():
+    """
+    Test rasterizing the letters of the atlas.
+
+    Assertions:
+        - Ensures that the cells are rasterized once per colour.
+        - Ensures that every letter's cell holds the background and some text.
+        - Ensures that the last cell is blank.
+    """
+    atlas = LabelAtlas()
+    cells = atlas.cells((248, 93, 94))
+    assert atlas.cells((248, 93, 94)) is cells
+    assert cells.shape == (27, 20, 13 * 3)
+    pixels = cells.reshape(27, -1, 3)
+    background = (pixels == (248, 93, 94)).all(axis=2)
+    assert background[:26].any(axis=1).all()
+    assert (~background[:26]).any(axis=1).all()
+    assert background[26].all()
+
+
+def test_render_labels(test_image):
+    """
+    Test drawing labels, including some cut by the image's edges.
+
+    Assertions:
+        - Ensures that the pixels without labels are the screenshot's.
+        - Ensures that a label is its letters' cells blended over the screenshot.
+        - Ensures that labels past the right and bottom edges are clipped.
+    """
+    atlas = LabelAtlas()
+    height, width = test_image.shape[:2]
+    labels = [
+        ("et", [10, 10, 5, 5]),
+        ("abc", [width - 30, 40, 5, 5]),
+        ("zz", [100, height - 8, 5, 5]),
+    ]
+    out = atlas.render(test_image, labels, (248, 93, 94))
+    cells = atlas.cells((248, 93, 94)).reshape(27, 20, 13, 3)
+    covered = np.zeros(test_image.shape[:2], bool)
+    covered[10:30, 10:36] = covered[40:60, width - 30 :] = True
+    covered[height - 8 :, 100:126] = True
+    assert np.array_equal(out[~covered], test_image[~covered])
+    label = np.hstack([cells[4], cells[19]])
+    expected = cv2.addWeighted(label, 0.75, test_image[10:30, 10:36], 0.25, 0)
+    assert np.array_equal(out[10:30, 10:36], expected)
+    clipped = np.hstack([cells[0], cells[1], cells[2]])[:, :30]
+    expected = cv2.addWeighted(clipped, 0.75, test_image[40:60, width - 30 :], 0.25, 0)
+    assert np.array_equal(out[40:60, width - 30 :], expected)
+    clipped = np.hstack([cells[25], cells[25]])[:8]
+    expected = cv2.addWeighted(
+        clipped, 0.75, test_image[height - 8 :, 100:126], 0.25, 0
+    )
+    assert np.array_equal(out[height - 8 :, 100:126], expected)
+
+
+@pytest.mark.parametrize("renderer", ["atlas", "opencv"])
+@pytest.mark.benchmark(min_rounds=10)
+def test_render_benchmark(test_image, renderer, benchmark):
+    """
+    Benchmark test for drawing 2,500 labels over a 1080p screenshot with the atlas,
+    or with a rectangle and text drawn by OpenCV for every label like before.
+
+    Assertions:
+        - Ensures that the overlay has the screenshot's shape.
+    """
+    labels = many_labels(test_image, 2500)
+    atlas = LabelAtlas()
+    out = np.empty_like(test_image)
+
+    def drawing():
+        if renderer == "atlas":
+            return atlas.render(test_image, labels, (248, 93, 94), out)
+        np.copyto(out, test_image)
+        for key, loc in labels:
+            cv2.rectangle(
+                out, (loc[0], loc[1]), (loc[0] + 26, loc[1] + 20), (248, 93, 94), -1
+            )
+            text_size, _ = cv2.getTextSize(key, cv2.FONT_HERSHEY_PLAIN, 0.75, 1)
+            cv2.putText(
+                out,
+                key,
+                (loc[0] + (20 - text_size[0]) // 2, loc[1] + (20 + text_size[1]) // 2),
+                cv2.FONT_HERSHEY_COMPLEX_SMALL,
+                0.75,
+                (0, 0, 0),
+                1,
+                cv2.LINE_AA,
+            )
+        return cv2.addWeighted(out, 0.75, test_image, 0.25, 0, dst=out)
+
+    assert benchmark(drawing).shape == test_image.shape
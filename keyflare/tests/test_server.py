@@ -0,0 +1,225 @@
+# pylint: disable=redefined-outer-name
+"""Tests controlling a running KeyFlare over a Unix socket."""
+import os
+import sys
+import json
+import time
+import socket
+import tempfile
+import threading
+from types import SimpleNamespace
+import pytest
+from .. import server as server_module
+from ..capture import ArrayCapture
+from ..gui import GUI
+from ..image_pipeline import ImagePipeline
+from ..server import Handler, Server, main, sending
+from ..synthetic import synthetic_screenshot
+from ..system import System
+from ..usages import Usages
+
+
+@pytest.fixture
+def serving():
+    """
+    Fixture that serves a GUI whose screen is a synthetic screenshot, in a thread,
+    recording the activations and clicks instead of showing windows and clicking.
+
+    Returns:
+        tuple: The server, and the recorded activations and clicks.
+    """
+    gui = GUI()
+    gui.y.x = System(backend=ArrayCapture(synthetic_screenshot(640, 360, "high")[0]))
+    activations, clicked = [], []
+    gui.run = lambda clicks, button: activations.append((clicks, button))
+    gui.y.x.mouse = lambda point, clicks, button: clicked.append(
+        (point, clicks, button)
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        server = Server(gui, os.path.join(directory, "keyflare.sock"))
+        ready = threading.Event()
+        thread = threading.Thread(target=server.serve, args=(ready,))
+        thread.start()
+        ready.wait()
+        yield server, activations, clicked
+        if not server.stopped:
+            sending({"command": "stop"}, server.path)
+        thread.join()
+
+
+def test_server_commands(serving):
+    """
+    Test answering each command.
+
+    Assertions:
+        - Ensures that "detect" gives the labels and boxes of a detection.
+        - Ensures that "click" clicks a label's box where the GUI would.
+        - Ensures that unknown labels, unknown commands, malformed requests,
+          requests that are not objects and bad fields are answered with an
+          error, without stopping the server or closing the connection.
+        - Ensures that "activate" runs the GUI.
+        - Ensures that "stop" stops the server and removes the socket.
+    """
+    server, activations, clicks = serving
+    assert sending({"command": "ping"}, server.path) == {"ok": True}
+    answer = sending({"command": "detect"}, server.path)
+    fresh = ImagePipeline(cache=0)
+    fresh.x = System(backend=ArrayCapture(server.gui.y.x.capture.frame))
+    fresh.run()
+    assert answer["labels"] == fresh.coordinate_data.texts()
+    assert answer["boxes"] == fresh.coordinate_data.boxes.tolist()
+    label, box = answer["labels"][1], answer["boxes"][1]
+    message = {"command": "click", "label": label, "clicks": 2, "button": "right"}
+    assert sending(message, server.path) == {"ok": True, "box": box}
+    assert clicks == [([box[0] + 10, box[1] + 10], 2, "right")]
+    answer = sending({"command": "click", "label": "zzzz"}, server.path)
+    assert not answer["ok"] and answer["error"].startswith("KeyError")
+    assert not sending({"command": "dance"}, server.path)["ok"]
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(server.path)
+        connection.sendall(b"not json\n")
+        with connection.makefile("rb") as answers:
+            assert "JSON" in json.loads(answers.readline())["error"]
+            for request in (b"[1]\n", b'"x"\n', b"3\n"):
+                connection.sendall(request)
+                assert json.loads(answers.readline()) == {
+                    "ok": False,
+                    "error": "A request must be a JSON object",
+                }
+    for message in (
+        {"command": "activate", "clicks": "many"},
+        {"command": "activate", "button": "middle"},
+        {"command": "click", "label": 3},
+    ):
+        answer = sending(message, server.path)
+        assert not answer["ok"] and answer["error"].startswith("ValueError")
+    assert sending({"command": "activate", "clicks": 3}, server.path)["ok"]
+    assert activations == [(3, "left")]
+    assert sending({"command": "stop"}, server.path) == {"ok": True}
+    assert server.stopped
+    with pytest.raises(OSError):
+        sending({"command": "ping"}, server.path)
+
+
+def test_screen_changed(serving):
+    """
+    Test clicking a label after the screen changed since "detect".
+
+    Assertions:
+        - Ensures that "click" fails before any "detect".
+        - Ensures that "click" fails, without clicking, once a pixel changed.
+        - Ensures that a new "detect" makes its labels clickable again.
+    """
+    server, _, clicks = serving
+    answer = sending({"command": "click", "label": "e"}, server.path)
+    assert not answer["ok"] and "detect" in answer["error"]
+    label = sending({"command": "detect"}, server.path)["labels"][0]
+    server.gui.y.x.capture.frame[0, 0] ^= 255
+    answer = sending({"command": "click", "label": label}, server.path)
+    assert not answer["ok"] and "changed" in answer["error"]
+    assert not clicks
+    answer = sending({"command": "detect"}, server.path)
+    label, box = answer["labels"][0], answer["boxes"][0]
+    assert sending({"command": "click", "label": label}, server.path)["box"] == box
+    assert len(clicks) == 1
+
+
+def test_server_socket(serving):
+    """
+    Test starting a server where a socket already is.
+
+    Assertions:
+        - Ensures that a second server on a live socket refuses to start.
+        - Ensures that a socket left behind by a server that died is replaced.
+    """
+    server = serving[0]
+    with pytest.raises(RuntimeError):
+        Server(server.gui, server.path).serve()
+    path = server.path + ".stale"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+        stale.bind(path)
+    stale = Server(server.gui, path)
+    stale.stopped = True
+    stale.serve()
+    assert not os.path.exists(path)
+
+
+def test_idle_connection(serving, monkeypatch):
+    """
+    Test that a client connecting without sending anything does not hold up others.
+
+    Assertions:
+        - Ensures that another client is answered once the idle connection
+          times out.
+        - Ensures that the idle connection is then closed by the server.
+    """
+    server, _, _ = serving
+    monkeypatch.setattr(Handler, "timeout", 0.2)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as idle:
+        idle.connect(server.path)
+        started = time.perf_counter()
+        assert sending({"command": "ping"}, server.path, timeout=5) == {"ok": True}
+        assert time.perf_counter() - started < 2
+        assert idle.recv(1) == b""
+
+
+def test_client(serving, capsys, monkeypatch):
+    """
+    Test the command line sending commands to the server.
+
+    Assertions:
+        - Ensures that `keyflare send` prints the answer and reports success.
+        - Ensures that `keyflare <clicks> <button>` activates the server's GUI
+          instead of creating one.
+        - Ensures that failing or missing servers are reported.
+    """
+    server, activations, _ = serving
+    assert main(["--socket", server.path, "detect"]) == 0
+    assert json.loads(capsys.readouterr().out)["labels"]
+    assert main(["--socket", server.path, "click", "zzzz"]) == 1
+    monkeypatch.setenv("KEYFLARE_SOCKET", server.path)
+    monkeypatch.setattr(sys, "argv", ["keyflare", "2", "right"])
+    assert Usages()._z is None  # pylint: disable=protected-access
+    assert activations == [(2, "right")]
+    assert main(["--socket", server.path + ".missing", "stop"]) == 1
+    assert "No server" in capsys.readouterr().err
+
+
+def test_stuck_server(monkeypatch):
+    """
+    Test that `keyflare <clicks> <button>` does not wait forever for a server
+    that listens but never answers.
+
+    Assertions:
+        - Ensures that the activation runs in this process once "ping" times out.
+    """
+    activations = []
+    gui = SimpleNamespace(
+        run=lambda clicks, button: activations.append((clicks, button))
+    )
+    monkeypatch.setattr(Usages, "z", property(lambda usage: gui))
+    monkeypatch.setattr(server_module, "PING_TIMEOUT", 0.2)
+    monkeypatch.setattr(sys, "argv", ["keyflare", "1", "left"])
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "keyflare.sock")
+        monkeypatch.setenv("KEYFLARE_SOCKET", path)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stuck:
+            stuck.bind(path)
+            stuck.listen()
+            started = time.perf_counter()
+            Usages()
+            assert time.perf_counter() - started < 2
+    assert activations == [(1, "left")]
+
+
+def test_server_benchmark(serving, benchmark):
+    """
+    Benchmark test for a "detect" command on an unchanged screen, from the
+    client's request to its answer.
+
+    Assertions:
+        - Ensures that the labels were answered.
+    """
+    server = serving[0]
+    answer = benchmark(sending, {"command": "detect"}, server.path)
+    assert answer["labels"]
@@ -0,0 +1,132 @@
+"""Tests detecting the screen's boxes in the background before an activation."""
+import time
+import pytest
+from ..capture import ArrayCapture
+from ..frames import frame_fingerprint
+from ..image_pipeline import ImagePipeline
+from ..instruments import Instruments
+from ..speculation import Speculation
+from ..synthetic import synthetic_screenshot
+from ..system import System
+
+
+def capturing_pipeline(image, **options):
+    """
+    Creates a pipeline whose screen is an image.
+
+    Args:
+        image (np.ndarray): The image standing in for the screen.
+        **options: Keyword arguments of `ImagePipeline`.
+
+    Returns:
+        ImagePipeline: The pipeline.
+    """
+    pipeline = ImagePipeline(**options)
+    pipeline.x = System(backend=ArrayCapture(image))
+    return pipeline
+
+
+def test_speculation_step():
+    """
+    Test capturing and detecting once, waiting for the screen to settle.
+
+    Assertions:
+        - Ensures that a screen is only detected once it was captured twice the same.
+        - Ensures that an unchanged screen is not detected again.
+        - Ensures that the boxes are those of a detection after the activation's capture.
+        - Ensures that the boxes are only given for the screen they were found on.
+    """
+    first = synthetic_screenshot(640, 360, "medium", 0)[0]
+    second = synthetic_screenshot(640, 360, "medium", 1)[0]
+    speculation = Speculation(capturing_pipeline(first), settle=True)
+    assert [speculation.step() for _ in range(3)] == [False, True, False]
+    speculation.pipeline.x.capture.frame = second
+    assert [speculation.step() for _ in range(3)] == [False, True, False]
+    assert speculation.detections == 2
+    fresh = capturing_pipeline(second)
+    fresh.run()
+    settings = fresh.detection_settings()
+    assert speculation.result(frame_fingerprint(second), settings) == (
+        fresh.coordinate_data
+    )
+    assert speculation.result(frame_fingerprint(first), settings) is None
+    assert (speculation.hits, speculation.misses) == (1, 1)
+
+
+def test_speculative_run():
+    """
+    Test an activation using the boxes detected in the background.
+
+    Assertions:
+        - Ensures that an unchanged screen is given the background's boxes, with
+          the labels narrowing down as after a detection, without detecting.
+        - Ensures that a changed screen is detected again.
+        - Ensures that boxes found with other detection settings are not used.
+    """
+    image = synthetic_screenshot(640, 360, "medium", 0)[0]
+    fresh = capturing_pipeline(image)
+    fresh.run()
+    pipeline = capturing_pipeline(image, instruments=Instruments(enabled=True))
+    pipeline.speculation = Speculation(capturing_pipeline(image))
+    pipeline.speculation.step()
+    pipeline.run()
+    stages = [record["stage"] for record in pipeline.instruments.records]
+    assert stages == ["capture", "fingerprint"]
+    assert pipeline.coordinate_data == fresh.coordinate_data
+    label = pipeline.coordinate_data.texts()[0]
+    pipeline.hints.narrow(label[0])
+    assert len(pipeline.hints.matches()) < len(fresh.coordinate_data)
+    pipeline.x.capture.frame = synthetic_screenshot(640, 360, "medium", 1)[0]
+    pipeline.run()
+    assert "detection" in [record["stage"] for record in pipeline.instruments.records]
+    assert pipeline.speculation.misses == 1
+    scaled = capturing_pipeline(image)
+    scaled.scale = 0.5
+    scaled.speculation = Speculation(capturing_pipeline(image))
+    scaled.speculation.step()
+    scaled.run()
+    assert (scaled.speculation.hits, scaled.speculation.misses) == (0, 1)
+    assert scaled.coordinate_data != pipeline.speculation.latest[2]
+
+
+def test_speculation_thread():
+    """
+    Test capturing in a background thread.
+
+    Assertions:
+        - Ensures that the thread detects the screen on its own.
+        - Ensures that a paused thread stops promptly and can be stopped twice.
+    """
+    image = synthetic_screenshot(640, 360, "low", 0)[0]
+    speculation = Speculation(capturing_pipeline(image), interval=0.01)
+    speculation.start()
+    deadline = time.monotonic() + 10
+    while speculation.detections == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert speculation.detections == 1
+    speculation.pause()
+    started = time.monotonic()
+    speculation.stop()
+    speculation.stop()
+    assert speculation.thread is None
+    assert time.monotonic() - started < 5
+
+
+@pytest.mark.parametrize("speculative", [True, False])
+def test_speculation_benchmark(speculative, benchmark):
+    """
+    Benchmark test for an activation on an unchanged 1080p screen, with the boxes
+    detected in the background or detected after the capture.
+
+    Assertions:
+        - Ensures that the same boxes are found either way.
+    """
+    image = synthetic_screenshot(1920, 1080, "high", 0)[0]
+    pipeline = capturing_pipeline(image, cache=0)
+    if speculative:
+        pipeline.speculation = Speculation(capturing_pipeline(image))
+        pipeline.speculation.step()
+    benchmark(pipeline.run)
+    fresh = capturing_pipeline(image)
+    fresh.run()
+    assert pipeline.coordinate_data == fresh.coordinate_data
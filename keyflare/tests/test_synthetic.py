@@ -0,0 +1,149 @@
+# pylint: disable=redefined-outer-name
+"""
+Benchmarks each stage of the pipeline on synthetic screenshots of every resolution
+and density, flagging regressions against the baselines stored beside this file.
+Run with `KEYFLARE_BASELINE=record` to store the current results as the baselines.
+"""
+import os
+import json
+import tracemalloc
+import warnings
+from functools import lru_cache
+import numpy as np
+import pytest
+from ..capture import ArrayCapture
+from ..hints import HintIndex, hint_codes
+from ..image_pipeline import ImagePipeline
+from ..results import HintBoxes
+from ..suppression import suppress_overlaps
+from ..synthetic import DENSITIES, RESOLUTIONS, synthetic_screenshot
+from ..system import System
+
+BASELINES = os.path.join(os.path.dirname(__file__), "baselines", "synthetic.json")
+TIME_TOLERANCE = 0.5
+MEMORY_TOLERANCE = 0.1
+STAGES = ["capture", "detection", "slow detection", "suppression", "labelling"]
+
+
+@lru_cache(maxsize=1)
+def screenshot(resolution, density):
+    """
+    Draws the synthetic screenshot of a resolution and density, once in a row.
+
+    Args:
+        resolution (str): A name of `RESOLUTIONS`.
+        density (str): A name of `DENSITIES`.
+
+    Returns:
+        np.ndarray: The screenshot.
+    """
+    return synthetic_screenshot(*RESOLUTIONS[resolution], density)[0]
+
+
+@pytest.fixture(scope="module")
+def baselines():
+    """
+    Fixture that loads the stored baselines, and stores the results measured by the
+    tests after they ran when `KEYFLARE_BASELINE` is "record".
+
+    Returns:
+        tuple: The stored baselines and the measured results by test, each with
+            the median "seconds" and the "peak" bytes.
+    """
+    stored = {}
+    if os.path.exists(BASELINES):
+        with open(BASELINES, encoding="utf8") as file:
+            stored = json.load(file)
+    results = {}
+    yield stored, results
+    if os.environ.get("KEYFLARE_BASELINE") == "record" and results:
+        stored.update(results)
+        os.makedirs(os.path.dirname(BASELINES), exist_ok=True)
+        with open(BASELINES, "w", encoding="utf8") as file:
+            json.dump(dict(sorted(stored.items())), file, indent=2)
+            file.write("\n")
+
+
+def stage_runner(stage, image):
+    """
+    Prepares a stage of the pipeline to run on a screenshot, like an activation would.
+
+    Args:
+        stage (str): A name of `STAGES`.
+        image (np.ndarray): The screenshot.
+
+    Returns:
+        callable: The function running the stage.
+    """
+    y = ImagePipeline()
+    y.x = System(backend=ArrayCapture(image))
+    y.original_image = image
+    if stage == "capture":
+        return lambda: y.frames.fill("screenshot", lambda out: y.x.image(out=out))
+    if stage in ("detection", "slow detection"):
+        return lambda: y.processing_image(slow=stage == "slow detection")
+    y.processing_image(slow=True)
+    boxes = np.asarray(y.coordinate_data, np.int32)
+    if stage == "suppression":
+        return lambda: suppress_overlaps(boxes)
+    kept = boxes[suppress_overlaps(boxes)]
+    return lambda: HintIndex(HintBoxes(kept, hint_codes(len(kept))))
+
+
+def stage_peak(running):
+    """
+    Measures the most memory allocated at once by Python and NumPy while a stage runs.
+
+    Args:
+        running (callable): The stage.
+
+    Returns:
+        int: The peak in bytes, above what was allocated before the stage.
+    """
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        running()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - start
+
+
+@pytest.mark.parametrize("stage", STAGES)
+@pytest.mark.parametrize("density", list(DENSITIES))
+@pytest.mark.parametrize("resolution", list(RESOLUTIONS))
+def test_synthetic_benchmark(resolution, density, stage, baselines, benchmark):
+    """
+    Benchmark test for a stage of the pipeline on a synthetic screenshot.
+
+    Assertions:
+        - Ensures that the peak memory is within `MEMORY_TOLERANCE` of the baseline.
+
+    Notes:
+        - Being over `TIME_TOLERANCE` slower than the baseline only warns, since
+          the timings depend on the machine, and is only checked when benchmarking.
+    """
+    stored, results = baselines
+    name = f"{stage}-{resolution}-{density}"
+    running = stage_runner(stage, screenshot(resolution, density))
+    peak = stage_peak(running)
+    benchmark.pedantic(running, rounds=3, warmup_rounds=1)
+    result = {"peak": peak}
+    if benchmark.stats:
+        result["seconds"] = benchmark.stats.stats.median
+    results[name] = result
+    baseline = stored.get(name)
+    if baseline is None or os.environ.get("KEYFLARE_BASELINE") == "record":
+        return
+    if "seconds" in result and result["seconds"] > baseline["seconds"] * (
+        1 + TIME_TOLERANCE
+    ):
+        warnings.warn(
+            f"{name} took {result['seconds']:.4f}s, "
+            f"against {baseline['seconds']:.4f}s in the baseline."
+        )
+    assert peak <= baseline["peak"] * (1 + MEMORY_TOLERANCE) + 65536, (
+        f"{name} allocated a peak of {peak} bytes, "
+        f"against {baseline['peak']} bytes in the baseline."
+    )
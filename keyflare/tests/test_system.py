@@ -1,8 +1,12 @@
 # pylint: disable=redefined-outer-name
 """Tests the system class to ensure a high efficiency for every photo taken."""
 import os
+import sys
+from types import SimpleNamespace
 import pytest
 import numpy as np
+from PIL import Image
+from ..capture import ArrayCapture, PyAutoGUICapture
 from ..system import System
 
 test_image_path = os.path.join(
@@ -42,5 +46,74 @@ def test_capture_screenshot_benchmark(system_instance, benchmark):
     assert isinstance(result, np.ndarray)
 
 
+def test_array_capture_region():
+    """
+    Tests the fake capture backend and the region argument of System's image() method.
+
+    Assertions:
+        - Ensures that the whole image and a region of it are captured.
+        - Ensures that the capture is a copy, so changing it leaves the backend intact.
+    """
+    frame = np.arange(6 * 8 * 3, dtype=np.uint8).reshape(6, 8, 3)
+    system = System(backend=ArrayCapture(frame))
+    assert np.array_equal(system.image(), frame)
+    region = system.image(region=(2, 1, 4, 3))
+    assert np.array_equal(region, frame[1:4, 2:6])
+    region[:] = 0
+    assert np.array_equal(system.image(region=(2, 1, 4, 3)), frame[1:4, 2:6])
+    with pytest.raises(ValueError):
+        System(backend="unknown")
+
+
+def test_pyautogui_capture_writable(monkeypatch):
+    """
+    Tests that the PyAutoGUI backend returns arrays that can be written to,
+    like the other backends, with a stand-in for PyAutoGUI's screenshot.
+
+    Assertions:
+        - Ensures that a new screenshot is a writable copy of the pixels.
+        - Ensures that a screenshot is copied into the given array.
+    """
+    frame = np.arange(6 * 8 * 3, dtype=np.uint8).reshape(6, 8, 3)
+    fake = SimpleNamespace(screenshot=lambda region: Image.fromarray(frame))
+    monkeypatch.setitem(sys.modules, "pyautogui", fake)
+    capture = PyAutoGUICapture()
+    image = capture.grab()
+    assert image.flags.writeable and np.array_equal(image, frame)
+    out = np.zeros_like(frame)
+    assert capture.grab(out=out) is out and np.array_equal(out, frame)
+
+
+@pytest.mark.parametrize("backend", ["array", "pyautogui", "x11"])
+@pytest.mark.parametrize("resolution", [(1280, 720), (1920, 1080), (3840, 2160)])
+@pytest.mark.benchmark(min_rounds=10)
+def test_capture_backend_benchmark(benchmark, backend, resolution):
+    """
+    Benchmark test comparing the capture latency of each backend at several resolutions,
+    with the fake "array" backend's copy of an image in memory as the reference.
+
+    Args:
+        benchmark: The benchmark fixture provided by pytest-benchmark.
+        backend (str): The capture backend's name.
+        resolution (tuple): The (width, height) of the region captured.
+
+    Assertions:
+        - Ensures that the captured screenshot has the region's shape.
+    """
+    width, height = resolution
+    if backend == "array":
+        system = System(backend=ArrayCapture(np.zeros((2160, 3840, 3), np.uint8)))
+    else:
+        try:
+            system = System(backend=backend)
+            screen = system.image()
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            pytest.skip(f"The {backend} backend is unavailable: {error}")
+        if screen.shape[0] < height or screen.shape[1] < width:
+            pytest.skip("The screen is smaller than the region.")
+    result = benchmark(system.image, (0, 0, width, height))
+    assert result.shape == (height, width, 3)
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -1 +1,131 @@
-# This class requires testing for GUI to be done first, which is not yet ready.
+"""Tests how quickly KeyFlare starts, and that each run only imports what it needs."""
+import os
+import sys
+import time
+import tempfile
+import threading
+import subprocess
+from types import SimpleNamespace
+from ..activations import Activations
+from ..usages import Usages
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFERRED = ["rtree", "pytesseract", "pyautogui", "pynput", "keyflare.batch"]
+
+
+def import_times(statement):
+    """
+    Runs an import in a new interpreter with `-X importtime`.
+
+    Args:
+        statement (str): The import statement.
+
+    Returns:
+        dict: The cumulative microseconds of each module imported, by name.
+    """
+    finished = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in finished.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_import_deferred():
+    """
+    Test that importing KeyFlare leaves the heavy modules for the runs needing them.
+
+    Assertions:
+        - Ensures that importing the package imports none of its modules.
+        - Ensures that importing Usages does not import the GUI, OpenCV or Tk.
+        - Ensures that importing the GUI does not import the optional engines,
+          PyAutoGUI or the shortcuts' listener.
+        - Ensures that the package's classes are still found by name.
+    """
+    package = import_times("import keyflare")
+    assert not [name for name in package if name.startswith("keyflare.")]
+    usages = import_times("import keyflare.usages")
+    for name in ["keyflare.gui", "cv2", "tkinter"] + DEFERRED:
+        assert name not in usages
+    gui = import_times("from keyflare import GUI")
+    assert "keyflare.image_pipeline" in gui
+    for name in DEFERRED:
+        assert name not in gui
+
+
+def test_batch_without_gui(capsys):
+    """
+    Test that `keyflare batch` runs without creating the GUI.
+
+    Assertions:
+        - Ensures that the batch tools ran and reported the screenshots processed.
+        - Ensures that the GUI was never created.
+    """
+    argv = sys.argv
+    with tempfile.TemporaryDirectory() as directory:
+        sys.argv = ["keyflare", "batch", directory, "--workers", "0"]
+        try:
+            usage = Usages()
+        finally:
+            sys.argv = argv
+    assert "Processed 0 screenshots" in capsys.readouterr().err
+    assert usage._z is None  # pylint: disable=protected-access
+
+
+def test_activating():
+    """
+    Test running the activations requested by the shortcuts.
+
+    Assertions:
+        - Ensures that activations run one at a time on the waiting thread.
+        - Ensures that exiting from the GUI stops the loop after its activation.
+        - Ensures that closing the activations stops the loop at once.
+    """
+    usage = Usages.__new__(Usages)
+    usage.activations = Activations()
+    gui = SimpleNamespace(exit_flag=False, runs=[])
+
+    def run(clicks, button):
+        gui.runs.append((clicks, button, threading.current_thread()))
+        gui.exit_flag = len(gui.runs) == 2
+
+    gui.run = run
+    usage._z = gui  # pylint: disable=protected-access
+    worker = threading.Thread(target=usage.activating)
+    worker.start()
+    usage.activations.put({"clicks": 1, "button": "right"})
+    while not gui.runs or usage.activations.busy:
+        time.sleep(0.01)
+    usage.activations.put({"clicks": 2, "button": "left"})
+    worker.join(5)
+    assert gui.runs == [(1, "right", worker), (2, "left", worker)]
+    gui.exit_flag = False
+    worker = threading.Thread(target=usage.activating)
+    worker.start()
+    usage.activations.close()
+    worker.join(5)
+    assert not worker.is_alive() and len(gui.runs) == 2
+
+
+def test_import_benchmark(benchmark):
+    """
+    Benchmark test for starting KeyFlare, importing what `keyflare 1 left` needs
+    in a new interpreter.
+
+    Assertions:
+        - Ensures that the GUI was imported.
+    """
+    times = benchmark.pedantic(
+        import_times, args=("import keyflare.usages, keyflare.gui",), rounds=3
+    )
+    assert "keyflare.gui" in times
+    benchmark.extra_info["usages_import_us"] = times["keyflare.usages"]
+    benchmark.extra_info["gui_import_us"] = times["keyflare.gui"]
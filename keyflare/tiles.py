@@ -0,0 +1,390 @@
+"""Contains tools for splitting screenshots into tiles and splicing their boxes."""
+import numpy as np
+import cv2
+from .suppression import candidate_pairs
+
+
+def changed_tiles(image, previous, tile_size):
+    """
+    Finds the tiles of a screenshot that differ from the previous screenshot.
+
+    Args:
+        image (np.ndarray): The new screenshot.
+        previous (np.ndarray): The previous screenshot, with the same shape.
+        tile_size (int): The side in pixels of the square tiles.
+
+    Returns:
+        np.ndarray: A (rows, columns) boolean array, True for tiles with any changed pixel.
+
+    Example:
+        >>> changed_tiles(np.zeros((4, 4)), np.eye(4), 2)
+        array([[ True, False],
+               [False,  True]])
+    """
+    height, width = image.shape[:2]
+    difference = cv2.absdiff(image, previous).reshape(height, -1)
+    bands = np.stack(
+        [
+            difference[top : top + tile_size].max(axis=0)
+            for top in range(0, height, tile_size)
+        ]
+    )
+    columns = bands.reshape(len(bands), width, -1).max(axis=2)
+    return np.maximum.reduceat(columns, np.arange(0, width, tile_size), axis=1) > 0
+
+
+def tile_regions(tiles, tile_size, shape):
+    """
+    Groups neighbouring marked tiles and returns the rectangle around each group.
+
+    Args:
+        tiles (np.ndarray): A (rows, columns) boolean array of marked tiles.
+        tile_size (int): The side in pixels of the square tiles.
+        shape (tuple): The shape of the screenshot the tiles cover.
+
+    Returns:
+        list: (left, top, right, bottom) pixel rectangles, with exclusive right and bottom.
+    """
+    count, _, stats, _ = cv2.connectedComponentsWithStats(
+        tiles.astype(np.uint8), connectivity=8
+    )
+    regions = []
+    for left, top, columns, rows, _ in stats[1:count].tolist():
+        regions.append(
+            (
+                left * tile_size,
+                top * tile_size,
+                min((left + columns) * tile_size, shape[1]),
+                min((top + rows) * tile_size, shape[0]),
+            )
+        )
+    return regions
+
+
+def grow_region(region, border, boxes, shape, limit):
+    """
+    Widens a rectangle by a border, then again to hold every box it touches,
+    so that boxes crossing its edge are detected whole instead of being cut.
+    Boxes wider or taller than the limit are left out, so that one large box
+    like a window's outline does not grow the rectangle to the whole screenshot.
+
+    Args:
+        region (tuple): A (left, top, right, bottom) pixel rectangle.
+        border (int): Pixels added on every side of the rectangle.
+        boxes (np.ndarray): An (N, 4) array of [x, y, w, h] bounding boxes.
+        shape (tuple): The shape of the screenshot, which bounds the rectangle.
+        limit (int): The largest width or height in pixels of the boxes held.
+
+    Returns:
+        tuple: The widened (left, top, right, bottom) pixel rectangle.
+    """
+    left = max(region[0] - border, 0)
+    top = max(region[1] - border, 0)
+    right = min(region[2] + border, shape[1])
+    bottom = min(region[3] + border, shape[0])
+    touching = (
+        (boxes[:, 0] < right)
+        & (boxes[:, 0] + boxes[:, 2] > left)
+        & (boxes[:, 1] < bottom)
+        & (boxes[:, 1] + boxes[:, 3] > top)
+        & (boxes[:, 2] <= limit)
+        & (boxes[:, 3] <= limit)
+    )
+    if touching.any():
+        touched = boxes[touching]
+        left = min(left, int(touched[:, 0].min()))
+        top = min(top, int(touched[:, 1].min()))
+        right = max(right, int((touched[:, 0] + touched[:, 2]).max()))
+        bottom = max(bottom, int((touched[:, 1] + touched[:, 3]).max()))
+    return (max(left, 0), max(top, 0), min(right, shape[1]), min(bottom, shape[0]))
+
+
+def merge_regions(regions):
+    """
+    Merges overlapping rectangles until no two of them overlap.
+
+    Args:
+        regions (list): (left, top, right, bottom) pixel rectangles.
+
+    Returns:
+        list: The merged (left, top, right, bottom) pixel rectangles.
+    """
+    merged = []
+    for region in regions:
+        while True:
+            overlapping = [
+                other
+                for other in merged
+                if region[0] < other[2]
+                and other[0] < region[2]
+                and region[1] < other[3]
+                and other[1] < region[3]
+            ]
+            if not overlapping:
+                break
+            merged = [other for other in merged if other not in overlapping]
+            overlapping.append(region)
+            region = (
+                min(other[0] for other in overlapping),
+                min(other[1] for other in overlapping),
+                max(other[2] for other in overlapping),
+                max(other[3] for other in overlapping),
+            )
+        merged.append(region)
+    return merged
+
+
+def inside_region(boxes, region):
+    """
+    Finds the boxes lying entirely within a rectangle.
+
+    Args:
+        boxes (np.ndarray): An (N, 4) array of [x, y, w, h] bounding boxes.
+        region (tuple): A (left, top, right, bottom) pixel rectangle.
+
+    Returns:
+        np.ndarray: A boolean array, True for boxes inside the rectangle.
+    """
+    return (
+        (boxes[:, 0] >= region[0])
+        & (boxes[:, 1] >= region[1])
+        & (boxes[:, 0] + boxes[:, 2] <= region[2])
+        & (boxes[:, 1] + boxes[:, 3] <= region[3])
+    )
+
+
+def shrink_region(region, margin, shape):
+    """
+    Moves the edges of a rectangle lying inside the screenshot inwards by a margin.
+
+    Args:
+        region (tuple): A (left, top, right, bottom) pixel rectangle.
+        margin (int): The pixels each inner edge is moved by.
+        shape (tuple): The shape of the screenshot holding the rectangle.
+
+    Returns:
+        tuple: The shrunk (left, top, right, bottom) pixel rectangle.
+    """
+    return (
+        region[0] + margin if region[0] > 0 else 0,
+        region[1] + margin if region[1] > 0 else 0,
+        region[2] - margin if region[2] < shape[1] else shape[1],
+        region[3] - margin if region[3] < shape[0] else shape[0],
+    )
+
+
+def cut_by_region(boxes, region, shape, margin):
+    """
+    Finds the boxes, in a rectangle's own coordinates, that come within a margin
+    of one of its edges lying inside the screenshot. Those may have been cut by
+    the edge, or thresholded without enough of the pixels around them.
+
+    Args:
+        boxes (np.ndarray): An (N, 4) array of [x, y, w, h] bounding boxes
+            relative to the rectangle's top-left corner.
+        region (tuple): A (left, top, right, bottom) pixel rectangle.
+        shape (tuple): The shape of the screenshot holding the rectangle.
+        margin (int): The pixels from an inner edge within which boxes are cut, at least 1.
+
+    Returns:
+        np.ndarray: A boolean array, True for boxes that may have been cut.
+    """
+    left, top, right, bottom = shrink_region(region, margin, shape)
+    return ~inside_region(
+        boxes + np.array([region[0], region[1], 0, 0], dtype=boxes.dtype),
+        (left, top, right, bottom),
+    )
+
+
+def split_tiles(shape, tile_size, overlap):
+    """
+    Splits a screenshot into square tiles that overlap their neighbours.
+
+    Args:
+        shape (tuple): The shape of the screenshot.
+        tile_size (int): The side in pixels of each tile before adding the overlap.
+        overlap (int): Pixels added on every side of a tile, within the screenshot.
+
+    Returns:
+        list: The (left, top, right, bottom) pixel rectangle of each tile.
+
+    Example:
+        >>> split_tiles((100, 150), 100, 10)
+        [(0, 0, 110, 100), (90, 0, 150, 100)]
+    """
+    height, width = shape[:2]
+    return [
+        (
+            max(left - overlap, 0),
+            max(top - overlap, 0),
+            min(left + tile_size + overlap, width),
+            min(top + tile_size + overlap, height),
+        )
+        for top in range(0, height, tile_size)
+        for left in range(0, width, tile_size)
+    ]
+
+
+def merge_tile_boxes(tile_boxes, extents, shape, margin, cell_size=64):
+    """
+    Merges the boxes found in overlapping tiles into the boxes of the whole screenshot.
+
+    Args:
+        tile_boxes (list): An (N, 4) array of [x, y, w, h] bounding boxes per tile,
+            relative to the top-left corner of the tile's extent.
+        extents (list): The (left, top, right, bottom) extent of each tile.
+        shape (tuple): The shape of the screenshot.
+        margin (int): The pixels from a tile's inner edge within which boxes
+            may have been cut, at least 1.
+        cell_size (int, optional): The side in pixels of the grid cells used
+            to pair nearby boxes (default is 64).
+
+    Returns:
+        np.ndarray: An (N, 4) int32 array of [x, y, w, h] bounding boxes.
+
+    Notes:
+        - Boxes found whole in several overlapping tiles are kept once, as are
+          any other boxes repeated exactly.
+        - Boxes cut by a tile's edge, or within the margin of it, are dropped
+          when a box holding them was found whole in another tile, and otherwise
+          joined with the overlapping cut boxes of the neighbouring tiles.
+    """
+    wholes, pieces, piece_extents = [], [], []
+    for boxes, extent in zip(tile_boxes, extents):
+        cut = cut_by_region(boxes, extent, shape, margin)
+        boxes = boxes + np.array([extent[0], extent[1], 0, 0], dtype=boxes.dtype)
+        wholes.append(boxes[~cut])
+        pieces.append(boxes[cut])
+        inner = shrink_region(extent, margin, shape)
+        piece_extents.append(np.tile(np.array(inner), (int(cut.sum()), 1)))
+    wholes = np.unique(np.concatenate(wholes).reshape(-1, 4), axis=0)
+    pieces = np.concatenate(pieces).reshape(-1, 4)
+    piece_extents = np.concatenate(piece_extents).reshape(-1, 4)
+    if pieces.size and wholes.size:
+        found = _pieces_found_whole(pieces, piece_extents, wholes, cell_size)
+        pieces = pieces[~found]
+    if len(pieces) > 1:
+        pieces = _join_pieces(pieces, cell_size)
+    return np.concatenate([wholes, pieces]).astype(np.int32)
+
+
+def _pieces_found_whole(pieces, piece_extents, wholes, cell_size):
+    """
+    Finds the cut boxes lying within a whole box that also reaches the margin
+    of their tile's edge, and so would have been cut by that tile too.
+
+    Args:
+        pieces (np.ndarray): An (N, 4) array of cut [x, y, w, h] bounding boxes.
+        piece_extents (np.ndarray): The (left, top, right, bottom) extent of the tile
+            that cut each box, shrunk by the margin.
+        wholes (np.ndarray): An (M, 4) array of whole [x, y, w, h] bounding boxes.
+        cell_size (int): The side in pixels of the grid cells used to pair boxes.
+
+    Returns:
+        np.ndarray: A boolean array, True for the cut boxes found whole elsewhere.
+    """
+    boxes = np.concatenate([pieces, wholes]).astype(np.int64)
+    piece, whole = _piece_whole_pairs(boxes, len(pieces), cell_size)
+    outer, inner = boxes[whole], boxes[piece]
+    extent = piece_extents[piece]
+    holding = (
+        (outer[:, 0] <= inner[:, 0])
+        & (outer[:, 1] <= inner[:, 1])
+        & (outer[:, 0] + outer[:, 2] >= inner[:, 0] + inner[:, 2])
+        & (outer[:, 1] + outer[:, 3] >= inner[:, 1] + inner[:, 3])
+    )
+    crossing = (
+        (outer[:, 0] < extent[:, 0])
+        | (outer[:, 1] < extent[:, 1])
+        | (outer[:, 0] + outer[:, 2] > extent[:, 2])
+        | (outer[:, 1] + outer[:, 3] > extent[:, 3])
+    )
+    found = np.zeros(len(pieces), dtype=bool)
+    found[piece[holding & crossing]] = True
+    return found
+
+
+def _piece_whole_pairs(boxes, count, cell_size):
+    """
+    Pairs each cut box with the nearby whole boxes.
+
+    Args:
+        boxes (np.ndarray): An (N, 4) array of [x, y, w, h] bounding boxes,
+            the cut boxes first.
+        count (int): The number of cut boxes.
+        cell_size (int): The side in pixels of the grid cells used to pair boxes.
+
+    Returns:
+        tuple: The indices of the cut box and of the whole box of each pair.
+    """
+    first, second = candidate_pairs(
+        boxes[:, 0],
+        boxes[:, 1],
+        boxes[:, 0] + boxes[:, 2],
+        boxes[:, 1] + boxes[:, 3],
+        cell_size,
+    )
+    piece = np.where(first < count, first, second)
+    whole = np.where(first < count, second, first)
+    mixed = (piece < count) & (whole >= count)
+    return piece[mixed], whole[mixed]
+
+
+def _overlap_groups(x0, y0, x1, y1, cell_size):
+    """
+    Numbers the groups of boxes that overlap each other, directly or through others.
+
+    Args:
+        x0 (np.ndarray): The left edge of each box.
+        y0 (np.ndarray): The top edge of each box.
+        x1 (np.ndarray): The right edge of each box.
+        y1 (np.ndarray): The bottom edge of each box.
+        cell_size (int): The side in pixels of the grid cells used to pair boxes.
+
+    Returns:
+        np.ndarray: The group of each box, numbered from 0 without gaps.
+    """
+    first, second = candidate_pairs(x0, y0, x1, y1, cell_size)
+    overlapping = (
+        (x0[first] < x1[second])
+        & (x0[second] < x1[first])
+        & (y0[first] < y1[second])
+        & (y0[second] < y1[first])
+    )
+    first, second = first[overlapping], second[overlapping]
+    groups = np.arange(len(x0))
+    changed = True
+    while changed:
+        previous = groups.copy()
+        np.minimum.at(groups, first, groups[second])
+        np.minimum.at(groups, second, groups[first])
+        groups = groups[groups]
+        changed = not np.array_equal(groups, previous)
+    _, groups = np.unique(groups, return_inverse=True)
+    return groups
+
+
+def _join_pieces(pieces, cell_size):
+    """
+    Joins overlapping cut boxes into the boxes around each overlapping group.
+
+    Args:
+        pieces (np.ndarray): An (N, 4) array of cut [x, y, w, h] bounding boxes.
+        cell_size (int): The side in pixels of the grid cells used to pair boxes.
+
+    Returns:
+        np.ndarray: An (M, 4) array of joined [x, y, w, h] bounding boxes.
+    """
+    x0, y0 = pieces[:, 0].astype(np.int64), pieces[:, 1].astype(np.int64)
+    x1, y1 = x0 + pieces[:, 2], y0 + pieces[:, 3]
+    groups = _overlap_groups(x0, y0, x1, y1, cell_size)
+    count = groups.max() + 1
+    left = np.full(count, np.iinfo(np.int64).max)
+    top = np.full(count, np.iinfo(np.int64).max)
+    right = np.zeros(count, dtype=np.int64)
+    bottom = np.zeros(count, dtype=np.int64)
+    np.minimum.at(left, groups, x0)
+    np.minimum.at(top, groups, y0)
+    np.maximum.at(right, groups, x1)
+    np.maximum.at(bottom, groups, y1)
+    return np.column_stack([left, top, right - left, bottom - top])
@@ -1,15 +1,9 @@
 """Determines the best way to run the module"""
-import time
 import sys
 import platform
-from .gui import GUI
-
-try:
-    from pynput import keyboard
-except ImportError:
-    import logger
-
-    logger.info("Could not create shortcuts.")
+from .activations import Activations
+from .hotkeys import Hotkeys
+from .instruments import Instruments
 
 
 class Usages:
@@ -18,25 +12,52 @@ class Usages:
     whether it is __main__, main(), or maybe something else in the future.
 
     Attributes:
-        args (list): Command-line arguments passed to the program.
+        args (list): Command-line arguments passed to the program,
+            without the profiling, resident and speculation flags.
         platf (str): The platform (e.g., 'Windows',
         'Linux', 'Darwin') on which the program is running.
-        z (GUI): An instance of the GUI class.
-        clicks (int, defaults to 1): The number of clicks
-        to perform when a keyboard shortcut is triggered.
+        z (GUI): An instance of the GUI class, created on first use.
+        hotkeys (Hotkeys): The action of each keyboard shortcut, once listening.
+        profile (str or None): The file that the timings of each activation's
+        stages are written to as JSON lines when exiting, if profiling.
+        instruments (Instruments): The timings of each activation's stages,
+        handed to the GUI's pipeline.
+        resident (bool): Whether the shortcuts keep one warm, withdrawn window
+        that the main thread shows on each activation.
+        speculate (bool): Whether the shortcuts detect the screen's boxes in
+        the background, so an activation on an unchanged screen skips detection.
+        activations (Activations): The activations requested by the shortcuts,
+        waiting to be run by the main thread.
 
     Methods:
         __init__(): Initializes the Usages class and sets up necessary attributes.
         runType(): Calls the shortcut method to listen for keyboard shortcuts.
         shortcut(): Listens for specific keyboard shortcuts and triggers GUI actions accordingly.
+        activating(): Runs the activations requested by the shortcuts.
         programmatic(): Executes GUI actions programmatically based on command-line arguments.
+        serving(): Answers the commands of other processes on a Unix socket.
 
     Notes:
         - This class depends on the external
           library 'pynput' and standard library 'platform'.
         - It is designed to work with a GUI application represented by the 'GUI' class.
-        - The keyboard shortcuts are defined
-          in the 'start_combination' list. The chosen shortcut is alt+A.
+        - The keyboard shortcuts are the bindings of `Hotkeys`: alt+a and alt+s
+          for a left and a right click, alt+d for a double click, alt+w and alt+x
+          for scrolling up and down, and alt+r for a left click near the pointer.
+          The `KEYFLARE_HOTKEYS` environment variable names a JSON file changing them.
+        - `keyflare batch ...` runs `batch.main` over archived screenshots
+          or recordings instead of the GUI.
+        - `keyflare serve` keeps a warm GUI answering commands on a Unix socket,
+          which `keyflare send ...` and `keyflare <clicks> <button>` use.
+        - The `--profile` flag times each activation's stages, and
+          `--profile-memory` traces their memory too, like the
+          `KEYFLARE_PROFILE` environment variable.
+        - The `--resident` flag makes the shortcuts keep the GUI's window and
+          pipeline ready between activations, see `GUI.starting`.
+        - The `--speculate` flag makes the shortcuts detect the screen's boxes
+          in the background once the screen settles, see `Speculation`.
+        - The GUI, the batch tools and `pynput` are only imported by the
+          runs that need them, so `keyflare batch` never loads Tk or PyAutoGUI.
 
     Examples:
         >>> usage = Usages()
@@ -45,8 +66,13 @@ class Usages:
 
     args = None
     platf = None
-    z = None
-    clicks = 1
+    _z = None
+    hotkeys = None
+    profile = None
+    instruments = None
+    resident = False
+    speculate = False
+    activations = None
 
     def __init__(self):
         """
@@ -58,10 +84,49 @@ class Usages:
         Returns:
             None
         """
-        self.args = sys.argv
+        self.args = [
+            arg
+            for arg in sys.argv
+            if not arg.startswith("--profile")
+            and arg not in ("--resident", "--speculate")
+        ]
         self.platf = platform.system()
-        self.z = GUI()
+        self.resident = "--resident" in sys.argv
+        self.speculate = "--speculate" in sys.argv
+        self.activations = Activations()
+        self.instruments = Instruments.from_environment()
+        if "--profile-memory" in sys.argv:
+            self.instruments.enabled = self.instruments.memory = True
+        elif "--profile" in sys.argv:
+            self.instruments.enabled = True
+        if self.instruments.enabled:
+            self.profile = "keyflare_profile.jsonl"
         self.runtype()
+        if self.profile:
+            self.instruments.export(self.profile)
+            print(f"[KeyFlare] Wrote the stages' timings to {self.profile}.")
+
+    @property
+    def z(self):
+        """
+        The GUI, created with its pipeline recording into `instruments`, and
+        given a `Speculation` if asked for, when first used.
+
+        Returns:
+            GUI: The GUI.
+        """
+        if self._z is None:
+            from .gui import GUI  # pylint: disable=import-outside-toplevel
+
+            self._z = GUI(resident=self.resident)
+            self._z.y.instruments = self.instruments
+            if self.speculate:
+                from .speculation import (  # pylint: disable=import-outside-toplevel
+                    Speculation,
+                )
+
+                self._z.y.speculation = Speculation(settle=True)
+        return self._z
 
     def runtype(self):
         """
@@ -74,10 +139,24 @@ class Usages:
             None
 
         Note:
+            If the first arg is "batch", processes archived screenshots instead.
+            If the first arg is "serve", answers commands on a Unix socket,
+            and if it is "send", sends one to that server.
             If there are multiple args, uses programmatic control.
             If there are no args, uses keyboard shortcuts to activate.s
         """
-        if len(self.args) > 1:
+        if len(self.args) > 1 and self.args[1] == "batch":
+            from . import batch  # pylint: disable=import-outside-toplevel
+
+            batch.main(self.args[2:])
+        elif len(self.args) > 1 and self.args[1] == "serve":
+            self.serving()
+        elif len(self.args) > 1 and self.args[1] == "send":
+            from . import server  # pylint: disable=import-outside-toplevel
+
+            if server.main(self.args[2:]):
+                sys.exit(1)
+        elif len(self.args) > 1:
             self.programmatic()
         else:
             self.shortcut()
@@ -95,46 +174,76 @@ class Usages:
         Notes:
             - This method relies on `pynput`, which has platform
               specific limitations. Please read the README for bypassing them.
+            - The GUI is created before listening, so the first activation
+              does not wait for its imports.
+            - The listener's thread looks each key up in `hotkeys`, which rejects
+              the keys of typing and of other shortcuts at once, and only hands
+              activations to this thread, which waits for them without polling,
+              runs them one at a time and owns the window. Presses made while an
+              activation is pending or running are coalesced into it, see
+              `Activations`.
+            - When resident, the GUI's window is created and its pipeline warmed up
+              before listening.
+            - The pipeline's `speculation`, if any, runs while listening.
+            - Exiting from the GUI or a keyboard interrupt stops at once, and
+              `activations.close()` stops the loop from another thread.
         """
-        print("[KeyFlare] Press (left Alt)+(lowercase a) to activate.")
+        try:
+            from pynput import keyboard  # pylint: disable=import-outside-toplevel
+        except ImportError:
+            print("[KeyFlare] Could not create shortcuts.")
+            return
+        try:
+            self.hotkeys = Hotkeys.from_environment(keyboard.Key)
+        except (OSError, ValueError) as error:
+            print(f"[KeyFlare] Could not read the hotkeys: {error}")
+            return
+        gui = self.z
+        if self.resident:
+            gui.starting()
+        print(f"[KeyFlare] Press {', '.join(self.hotkeys.bindings)} to activate.")
         print("[KeyFlare] Perform a keyboard interrupt to exit.")
-        start_combination = [
-            {keyboard.Key.alt, keyboard.KeyCode(char="a")},
-            {keyboard.Key.alt_l, keyboard.KeyCode(char="a")},
-            {keyboard.Key.alt, keyboard.KeyCode(char="s")},
-            {keyboard.Key.alt_l, keyboard.KeyCode(char="s")},
-        ]
-        current = set()
+        hotkeys, activations = self.hotkeys, self.activations
 
         def on_press(key):
-            if any([key in COMBO for COMBO in start_combination]):
-                current.add(key)
-                if len(current) == 2:
-                    if keyboard.KeyCode(char="s") in current:
-                        self.z.run(clicks=self.clicks, button="right")
-                        current.clear()
-                    else:
-                        self.z.run(clicks=self.clicks, button="left")
-                        current.clear()
-
-        def on_release(key):
-            if any([key in COMBO for COMBO in start_combination]):
-                try:
-                    current.remove(key)
-                except KeyError:
-                    pass
-
-        listener = keyboard.Listener(on_press=on_press, on_release=on_release)
-        listener.start()
+            action = hotkeys.pressing(key)
+            if action is not None:
+                activations.put(action)
 
+        listener = keyboard.Listener(on_press=on_press, on_release=hotkeys.releasing)
+        listener.start()
+        if gui.y.speculation is not None:
+            gui.y.speculation.start()
         try:
-            while not self.z.exit_flag:
-                time.sleep(0.5)
+            self.activating()
         except KeyboardInterrupt:
             print("Exiting the application.")
+        finally:
             listener.stop()
-        else:
-            listener.stop()
+            self.activations.close()
+            if gui.y.speculation is not None:
+                gui.y.speculation.stop()
+
+    def activating(self):
+        """
+        Runs the activations handed over by the listener, one at a time, until
+        the GUI is exited or `activations` is closed.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        gui = self.z
+        while not gui.exit_flag:
+            action = self.activations.get()
+            if action is None:
+                break
+            try:
+                gui.run(**action)
+            finally:
+                self.activations.done()
 
     def programmatic(self):
         """
@@ -149,14 +258,72 @@ class Usages:
         Notes:
             - This method is typically called from the command
               line with the desired number of clicks and the button as the argument.
+            - When a `keyflare serve` is listening, the activation is sent to it,
+              which spares starting the GUI and its pipeline in this process.
+              A server that does not answer "ping" within `server.PING_TIMEOUT`
+              seconds is treated as missing. An activation it does not answer
+              within `server.ACTIVATION_TIMEOUT` seconds is reported, and is not
+              run again here, since the server may have shown its labels already.
 
         Examples:
             ```sh
             keyflare 3 left
             ```
         """
-        print("[Usages] Using commandline keyflare.")
-        self.z.run(clicks=int(self.args[1]), button=str(self.args[2]))
+        from . import server  # pylint: disable=import-outside-toplevel
+
+        clicks, button = int(self.args[1]), str(self.args[2])
+        try:
+            server.sending({"command": "ping"}, timeout=server.PING_TIMEOUT)
+        except OSError:
+            print("[Usages] Using commandline keyflare.")
+            self.z.run(clicks=clicks, button=button)
+            return
+        try:
+            answer = server.sending(
+                {"command": "activate", "clicks": clicks, "button": button},
+                timeout=server.ACTIVATION_TIMEOUT,
+            )
+        except OSError as error:
+            print(f"[KeyFlare] The server did not answer: {error}")
+            return
+        if not answer["ok"]:
+            print(f"[KeyFlare] The server could not activate: {answer['error']}")
+
+    def serving(self):
+        """
+        Keeps a resident GUI answering the commands of `keyflare send` and
+        `keyflare <clicks> <button>` on a Unix socket, until sent "stop".
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Notes:
+            - The socket's path is the argument after "serve", if any, otherwise
+              that of `server.socket_path`.
+
+        Examples:
+            ```sh
+            keyflare serve --speculate
+            ```
+        """
+        from .server import Server  # pylint: disable=import-outside-toplevel
+
+        self.resident = True
+        gui = self.z
+        gui.starting()
+        if gui.y.speculation is not None:
+            gui.y.speculation.start()
+        try:
+            Server(gui, self.args[2] if len(self.args) > 2 else None).serve()
+        except KeyboardInterrupt:
+            print("Exiting the application.")
+        finally:
+            if gui.y.speculation is not None:
+                gui.y.speculation.stop()
 
 
 def main():